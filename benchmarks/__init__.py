@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/17-13:40
+# @Author  : 灯下客
+# @Email   : 
+# @File    : __init__.py
+# @Software: PyCharm
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+# 对比 Dict.getattr 与预编译访问器 Dict.accessor 的读取性能
+#
+# 运行: python -m benchmarks.bench_accessor
+
+import timeit
+
+from easy_config_py import Dict, EasyConfig
+
+NUMBER = 200000
+
+data = Dict({
+    'database': {
+        'host-name': 'localhost',
+        'pool': {'size': 10, 'timeout': {'connect': 3}},
+    },
+    'app': {'name': 'demo'},
+})
+config = EasyConfig(data)
+
+plain = data.accessor('database.pool.timeout.connect')
+cached = data.accessor('database.pool.timeout.connect', cached=True)
+config_cached = config.accessor('database.pool.timeout.connect', cached=True)
+
+cases = [
+    ('Dict.getattr', lambda: data.getattr('database.pool.timeout.connect')),
+    ('EasyConfig.getattr', lambda: config.getattr('database.pool.timeout.connect')),
+    ('Dict.accessor', plain.get),
+    ('Dict.accessor(cached=True)', cached.get),
+    ('EasyConfig.accessor(cached=True)', config_cached.get),
+]
+
+
+def main():
+    print(f"{'case':<36}{'ns/op':>10}")
+    for name, func in cases:
+        best = min(timeit.repeat(func, number=NUMBER, repeat=5))
+        print(f"{name:<36}{best / NUMBER * 1e9:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
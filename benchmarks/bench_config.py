@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+# EasyConfig 加载路径的基准测试
+#
+# 运行: python -m benchmarks.bench_config
+
+import asyncio
+import tempfile
+
+from easy_config_py import EasyConfig, FileCache, ContentCache, parsers
+from benchmarks.generators import make_tree, make_flat_sections, dumps, write
+
+FORMATS = ('yaml', 'json', 'toml', 'ini')
+
+
+def _supported(fmt):
+    if fmt not in parsers.supported_types():
+        return False
+    try:
+        dumps({'a': {'b': 'c'}}, fmt)
+    except ImportError:
+        return False
+    return True
+
+
+def benchmarks():
+    """返回 [(名称, 无参数可调用对象)]，跳过当前环境不支持的格式"""
+    directory = tempfile.mkdtemp(prefix='easy-config-bench-')
+    loop = asyncio.new_event_loop()
+    cases = []
+    for fmt in FORMATS:
+        if not _supported(fmt):
+            continue
+        data = make_flat_sections() if fmt == 'ini' else make_tree(10, 3)
+        path = write(directory, 'config', data, fmt)
+        content = dumps(data, fmt)
+
+        def load_file(path=path):
+            # max_entries=0 使缓存不保留条目，每次都真正读取和解析
+            config = EasyConfig(path=path, cache=FileCache(max_entries=0))
+            config.load_file(path)
+
+        def load_file_cached(path=path, cache=FileCache()):
+            config = EasyConfig(path=path, cache=cache)
+            config.load_file(path)
+
+        def async_load_file(path=path):
+            config = EasyConfig(path=path, cache=FileCache(max_entries=0))
+            loop.run_until_complete(config.async_load_file(path))
+
+        cases += [
+            (f'load_file [{fmt}]', load_file),
+            (f'load_file cached [{fmt}]', load_file_cached),
+            (f'load_by_content [{fmt}]',
+             lambda content=content, fmt=fmt: EasyConfig().load_by_content(content, fmt)),
+            (f'load_by_content cached [{fmt}]',
+             lambda content=content, fmt=fmt, cache=ContentCache():
+             EasyConfig(content_cache=cache).load_by_content(content, fmt)),
+            (f'async_load_file [{fmt}]', async_load_file),
+        ]
+    profiled = EasyConfig({'default': make_tree(10, 3),
+                           'dev': make_tree(10, 2, seed=1), 'prod': make_tree(10, 2, seed=2)})
+
+    def profile_build(config=profiled):
+        config.set_profiles(['dev', 'prod'])
+        return config.profile('prod')
+
+    def profile_switch(config=profiled):
+        config.use_profile('dev')
+        config.profile()
+        config.use_profile('prod')
+        return config.profile()
+
+    cases += [
+        ('profile build', profile_build),
+        ('profile switch cached', profile_switch),
+        ('reload one changed file', _reload_case(directory)),
+    ]
+    return cases
+
+
+def _reload_case(directory):
+    # 4 个大文件 + 1 个小文件，每次只修改小文件后 reload
+    paths = [write(directory, f'layer{index}', make_tree(10, 3, seed=index), 'json') for index in range(4)]
+    small = write(directory, 'small', {'feature': {'flag': 0}}, 'json')
+    config = EasyConfig(path=directory)
+    config.load_files(paths + [small])
+    counter = [0]
+
+    def reload_one_changed_file():
+        counter[0] += 1
+        write(directory, 'small', {'feature': {'flag': counter[0]}}, 'json')
+        # mtime 的精度可能不足以区分两次写入，直接使文件缓存失效
+        config.loader.invalidate(small)
+        config.reload(small)
+
+    return reload_one_changed_file
+
+
+if __name__ == '__main__':
+    from benchmarks.run import main
+    main(['--only', 'config'])
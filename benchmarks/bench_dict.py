@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+# Dict 热点路径的基准测试
+#
+# 运行: python -m benchmarks.bench_dict
+
+import copy
+
+from easy_config_py import Dict, LazyDict
+from benchmarks.generators import make_tree
+
+# (名称, width, depth)
+SHAPES = [
+    ('small', 5, 2),
+    ('medium', 10, 3),
+    ('large', 12, 4),
+]
+
+
+def _first_path(data):
+    keys = []
+    current = data
+    while isinstance(current, dict):
+        key = next(iter(current))
+        keys.append(key)
+        current = current[key]
+    return keys
+
+
+def benchmarks():
+    """返回 [(名称, 无参数可调用对象)]"""
+    cases = []
+    for shape, width, depth in SHAPES:
+        tree = make_tree(width, depth)
+        d = Dict(tree)
+        frozen = Dict(tree)
+        keys = _first_path(tree)
+        dotted = '.'.join(keys)
+        parent_path = keys[:-1]
+        overlay = make_tree(width, depth, seed=1)
+        layers = [tree, overlay, make_tree(width, depth, seed=2)]
+
+        def attr_access(d=d, keys=keys):
+            current = d
+            for k in keys:
+                current = getattr(current, k)
+            return current
+
+        def missing(d=d):
+            return d.not_exists.deeper
+
+        def freeze(frozen=frozen):
+            frozen.freeze()
+            frozen.unfreeze()
+
+        cases += [
+            (f'Dict({shape})', lambda tree=tree: Dict(tree)),
+            (f'LazyDict({shape})', lambda tree=tree: LazyDict(tree)),
+            (f'attr access depth={len(keys)} ({shape})', attr_access),
+            (f'getattr dotted ({shape})', lambda d=d, p=dotted: d.getattr(p)),
+            (f'accessor dotted ({shape})', d.accessor(dotted).get),
+            (f'__missing__ auto-vivify ({shape})', missing),
+            (f'update ({shape})', lambda tree=tree, overlay=overlay: Dict(tree).update(overlay)),
+            (f'merge_many 3 layers ({shape})', lambda layers=layers: Dict().merge_many(layers)),
+            (f'__or__ ({shape})', lambda d=d, overlay=overlay: d | overlay),
+            (f'select **.name ({shape})', lambda d=d: list(d.select('**.name'))),
+            (f'select_many 3 selectors ({shape})',
+             lambda d=d, p=dotted: d.select_many(['**.name', '*.*', p])),
+            (f'to_dict ({shape})', d.to_dict),
+            (f'deepcopy ({shape})', lambda d=d: copy.deepcopy(d)),
+            (f'freeze ({shape})', freeze),
+        ]
+        if parent_path:
+            cases.append((f'getattr parent ({shape})',
+                          lambda d=d, p='.'.join(parent_path): d.getattr(p)))
+    return cases
+
+
+if __name__ == '__main__':
+    from benchmarks.run import main
+    main(['--only', 'dict'])
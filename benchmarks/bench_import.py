@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+# import easy_config_py 的耗时，防止重新在导入时加载 anyconfig / asyncio 等重量级模块
+#
+# 运行: python -m benchmarks.bench_import
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 这些模块只应在第一次使用相关功能时导入
+DEFERRED_MODULES = ('anyconfig', 'asyncio', 'yaml', 'logging', 'typing',
+                    'concurrent.futures', 'multiprocessing', 'tempfile', 'hashlib', 'ijson')
+
+
+def _run(code):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    return subprocess.run([sys.executable, '-c', code], env=env, check=True,
+                          stdout=subprocess.PIPE, universal_newlines=True).stdout
+
+
+def check_deferred():
+    """在新的解释器中导入 easy_config_py，返回被提前导入的重量级模块"""
+    output = _run(
+        'import sys, easy_config_py\n'
+        'print(",".join(m for m in {!r} if m in sys.modules))'.format(DEFERRED_MODULES)
+    )
+    return [name for name in output.strip().split(',') if name]
+
+
+def benchmarks():
+    """返回 [(名称, 无参数可调用对象)]；导入时加载了重量级模块则直接报错"""
+    loaded = check_deferred()
+    if loaded:
+        raise AssertionError('import easy_config_py loaded deferred modules: ' + ', '.join(loaded))
+    return [
+        ('python startup', lambda: _run('pass')),
+        ('import easy_config_py', lambda: _run('import easy_config_py')),
+        ('import + EasyConfig().load_by_content [json]',
+         lambda: _run('import easy_config_py\n'
+                      'easy_config_py.EasyConfig().load_by_content(\'{"a": {"b": 1}}\', "json")')),
+    ]
+
+
+if __name__ == '__main__':
+    from benchmarks.run import main
+    main(['--only', 'import'])
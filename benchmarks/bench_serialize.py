@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+# Dict 序列化（pickle / msgpack）的基准测试，用于 ProcessPoolExecutor 等进程间传递配置的场景
+#
+# 运行: python -m benchmarks.bench_serialize
+
+import pickle
+
+from easy_config_py import Dict
+from benchmarks.generators import make_tree
+from benchmarks.bench_dict import SHAPES
+
+
+def _payloads(shape, width, depth):
+    d = Dict(make_tree(width, depth))
+    return d, pickle.dumps(d, pickle.HIGHEST_PROTOCOL), d.to_bytes()
+
+
+def sizes():
+    """返回 [(名称, pickle 字节数, to_bytes 字节数, 普通 dict pickle 字节数)]"""
+    result = []
+    for shape, width, depth in SHAPES:
+        d, pickled, packed = _payloads(shape, width, depth)
+        result.append((shape, len(pickled), len(packed),
+                       len(pickle.dumps(d.to_dict(), pickle.HIGHEST_PROTOCOL))))
+    return result
+
+
+def benchmarks():
+    """返回 [(名称, 无参数可调用对象)]"""
+    cases = []
+    for shape, width, depth in SHAPES:
+        d, pickled, packed = _payloads(shape, width, depth)
+        cases += [
+            (f'pickle.dumps ({shape})', lambda d=d: pickle.dumps(d, pickle.HIGHEST_PROTOCOL)),
+            (f'pickle.loads ({shape})', lambda raw=pickled: pickle.loads(raw)),
+            (f'to_bytes ({shape})', d.to_bytes),
+            (f'from_bytes ({shape})', lambda raw=packed: Dict.from_bytes(raw)),
+        ]
+    return cases
+
+
+if __name__ == '__main__':
+    print(f"{'shape':<10}{'pickle':>12}{'to_bytes':>12}{'plain dict':>12}")
+    for shape, pickled, packed, plain in sizes():
+        print(f"{shape:<10}{pickled:>12}{packed:>12}{plain:>12}")
+    print()
+    from benchmarks.run import main
+    main(['--only', 'serialize'])
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+# 基准测试使用的合成配置生成器
+
+import os
+import json
+import random
+import configparser
+
+
+def make_tree(width=10, depth=3, list_every=4, seed=0):
+    """
+    生成嵌套配置。
+
+    Args:
+        width: 每层的键数量
+        depth: 嵌套深度
+        list_every: 每隔多少个键放一个包含字典的列表
+        seed: 随机种子，保证结果可复现
+    """
+    rnd = random.Random(seed)
+
+    def build(level):
+        node = {}
+        for i in range(width):
+            key = f"key-{level}-{i}"
+            if level < depth:
+                node[key] = build(level + 1)
+            elif list_every and i % list_every == 0:
+                node[key] = [{'name': f'item{j}', 'value': rnd.randint(0, 1000)} for j in range(3)]
+            else:
+                node[key] = rnd.choice([rnd.randint(0, 1 << 20), f"value-{rnd.random():.6f}", True, 1.5])
+        return node
+
+    return build(1)
+
+
+def make_flat_sections(sections=50, keys=20, seed=0):
+    """生成两层结构（section -> 字符串值），INI 等格式只支持这种结构"""
+    rnd = random.Random(seed)
+    return {
+        f"section{s}": {f"key{k}": f"value-{rnd.randint(0, 1 << 20)}" for k in range(keys)}
+        for s in range(sections)
+    }
+
+
+def count_keys(data):
+    if isinstance(data, dict):
+        return len(data) + sum(count_keys(v) for v in data.values())
+    if isinstance(data, (list, tuple)):
+        return sum(count_keys(v) for v in data)
+    return 0
+
+
+def dumps(data, fmt):
+    """把数据序列化为指定格式的字符串"""
+    if fmt == 'json':
+        return json.dumps(data)
+    if fmt == 'yaml':
+        import yaml
+        return yaml.safe_dump(data, sort_keys=False)
+    if fmt == 'toml':
+        try:
+            import tomli_w
+            return tomli_w.dumps(data)
+        except ImportError:
+            import toml
+            return toml.dumps(data)
+    if fmt == 'ini':
+        parser = configparser.ConfigParser(interpolation=None)
+        parser.read_dict(data)
+        lines = []
+        for section in parser.sections():
+            lines.append(f"[{section}]")
+            lines.extend(f"{k} = {v}" for k, v in parser.items(section, raw=True))
+            lines.append("")
+        return "\n".join(lines)
+    raise ValueError(fmt)
+
+
+def write(directory, name, data, fmt):
+    """写入配置文件并返回路径"""
+    extension = 'yml' if fmt == 'yaml' else fmt
+    path = os.path.join(directory, f"{name}.{extension}")
+    with open(path, 'w', encoding='utf-8') as file_to_write:
+        file_to_write.write(dumps(data, fmt))
+    return path
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+# 基准测试的计时与结果对比工具
+
+import json
+import timeit
+
+BASELINE_FILE = 'baseline.json'
+
+
+def measure(func, repeat=5, min_time=0.2):
+    """
+    测量单次调用的耗时（秒），自动选择循环次数，取多轮中的最小值。
+    """
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    if elapsed < min_time:
+        number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def format_time(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def load_baseline(path):
+    try:
+        with open(path, encoding='utf-8') as file_to_read:
+            return json.load(file_to_read)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_baseline(path, results, meta):
+    with open(path, 'w', encoding='utf-8') as file_to_write:
+        json.dump({'meta': meta, 'results': results}, file_to_write, indent=2, sort_keys=True)
+        file_to_write.write('\n')
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+# 运行全部基准测试，并与提交的基准数据对比
+#
+# 运行:   python -m benchmarks.run
+# 更新:   python -m benchmarks.run --save
+# 只跑部分: python -m benchmarks.run --only dict
+
+import os
+import sys
+import argparse
+import platform
+
+from benchmarks import bench_dict, bench_config, bench_import, bench_serialize
+from benchmarks.harness import measure, format_time, load_baseline, save_baseline, BASELINE_FILE
+
+SUITES = {
+    'dict': bench_dict,
+    'config': bench_config,
+    'import': bench_import,
+    'serialize': bench_serialize,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='easy_config_py benchmarks')
+    parser.add_argument('--only', choices=sorted(SUITES), action='append',
+                        help='只运行指定的测试集')
+    parser.add_argument('--filter', default='', help='只运行名称包含该字符串的用例')
+    parser.add_argument('--save', action='store_true', help='把结果写入基准文件')
+    parser.add_argument('--baseline', default=os.path.join(os.path.dirname(__file__), BASELINE_FILE))
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='耗时超过基准的倍数时标记为回归')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline(args.baseline).get('results', {})
+    results = {}
+    regressions = []
+    print(f"{'benchmark':<44}{'time':>12}{'baseline':>12}{'ratio':>8}")
+    for suite in args.only or sorted(SUITES):
+        for name, func in SUITES[suite].benchmarks():
+            if args.filter not in name:
+                continue
+            key = f'{suite}: {name}'
+            seconds = measure(func, repeat=args.repeat)
+            results[key] = seconds
+            base = baseline.get(key)
+            ratio = seconds / base if base else None
+            flag = ''
+            if ratio is not None and ratio > args.threshold:
+                flag = '  <- regression'
+                regressions.append(key)
+            print(f"{name:<44}{format_time(seconds):>12}"
+                  f"{format_time(base) if base else '-':>12}"
+                  f"{f'{ratio:.2f}' if ratio else '-':>8}{flag}")
+
+    if args.save:
+        merged = dict(baseline)
+        merged.update(results)
+        save_baseline(args.baseline, merged, {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+        })
+        print(f"\nsaved {len(results)} results to {args.baseline}")
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.2f}x baseline")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
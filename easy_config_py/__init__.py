@@ -5,6 +5,41 @@
 # @File    : __init__.py.py
 # @Software: PyCharm
 
+from .cache import FileCache, ContentCache
+from .instrumentation import Instrumentation, StatsSink, LoggingSink, CallbackSink
+from .file_watcher import FileWatcher
 from .file_loader import FileLoader
-from .addict import Dict
+from .env import EnvOverlay
+from .schema import Schema, Field, ValidationError
+from .snapshot import Snapshot
+from .frozen import FrozenConfig
+from .query import Query
+from .profiles import Profiles
+from .addict import Dict, LazyDict
+from . import tracking
+from . import merge
+from .merge import MergeStrategies
 from .config import EasyConfig
+
+# 可选功能所在的模块在第一次访问对应名称时才导入，import easy_config_py 不承担它们的开销
+_LAZY = {
+    'DiskCache': 'disk_cache',
+    'SharedSnapshot': 'shared',
+    'SharedView': 'shared',
+    'LayeredConfig': 'layered',
+    'LayeredView': 'layered',
+}
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    from importlib import import_module
+    value = getattr(import_module('.' + module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
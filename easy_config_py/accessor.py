@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/17-13:10
+# @Author  : 灯下客
+# @Email   :
+# @File    : accessor.py
+# @Software: PyCharm
+import weakref
+
+_MISSING = object()
+
+
+def register_accessor(node, accessor):
+    """把 accessor 登记到 Dict 节点上，节点被写入时 accessor 的缓存失效"""
+    accessors = node.__dict__.get('__accessors')
+    if accessors is None:
+        accessors = weakref.WeakSet()
+        object.__setattr__(node, '__accessors', accessors)
+    accessors.add(accessor)
+
+
+def invalidate_accessors(node):
+    """使登记在 Dict 节点上的 accessor 缓存全部失效"""
+    accessors = node.__dict__.get('__accessors')
+    if accessors:
+        for accessor in list(accessors):
+            accessor.invalidate()
+        accessors.clear()
+
+
+class PathAccessor(object):
+    """
+    预编译的点号路径访问器。
+
+    路径只在创建时拆分一次，之后每次读取只按预先拆好的键逐层查找。
+    cached=True 时还会缓存读取结果：访问器登记在路径经过的每个 Dict 节点上，
+    任何一个节点被写入（__setitem__ / 删除 / clear 等）时缓存失效，
+    未失效时读取只需要一次比较。
+
+    Args:
+        path: 点号分隔的路径，如 'database.host-name'
+        root: 返回根节点的可调用对象
+        cached: 是否缓存读取结果
+        setter: 可选的写入函数 setter(path, value)，默认直接写入根节点
+
+    示例:
+        >>> host = config.accessor('database.host-name', cached=True)
+        >>> host.get()  # 'localhost'
+        >>> host()      # 同 get()
+        >>> host.set('127.0.0.1')
+    """
+    __slots__ = ('path', 'keys', 'cached', '_root', '_setter',
+                 '_value', '_root_node', '_generation', '__weakref__')
+
+    def __init__(self, path, root, cached=False, setter=None):
+        self.path = path
+        self.keys = tuple(path.split('.'))
+        self.cached = cached
+        self._root = root
+        self._setter = setter
+        self._value = _MISSING
+        self._root_node = None
+        self._generation = 0
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, self.path)
+
+    def __call__(self, default=None):
+        return self.get(default)
+
+    def get(self, default=None):
+        """读取路径上的值，路径不存在时返回 default"""
+        root = self._root()
+        if self._value is not _MISSING and root is self._root_node:
+            return self._value
+        if self.cached:
+            return self._remember(root, default)
+        current = root
+        for k in self.keys:
+            if not isinstance(current, dict) or k not in current:
+                return default
+            current = current[k]
+        return current
+
+    def exists(self):
+        return self.get(_MISSING) is not _MISSING
+
+    def set(self, value):
+        """写入路径上的值，中间路径不存在时自动创建"""
+        if self._setter is not None:
+            self._setter(self.path, value)
+            return
+        root = self._root()
+        current = root
+        for k in self.keys[:-1]:
+            if k not in current:
+                current[k] = type(root)()
+            elif not isinstance(current[k], dict):
+                raise TypeError(
+                    f"Cannot set nested path '{self.path}': "
+                    f"'{k}' is not a dict (got {type(current[k]).__name__})"
+                )
+            elif not isinstance(current[k], type(root)):
+                current[k] = type(root)(current[k])
+            current = current[k]
+        current[self.keys[-1]] = root._hook(value)
+
+    def invalidate(self):
+        self._value = _MISSING
+        self._generation += 1
+
+    def _remember(self, root, default):
+        # 先登记再读取，读取期间发生的写入会使本次结果作废
+        generation = self._generation
+        cacheable = True
+        current = root
+        for k in self.keys:
+            if not isinstance(current, dict):
+                return default
+            if cacheable and hasattr(current, '__dict__'):
+                register_accessor(current, self)
+            else:
+                cacheable = False
+            if k not in current:
+                return default
+            current = current[k]
+        if cacheable:
+            self._root_node = root
+            self._value = current
+            if generation != self._generation:
+                self._value = _MISSING
+        return current
@@ -8,6 +8,14 @@
 
 import copy
 
+from easy_config_py import tracking
+from easy_config_py import merge
+from easy_config_py import codec
+from easy_config_py.frozen import deep_freeze
+from easy_config_py.query import compile_query, select_many
+from easy_config_py.accessor import PathAccessor, invalidate_accessors
+from easy_config_py.interpolation import Interpolator, notify_key
+
 
 class Dict(dict):
 
@@ -29,6 +37,7 @@ class Dict(dict):
 
         for key, val in kwargs.items():
             self[key] = self._hook(val)
+        tracking.start(self)
 
     def __setattr__(self, name, value):
         if hasattr(self.__class__, name):
@@ -37,19 +46,22 @@ class Dict(dict):
             self[name] = value
 
     def __setitem__(self, name, value):
-        is_frozen = (hasattr(self, '__frozen') and
-                    object.__getattribute__(self, '__frozen'))
-        if is_frozen and name not in super(Dict, self).keys():
-                raise KeyError(name)
-        super(Dict, self).__setitem__(name, value)
-        try:
-            p = object.__getattribute__(self, '__parent')
-            key = object.__getattribute__(self, '__key')
-        except AttributeError:
-            p = None
-            key = None
+        state = self.__dict__
+        if state.get('__frozen') and not dict.__contains__(self, name):
+            raise KeyError(name)
+        dict.__setitem__(self, name, value)
+        if isinstance(value, Dict):
+            tracking.adopt(self, value)
+        # 构造过程中（尚未开始跟踪）不记录；访问器和插值监听只在登记过时才通知
+        if '__created' in state:
+            tracking.record(self, name)
+        if state.get('__accessors'):
+            invalidate_accessors(self)
+        if state.get('__watchers'):
+            notify_key(self, name)
+        p = state.get('__parent')
         if p is not None:
-            p[key] = self
+            p[state['__key']] = self
             object.__delattr__(self, '__parent')
             object.__delattr__(self, '__key')
 
@@ -120,6 +132,160 @@ class Dict(dict):
     def __delattr__(self, name):
         del self[name]
 
+    def __delitem__(self, name):
+        super(Dict, self).__delitem__(name)
+        tracking.record(self, name)
+        if self.__dict__.get('__accessors'):
+            invalidate_accessors(self)
+        if self.__dict__.get('__watchers'):
+            notify_key(self, name)
+
+    def pop(self, *args):
+        had_key = bool(args) and args[0] in self
+        value = super(Dict, self).pop(*args)
+        if had_key:
+            tracking.record(self, args[0])
+            if self.__dict__.get('__watchers'):
+                notify_key(self, args[0])
+        if self.__dict__.get('__accessors'):
+            invalidate_accessors(self)
+        return value
+
+    def popitem(self):
+        item = super(Dict, self).popitem()
+        tracking.record(self, item[0])
+        if self.__dict__.get('__accessors'):
+            invalidate_accessors(self)
+        if self.__dict__.get('__watchers'):
+            notify_key(self, item[0])
+        return item
+
+    def clear(self):
+        keys = list(self.keys())
+        super(Dict, self).clear()
+        for key in keys:
+            tracking.record(self, key)
+            if self.__dict__.get('__watchers'):
+                notify_key(self, key)
+        if self.__dict__.get('__accessors'):
+            invalidate_accessors(self)
+
+    def accessor(self, key, cached=False):
+        """
+        预编译点号路径，返回可重复使用的访问器。
+
+        路径只拆分一次，适合在热点路径上反复读取同一个键。
+        cached=True 时缓存读取结果，路径上任意节点被写入后自动失效。
+
+        Args:
+            key: 点号分隔的路径，如 'database.host-name'
+            cached: 是否缓存读取结果
+
+        Returns:
+            PathAccessor 对象，支持 get(default) / set(value) / 直接调用
+
+        示例:
+            >>> d = Dict({'database': {'host-name': 'localhost'}})
+            >>> host = d.accessor('database.host-name')
+            >>> host.get()  # 'localhost'
+            >>> host.set('127.0.0.1')
+        """
+        return PathAccessor(key, lambda: self, cached)
+
+    def select(self, selector):
+        """
+        按选择器惰性产出匹配的值，支持列表下标、切片、通配符、递归下降和过滤，参见 query.Query。
+
+        选择器只编译一次（按字符串缓存），读取不会创建子节点。
+
+        示例:
+            >>> d = Dict({'services': [{'name': 'api', 'port': 80}, {'name': 'db', 'port': 5432}]})
+            >>> list(d.select('services.*.port'))            # [80, 5432]
+            >>> list(d.select('services[?port > 1000].name'))  # ['db']
+            >>> next(d.select('services.0.name'))             # 'api'
+        """
+        return compile_query(selector).iter(self)
+
+    def select_first(self, selector, default=None):
+        """返回第一个匹配的值，没有匹配时返回 default"""
+        return compile_query(selector).first(self, default)
+
+    def select_many(self, selectors):
+        """在一次遍历中求值多个选择器，返回 {选择器: 值列表}，参见 query.select_many"""
+        return select_many(self, selectors)
+
+    @property
+    def interpolator(self):
+        """以当前节点为根的 Interpolator，第一次访问时创建，参见 interpolation.Interpolator"""
+        interpolator = self.__dict__.get('__interpolator')
+        if interpolator is None:
+            interpolator = Interpolator(self)
+            object.__setattr__(self, '__interpolator', interpolator)
+        return interpolator
+
+    def resolve(self, key, default=None):
+        """
+        读取点号路径上的值，并解析其中的 ${...} 插值。
+
+        模板只解析一次，结果被缓存；写入某个键只使引用了它的路径失效。
+        支持 ${a.b}、${a.b:-默认值}、${env:NAME}，配置中不存在的单段引用会查找同名环境变量。
+
+        Raises:
+            ValueError: 引用存在循环
+            KeyError: 引用无法解析且没有默认值
+
+        示例:
+            >>> d = Dict({'host': 'db', 'url': 'postgres://${host}:${port:-5432}'})
+            >>> d.resolve('url')  # 'postgres://db:5432'
+        """
+        return self.interpolator.get(key, default)
+
+    def set_schema(self, schema):
+        """
+        为当前节点设置 schema（Schema 对象），之后的 update / setattr 会校验并转换写入的值。
+
+        只校验写入的部分，不会重新遍历整个字典；设置时不校验已有内容，
+        需要时请调用 validate()。传入 None 取消校验。
+        通过属性直接写入嵌套节点（d.database.port = ...）不会被校验。
+        """
+        object.__setattr__(self, '__schema', schema)
+
+    def validate(self):
+        """
+        按 set_schema 设置的 schema 完整校验，返回转换并填入默认值后的普通字典。
+
+        Raises:
+            ValidationError: 包含全部错误及其路径
+        """
+        schema = self.__dict__.get('__schema')
+        if schema is None:
+            raise ValueError("No schema set, call set_schema() first")
+        return schema.validate(self)
+
+    def changes_since(self, version):
+        """
+        返回 version（tracking.current_version() 的返回值）之后的修改，
+        只遍历版本号变化过的子树，参见 tracking.changes_since。
+
+        通过下标、属性、update、pop、del 等方式的修改都会被记录；
+        原地修改列表等可变值不会被记录，需要重新赋值。
+
+        示例:
+            >>> version = tracking.current_version()
+            >>> d.database.port = 5433
+            >>> patch = d.changes_since(version)
+            >>> other.apply_patch(patch)
+        """
+        return tracking.changes_since(self, version)
+
+    def diff(self, other):
+        """返回从 self 变为 other 所需的修改，参见 tracking.diff"""
+        return tracking.diff(self, other)
+
+    def apply_patch(self, patch):
+        """应用 changes_since / diff 返回的修改"""
+        return tracking.apply_patch(self, patch)
+
     def to_dict(self):
         base = {}
         for key, value in self.items():
@@ -136,6 +302,15 @@ class Dict(dict):
     def copy(self):
         return copy.copy(self)
 
+    def __copy__(self):
+        # 浅拷贝与原字典共享子节点：子节点同时归属两者，修改向两边传播
+        other = _new_node(self.__class__, self, bool(self.__dict__.get('__frozen')))
+        for value in dict.values(other):
+            if isinstance(value, Dict):
+                tracking.share(other, value)
+        tracking.start(other)
+        return other
+
     def deepcopy(self):
         return copy.deepcopy(self)
 
@@ -144,46 +319,83 @@ class Dict(dict):
         memo[id(self)] = other
         for key, value in self.items():
             other[copy.deepcopy(key, memo)] = copy.deepcopy(value, memo)
+        # 保留版本号，diff 时可以跳过未修改的子树
+        tracking.copy_state(self, other)
+        if '__schema' in self.__dict__:
+            object.__setattr__(other, '__schema', self.__dict__['__schema'])
         return other
 
     def update(self, *args, **kwargs):
-        other = {}
-        if args:
-            if len(args) > 1:
-                raise TypeError("update() takes at most 1 positional argument")
-            other.update(Dict(args[0]))
-        other.update(Dict(kwargs))
-        for k, v in other.items():
-            if ((k not in self) or
-                (not isinstance(self[k], dict)) or
-                (not isinstance(v, dict))):
-                value = v
-                if isinstance(v, list):
-                    value = [Dict(item) if isinstance(item, dict) else item for item in v]
-                self[k] = value
-            else:
-                self[k].update(Dict(v))
+        if len(args) > 1:
+            raise TypeError("update() takes at most 1 positional argument")
+        layers = []
+        if args and args[0]:
+            other = args[0]
+            layers.append(other if isinstance(other, dict) else self.__class__(other))
+        if kwargs:
+            layers.append(kwargs)
+        # 设置了 schema 时只校验传入的部分，未涉及的子树不会被重新遍历
+        merge.merge_many(self, layers)
 
-    def __getnewargs__(self):
-        return tuple(self.items())
+    def merge_many(self, sources, strategies=None):
+        """
+        把多个来源按顺序一次性合并进当前节点，每棵来源树只遍历一次，参见 merge.merge_many。
 
-    def __getstate__(self):
-        return self
+        Args:
+            sources: dict 组成的列表，越靠后优先级越高
+            strategies: {路径: 策略} 或 MergeStrategies，如 {'plugins': merge.APPEND}
+
+        示例:
+            >>> d = Dict({'servers': [{'name': 'a', 'port': 80}]})
+            >>> d.merge_many([{'servers': [{'name': 'a', 'port': 8080}]}, {'debug': True}],
+            ...              {'servers': merge.by_key('name')})
+        """
+        return merge.merge_many(self, sources, strategies)
+
+    def __reduce_ex__(self, protocol):
+        # 每个节点只序列化一次：子节点由 pickle 递归处理，反序列化时不再经过 _hook 和 update
+        return (_unpickle, (self.__class__, dict(self), bool(self.__dict__.get('__frozen'))))
 
     def __setstate__(self, state):
+        # 兼容旧版本 pickle 的数据
         self.update(state)
 
+    def to_bytes(self, allow_pickle=False):
+        """
+        编码为紧凑的 msgpack 字节串，适合发给其他进程，参见 codec.dumps。
+
+        只保存数据本身（元组按列表保存），不保存冻结状态等节点属性。
+        集合、日期等值需要 allow_pickle=True，解码方也必须 allow_pickle=True。
+
+        示例:
+            >>> raw = config.data.to_bytes()
+            >>> Dict.from_bytes(raw)
+        """
+        return codec.dumps(self, allow_pickle)
+
+    @classmethod
+    def from_bytes(cls, raw, frozen=False, allow_pickle=False):
+        """解码 to_bytes 的结果；frozen=True 时返回冻结的字典，allow_pickle 参见 codec.loads"""
+        data = codec.loads(raw, allow_pickle)
+        if cls.__dict__.get('_wrap') is not None:
+            # LazyDict 保持惰性，只包装顶层
+            data = cls(data)
+            if frozen:
+                data.freeze()
+            return data
+        return _build(cls, data, frozen)
+
     def __or__(self, other):
         if not isinstance(other, (Dict, dict)):
             return NotImplemented
-        new = Dict(self)
+        new = self.__class__(self)
         new.update(other)
         return new
 
     def __ror__(self, other):
         if not isinstance(other, (Dict, dict)):
             return NotImplemented
-        new = Dict(other)
+        new = self.__class__(other)
         new.update(self)
         return new
 
@@ -214,19 +426,22 @@ class Dict(dict):
             >>> d.getattr('key-with-dash')  # 1
             >>> d.getattr('nested.sub-key')  # 2
         """
+        schema = self.__dict__.get('__schema')
+        if schema is not None:
+            value = schema.check_value(key.split('.'), value)
         if '.' in key:
             # 支持嵌套路径设置
             keys = key.split('.')
             current = self
             for k in keys[:-1]:
                 if k not in current:
-                    current[k] = Dict()
+                    current[k] = self.__class__()
                 elif isinstance(current[k], Dict):
                     # 已经是 Dict，直接使用
                     pass
                 elif isinstance(current[k], dict):
                     # 是普通字典，转换为 Dict
-                    current[k] = Dict(current[k])
+                    current[k] = self.__class__(current[k])
                 else:
                     # 不是字典类型，无法创建嵌套路径
                     raise TypeError(
@@ -242,9 +457,158 @@ class Dict(dict):
 
     def freeze(self, should_freeze=True):
         object.__setattr__(self, '__frozen', should_freeze)
-        for key, val in self.items():
-            if isinstance(val, Dict):
-                val.freeze(should_freeze)
+        for val in self.values():
+            if isinstance(val, (dict, list, tuple)):
+                _freeze_value(val, should_freeze)
 
     def unfreeze(self):
         self.freeze(False)
+
+    def frozen(self):
+        """
+        返回深度冻结、可哈希的副本（FrozenConfig），参见 frozen.FrozenConfig。
+
+        与 freeze() 只禁止添加新键不同，冻结副本完全只读，列表转换为元组，
+        可以作为 functools.lru_cache 等缓存的键；内容相同的副本相等且哈希相同。
+
+        示例:
+            >>> d = Dict({'database': {'host': 'db', 'replicas': ['r1', 'r2']}})
+            >>> section = d.database.frozen()
+            >>> section.replicas        # ('r1', 'r2')
+            >>> section.fingerprint     # 内容指纹
+        """
+        return deep_freeze(self)
+
+
+def _new_node(cls, items, frozen):
+    # 不经过 __init__ / __setitem__ 直接构造节点
+    node = cls.__new__(cls)
+    object.__setattr__(node, '__parent', None)
+    object.__setattr__(node, '__key', None)
+    object.__setattr__(node, '__frozen', frozen)
+    dict.update(node, items)
+    return node
+
+
+def _unpickle(cls, items, frozen):
+    # 反序列化得到的子节点只属于这个节点
+    node = _new_node(cls, items, frozen)
+    for value in items.values():
+        if isinstance(value, Dict):
+            tracking.adopt(node, value)
+    tracking.start(node)
+    return node
+
+
+def _build(cls, value, frozen):
+    # 解码得到的新对象没有其他引用，自底向上直接构造节点，不经过 __setitem__
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if isinstance(item, (dict, list)):
+                value[key] = _build(cls, item, frozen)
+        return _unpickle(cls, value, frozen)
+    if isinstance(value, list):
+        for position, item in enumerate(value):
+            if isinstance(item, (dict, list)):
+                value[position] = _build(cls, item, frozen)
+    return value
+
+
+def _freeze_value(value, should_freeze):
+    # 列表 / 元组中的 Dict 同样冻结
+    if isinstance(value, Dict):
+        value.freeze(should_freeze)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            if isinstance(item, (dict, list, tuple)):
+                _freeze_value(item, should_freeze)
+
+
+def _plain_copy(item):
+    if isinstance(item, Dict):
+        return item.to_dict()
+    elif isinstance(item, dict):
+        return {key: _plain_copy(val) for key, val in item.items()}
+    elif isinstance(item, (list, tuple)):
+        return type(item)(_plain_copy(elem) for elem in item)
+    return item
+
+
+class LazyDict(Dict):
+    """
+    惰性转换的 Dict。
+
+    嵌套的普通 dict 原样保存，第一次通过属性或下标访问时才包装成 LazyDict，
+    包装结果写回并缓存；列表/元组在所属节点创建时转换，其中的 dict 元素同样惰性包装。
+    对大配置只会转换实际读取到的部分，加载时间和峰值内存都更低。
+
+    to_dict、freeze、相等比较和迭代的行为与 Dict 相同。
+
+    示例:
+        >>> d = LazyDict({'database': {'host': 'localhost'}})
+        >>> dict.__getitem__(d, 'database')  # 仍是普通 dict
+        >>> d.database.host                   # 首次访问时包装为 LazyDict
+    """
+
+    @classmethod
+    def _hook(cls, item):
+        if isinstance(item, (list, tuple)):
+            return type(item)(cls(elem) if isinstance(elem, dict) and not isinstance(elem, Dict)
+                              else cls._hook(elem) for elem in item)
+        return item
+
+    def _wrap(self, name, value):
+        child = self.__class__(value)
+        if self.__dict__.get('__frozen'):
+            object.__setattr__(child, '__frozen', True)
+        dict.__setitem__(self, name, child)
+        # 包装不算修改：子节点的版本号取该键最后写入时的版本号
+        tracking.adopt(self, child, tracking.key_version(self, name))
+        return child
+
+    def __getitem__(self, name):
+        value = super(LazyDict, self).__getitem__(name)
+        if isinstance(value, dict) and not isinstance(value, Dict):
+            return self._wrap(name, value)
+        return value
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def pop(self, *args):
+        value = super(LazyDict, self).pop(*args)
+        if isinstance(value, dict) and not isinstance(value, Dict):
+            value = self.__class__(value)
+        return value
+
+    def _materialize(self):
+        for key, value in list(dict.items(self)):
+            if isinstance(value, dict) and not isinstance(value, Dict):
+                self._wrap(key, value)
+
+    def items(self):
+        self._materialize()
+        return super(LazyDict, self).items()
+
+    def values(self):
+        self._materialize()
+        return super(LazyDict, self).values()
+
+    def to_dict(self):
+        return {key: _plain_copy(value) for key, value in dict.items(self)}
+
+    def __deepcopy__(self, memo):
+        other = self.__class__()
+        memo[id(self)] = other
+        for key, value in dict.items(self):
+            dict.__setitem__(other, copy.deepcopy(key, memo), copy.deepcopy(value, memo))
+        tracking.copy_state(self, other)
+        return other
+
+    def freeze(self, should_freeze=True):
+        # 尚未包装的子节点在包装时继承冻结状态
+        object.__setattr__(self, '__frozen', should_freeze)
+        for val in dict.values(self):
+            _freeze_value(val, should_freeze)
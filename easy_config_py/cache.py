@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/17-10:05
+# @Author  : 灯下客
+# @Email   :
+# @File    : cache.py
+# @Software: PyCharm
+import os
+import stat
+import threading
+from collections import OrderedDict
+
+# 条目类型：原始字节与解析结果分开缓存
+RAW = 'raw'
+PARSED = 'parsed'
+
+_MISSING = object()
+
+
+def file_signature(path):
+    """
+    获取文件签名 (mtime_ns, size, inode)，用于廉价地判断文件是否发生变化。
+
+    Returns:
+        签名元组；如果路径不存在或不是普通文件返回 None
+    """
+    try:
+        st = os.stat(path)
+    except (OSError, ValueError):
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+class LRUCache(object):
+    """
+    线程安全的 LRU 缓存，可按条目数和字节数限制容量。
+
+    Args:
+        max_entries: 最大条目数，None 表示不限制
+        max_bytes: 最大字节数（按写入时给出的 size 累计），None 表示不限制
+    """
+
+    def __init__(self, max_entries=128, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, size=0):
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (value, size)
+            self._bytes += size
+            self._evict()
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            self._discard(key)
+            return entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """返回缓存统计信息的快照"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+            }
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, _MISSING)
+        if entry is not _MISSING:
+            self._bytes -= entry[1]
+            self._on_discard(key)
+
+    def _on_discard(self, key):
+        pass
+
+    def _evict(self):
+        while self._entries and (
+                (self.max_entries is not None and len(self._entries) > self.max_entries) or
+                (self.max_bytes is not None and self._bytes > self.max_bytes)):
+            key, entry = self._entries.popitem(last=False)
+            self._bytes -= entry[1]
+            self.evictions += 1
+            self._on_discard(key)
+
+
+class FileCache(LRUCache):
+    """
+    文件缓存：每个条目记录写入时的文件签名 (mtime_ns, size, inode)，
+    读取时重新 stat 一次进行校验，文件变化后条目自动失效。
+
+    原始字节和解析结果作为独立条目存放，键为 (path, kind)，
+    其中 kind 为 RAW 或解析函数本身。
+
+    示例:
+        >>> cache = FileCache(max_entries=64, max_bytes=32 * 1024 * 1024)
+        >>> loader = FileLoader('./config', 'config.yml', cache=cache)
+        >>> cache.stats()  # {'hits': ..., 'misses': ..., 'evictions': ..., ...}
+        >>> cache.invalidate('./config/config.yml')
+    """
+
+    def __init__(self, max_entries=128, max_bytes=None):
+        super(FileCache, self).__init__(max_entries, max_bytes)
+        self._keys_by_path = {}
+        self.stale = 0
+
+    def get(self, path, kind=PARSED, default=None, signature=None, count=True):
+        """
+        获取缓存条目，文件签名不一致时视为未命中并丢弃该条目。
+
+        Args:
+            path: 文件路径
+            kind: RAW 或解析函数
+            default: 未命中时的返回值
+            signature: 已经获取过的文件签名，避免重复 stat
+            count: 是否计入命中/未命中统计
+        """
+        key = (path, kind)
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += count
+                return default
+            if signature is None:
+                signature = file_signature(path)
+            value, cached_signature = entry[0]
+            if signature is None or signature != cached_signature:
+                self._discard(key)
+                self.stale += 1
+                self.misses += count
+                return default
+            self._entries.move_to_end(key)
+            self.hits += count
+            return value
+
+    def put(self, path, value, kind=PARSED, signature=None, size=None):
+        """
+        写入缓存条目。
+
+        Args:
+            path: 文件路径
+            value: 缓存的值
+            kind: RAW 或解析函数
+            signature: 读取文件之前获取的签名，默认立即 stat
+            size: 计入字节上限的大小，默认取文件大小
+        """
+        if signature is None:
+            signature = file_signature(path)
+        if signature is None:
+            return
+        if size is None:
+            size = len(value) if kind == RAW else signature[1]
+        key = (path, kind)
+        with self._lock:
+            super(FileCache, self).put(key, (value, signature), size)
+            if key in self._entries:
+                self._keys_by_path.setdefault(path, set()).add(key)
+
+    def invalidate(self, path=None):
+        """
+        使缓存失效。
+
+        Args:
+            path: 需要失效的文件路径；为 None 时清空全部条目
+        """
+        with self._lock:
+            if path is None:
+                self.clear()
+                return
+            for key in list(self._keys_by_path.get(path, ())):
+                self._discard(key)
+
+    def clear(self):
+        with self._lock:
+            super(FileCache, self).clear()
+            self._keys_by_path.clear()
+
+    def stats(self):
+        result = super(FileCache, self).stats()
+        result['stale'] = self.stale
+        return result
+
+    def _on_discard(self, key):
+        keys = self._keys_by_path.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_path[key[0]]
+
+
+class ContentCache(LRUCache):
+    """
+    内容缓存：按 (内容哈希, 解析器类型) 缓存 load_by_content 的解析结果，
+    相同内容重复加载时跳过解析（异步加载时也省去一次线程池调度）。
+
+    缓存的解析结果在各个 EasyConfig 之间共享，只读使用：合并时 Dict.update 总是复制，
+    LazyDict 则直接引用未展开的子树，首次访问时才复制。多个配置对象可以共用同一个 ContentCache。
+
+    示例:
+        >>> contents = ContentCache(max_entries=256, max_bytes=64 * 1024 * 1024)
+        >>> config = EasyConfig(content_cache=contents)
+        >>> config.load_by_content(blob, 'yaml')
+        >>> contents.stats()['hits']
+    """
+
+    def __init__(self, max_entries=256, max_bytes=None):
+        super(ContentCache, self).__init__(max_entries, max_bytes)
+
+    @staticmethod
+    def key(content, parser_type):
+        """返回内容的缓存键 (blake2b 摘要, 解析器类型)"""
+        # hashlib 只在启用内容缓存时导入
+        import hashlib
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        return hashlib.blake2b(content, digest_size=20).digest(), parser_type
+
+    def load(self, content, parser_type, parse):
+        """
+        返回缓存的解析结果，未命中时调用 parse(content, parser_type) 并写入缓存。
+
+        Returns:
+            (解析结果, 是否命中)
+        """
+        key = self.key(content, parser_type)
+        result = self.get(key, _MISSING)
+        if result is not _MISSING:
+            return result, True
+        result = parse(content, parser_type)
+        self.put(key, result, len(content))
+        return result, False
@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/18-02:50
+# @Author  : 灯下客
+# @Email   :
+# @File    : codec.py
+# @Software: PyCharm
+import pickle
+import struct
+
+# allow_pickle=True 时，无法用 msgpack 基本类型表示的值（集合、日期等）以 pickle 保存在这个扩展类型中
+PICKLE_EXT = 1
+
+_msgpack = None
+
+
+def _load_msgpack():
+    """返回 msgpack 模块，未安装时返回 None"""
+    global _msgpack
+    if _msgpack is None:
+        try:
+            import msgpack
+        except ImportError:
+            msgpack = False
+        _msgpack = msgpack
+    return _msgpack or None
+
+
+def dumps(data, allow_pickle=False):
+    """
+    把配置编码为 msgpack 格式的字节串。
+
+    安装了 msgpack（pip install easy-config-py[fast]）时使用它的 C 实现，否则使用内置的纯 Python 实现，
+    两者输出相同，可以被任何 msgpack 库读取。元组按数组保存。
+
+    纯 Python 实现比 pickle 慢（编码最多约 1.5 倍、解码约 3～4 倍），它的价值在于格式紧凑、跨语言、
+    解码时不执行代码；只在 Python 进程之间传递、双方互相信任时，直接使用 pickle 更快。
+
+    Args:
+        data: 由 dict、list、tuple、str、int、float、bool、None、bytes 组成的数据
+        allow_pickle: 是否把其他类型的值（集合、日期等）以 pickle 保存在扩展类型中；
+            默认遇到时抛出 TypeError
+
+    示例:
+        >>> raw = dumps(config.to_dict())
+        >>> loads(raw)
+    """
+    msgpack = _load_msgpack()
+    if msgpack is not None:
+        return msgpack.packb(data, use_bin_type=True,
+                             default=_pack_default if allow_pickle else _reject)
+    buffer = bytearray()
+    _pack(data, buffer, allow_pickle)
+    return bytes(buffer)
+
+
+def loads(raw, allow_pickle=False):
+    """
+    解码 dumps 的结果，返回普通 dict / list。
+
+    pickle.loads 可以执行任意代码，默认遇到 pickle 扩展类型时抛出 ValueError；
+    只有数据来自可信的来源时才应传入 allow_pickle=True。
+    """
+    msgpack = _load_msgpack()
+    if msgpack is not None:
+        return msgpack.unpackb(raw, raw=False, strict_map_key=False,
+                               ext_hook=_unpack_ext if allow_pickle else _reject_ext)
+    value, offset = _Unpacker(raw, allow_pickle).unpack(0)
+    if offset != len(raw):
+        raise ValueError("Extra data after msgpack document ({} bytes)".format(len(raw) - offset))
+    return value
+
+
+def _reject(value):
+    raise TypeError("Cannot encode value of type {} without allow_pickle=True".format(type(value).__name__))
+
+
+def _pickle_disabled():
+    return ValueError("msgpack data contains a pickled value, decode with allow_pickle=True "
+                      "only if it comes from a trusted source")
+
+
+def _pack_default(value):
+    return _load_msgpack().ExtType(PICKLE_EXT, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+
+
+def _unpack_ext(code, data):
+    if code == PICKLE_EXT:
+        return pickle.loads(data)
+    return _load_msgpack().ExtType(code, data)
+
+
+def _reject_ext(code, data):
+    if code == PICKLE_EXT:
+        raise _pickle_disabled()
+    return _load_msgpack().ExtType(code, data)
+
+
+_pack_u8 = struct.Struct('>B').pack
+_pack_u16 = struct.Struct('>H').pack
+_pack_u32 = struct.Struct('>I').pack
+_pack_u64 = struct.Struct('>Q').pack
+_pack_i8 = struct.Struct('>b').pack
+_pack_i16 = struct.Struct('>h').pack
+_pack_i32 = struct.Struct('>i').pack
+_pack_i64 = struct.Struct('>q').pack
+_pack_f64 = struct.Struct('>d').pack
+
+
+def _pack_header(size, fix, fix_limit, codes, buffer):
+    # 长度前缀：fix 类型把长度放在类型字节中，否则依次尝试 8 / 16 / 32 位长度
+    if size < fix_limit:
+        buffer.append(fix | size)
+    elif codes[0] is not None and size < 0x100:
+        buffer.append(codes[0])
+        buffer += _pack_u8(size)
+    elif size < 0x10000:
+        buffer.append(codes[1])
+        buffer += _pack_u16(size)
+    elif size < 0x100000000:
+        buffer.append(codes[2])
+        buffer += _pack_u32(size)
+    else:
+        raise ValueError("Object is too large to pack ({} items)".format(size))
+
+
+def _pack(value, buffer, allow_pickle):
+    if value is None:
+        buffer.append(0xc0)
+    elif value is True:
+        buffer.append(0xc3)
+    elif value is False:
+        buffer.append(0xc2)
+    elif isinstance(value, str):
+        raw = value.encode('utf-8')
+        _pack_header(len(raw), 0xa0, 32, (0xd9, 0xda, 0xdb), buffer)
+        buffer += raw
+    elif isinstance(value, int) and -2 ** 63 <= value < 2 ** 64:
+        if 0 <= value < 0x80:
+            buffer.append(value)
+        elif -32 <= value < 0:
+            buffer.append(value & 0xff)
+        elif value >= 0:
+            if value < 0x100:
+                buffer += b'\xcc' + _pack_u8(value)
+            elif value < 0x10000:
+                buffer += b'\xcd' + _pack_u16(value)
+            elif value < 0x100000000:
+                buffer += b'\xce' + _pack_u32(value)
+            else:
+                buffer += b'\xcf' + _pack_u64(value)
+        elif value >= -0x80:
+            buffer += b'\xd0' + _pack_i8(value)
+        elif value >= -0x8000:
+            buffer += b'\xd1' + _pack_i16(value)
+        elif value >= -0x80000000:
+            buffer += b'\xd2' + _pack_i32(value)
+        else:
+            buffer += b'\xd3' + _pack_i64(value)
+    elif isinstance(value, float):
+        buffer += b'\xcb' + _pack_f64(value)
+    elif isinstance(value, dict):
+        # 直接读取底层字典，LazyDict 不会被触发包装
+        _pack_header(len(value), 0x80, 16, (None, 0xde, 0xdf), buffer)
+        for key, item in dict.items(value):
+            _pack(key, buffer, allow_pickle)
+            _pack(item, buffer, allow_pickle)
+    elif isinstance(value, (list, tuple)):
+        _pack_header(len(value), 0x90, 16, (None, 0xdc, 0xdd), buffer)
+        for item in value:
+            _pack(item, buffer, allow_pickle)
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        raw = bytes(value)
+        _pack_header(len(raw), 0, 0, (0xc4, 0xc5, 0xc6), buffer)
+        buffer += raw
+    elif allow_pickle:
+        raw = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        _pack_header(len(raw), 0, 0, (0xc7, 0xc8, 0xc9), buffer)
+        buffer.append(PICKLE_EXT)
+        buffer += raw
+    else:
+        _reject(value)
+
+
+_unpack_u8 = struct.Struct('>B').unpack_from
+_unpack_u16 = struct.Struct('>H').unpack_from
+_unpack_u32 = struct.Struct('>I').unpack_from
+_unpack_u64 = struct.Struct('>Q').unpack_from
+_unpack_i8 = struct.Struct('>b').unpack_from
+_unpack_i16 = struct.Struct('>h').unpack_from
+_unpack_i32 = struct.Struct('>i').unpack_from
+_unpack_i64 = struct.Struct('>q').unpack_from
+_unpack_f32 = struct.Struct('>f').unpack_from
+_unpack_f64 = struct.Struct('>d').unpack_from
+
+# 类型字节 -> (读取函数, 宽度)
+_FIXED = {
+    0xcc: (_unpack_u8, 1), 0xcd: (_unpack_u16, 2), 0xce: (_unpack_u32, 4), 0xcf: (_unpack_u64, 8),
+    0xd0: (_unpack_i8, 1), 0xd1: (_unpack_i16, 2), 0xd2: (_unpack_i32, 4), 0xd3: (_unpack_i64, 8),
+    0xca: (_unpack_f32, 4), 0xcb: (_unpack_f64, 8),
+}
+# 长度前缀的宽度
+_SIZES = {
+    0xd9: 1, 0xda: 2, 0xdb: 4,   # str
+    0xc4: 1, 0xc5: 2, 0xc6: 4,   # bin
+    0xdc: 2, 0xdd: 4,            # array
+    0xde: 2, 0xdf: 4,            # map
+    0xc7: 1, 0xc8: 2, 0xc9: 4,   # ext
+}
+_SIZE_READERS = {1: _unpack_u8, 2: _unpack_u16, 4: _unpack_u32}
+_FIXEXT = {0xd4: 1, 0xd5: 2, 0xd6: 4, 0xd7: 8, 0xd8: 16}
+
+
+class _Unpacker(object):
+    __slots__ = ('raw', 'allow_pickle')
+
+    def __init__(self, raw, allow_pickle=False):
+        self.raw = memoryview(raw)
+        self.allow_pickle = allow_pickle
+
+    def unpack(self, offset):
+        raw = self.raw
+        try:
+            code = raw[offset]
+        except IndexError:
+            raise ValueError("Truncated msgpack data at offset {}".format(offset)) from None
+        offset += 1
+        if code < 0x80:
+            return code, offset
+        if code >= 0xe0:
+            return code - 0x100, offset
+        if 0x80 <= code <= 0x8f:
+            return self._map(code & 0x0f, offset)
+        if 0x90 <= code <= 0x9f:
+            return self._array(code & 0x0f, offset)
+        if 0xa0 <= code <= 0xbf:
+            size = code & 0x1f
+            return str(raw[offset:offset + size], 'utf-8'), offset + size
+        if code == 0xc0:
+            return None, offset
+        if code == 0xc2:
+            return False, offset
+        if code == 0xc3:
+            return True, offset
+        fixed = _FIXED.get(code)
+        if fixed is not None:
+            return fixed[0](raw, offset)[0], offset + fixed[1]
+        width = _SIZES.get(code)
+        if width is not None:
+            size = _SIZE_READERS[width](raw, offset)[0]
+            offset += width
+            if code in (0xd9, 0xda, 0xdb):
+                return str(raw[offset:offset + size], 'utf-8'), offset + size
+            if code in (0xc4, 0xc5, 0xc6):
+                return bytes(raw[offset:offset + size]), offset + size
+            if code in (0xdc, 0xdd):
+                return self._array(size, offset)
+            if code in (0xde, 0xdf):
+                return self._map(size, offset)
+            return self._ext(raw[offset], offset + 1, size)
+        size = _FIXEXT.get(code)
+        if size is not None:
+            return self._ext(raw[offset], offset + 1, size)
+        raise ValueError("Invalid msgpack type byte 0x{:02x} at offset {}".format(code, offset - 1))
+
+    def _map(self, size, offset):
+        result = {}
+        unpack = self.unpack
+        for _ in range(size):
+            key, offset = unpack(offset)
+            result[key], offset = unpack(offset)
+        return result, offset
+
+    def _array(self, size, offset):
+        result = []
+        unpack = self.unpack
+        for _ in range(size):
+            item, offset = unpack(offset)
+            result.append(item)
+        return result, offset
+
+    def _ext(self, code, offset, size):
+        data = bytes(self.raw[offset:offset + size])
+        if code != PICKLE_EXT:
+            raise ValueError("Unsupported msgpack extension type {}".format(code))
+        if not self.allow_pickle:
+            raise _pickle_disabled()
+        return pickle.loads(data), offset + size
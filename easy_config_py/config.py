@@ -5,25 +5,79 @@
 # @File    : config.py
 # @Software: PyCharm
 import os.path
-import asyncio
+import threading
 from functools import partial
 
-import anyconfig
-
-from easy_config_py import Dict
+from easy_config_py import Dict, LazyDict
 from easy_config_py import FileLoader
+from easy_config_py import parsers
+from easy_config_py import tracking
+from easy_config_py import merge
+from easy_config_py.accessor import PathAccessor
+from easy_config_py.file_watcher import FileWatcher
+from easy_config_py.cache import file_signature, ContentCache, _MISSING
+from easy_config_py.env import EnvOverlay
+from easy_config_py.schema import Schema
+from easy_config_py.snapshot import build_snapshot
+from easy_config_py.frozen import deep_freeze
+from easy_config_py.profiles import Profiles
+from easy_config_py.streaming import iter_documents
+from easy_config_py.instrumentation import clock, make_instrumentation, MERGE, PARSE
 
 
 class EasyConfig(object):
 
-    def __init__(self, data=None, path=None, default_filename='config.yml'):
-        self._data = Dict(data)
+    def __init__(self, data=None, path=None, default_filename='config.yml', cache=None,
+                 lazy=False, disk_cache=None, max_workers=None, instrument=None, schema=None,
+                 content_cache=None, merge_strategies=None):
+        # lazy=True 时嵌套字典在首次访问时才转换为 Dict，适合很大的配置
+        self._dict_class = LazyDict if lazy else Dict
+        self._data = self._dict_class(data)
+        # 按加载顺序记录配置来源，热重载时据此重新合并
+        self._sources = [('update', (data,), {})] if data else []
+        self._lock = threading.RLock()
+        self._watcher = None
+        # 最近发布的只读快照；第一次调用 snapshot() 之后，每次写入都在锁内发布新快照
+        self._snapshot = None
+        # 最近发布的深度冻结副本，第一次调用 frozen() 之后与快照一起发布
+        self._frozen = None
+        # set_profiles() 之后的剖面定义与合并视图缓存，以及当前激活的剖面
+        self._profiles = None
+        self._active_profile = None
+        # share() 之后每次写入都把配置发布到这个共享快照文件；_shared_owned 表示文件由 share() 创建，close() 时删除
+        self._shared_path = None
+        self._shared_owned = False
+        self._shared_pickle = False
+        # 已保存的文件：path -> (保存时配置的版本号, 文件签名)
+        self._saved = {}
         if path is not None and os.path.isfile(path):
             path = os.path.dirname(path)
         if path is None:
             path = os.path.dirname(__file__)
         self.path = path
-        self._loader = FileLoader(path, default_filename)
+        # instrument 可以是 Instrumentation、单个 sink，或 True（使用 StatsSink）
+        self._instrument = make_instrumentation(instrument)
+        self._loader = FileLoader(path, default_filename, cache, max_workers=max_workers,
+                                  instrument=self._instrument)
+        # disk_cache 可以是 DiskCache 对象、缓存目录，或 True（缓存放在配置文件旁边）
+        if disk_cache is True or isinstance(disk_cache, str):
+            # 磁盘缓存（pickle 等）只在开启时导入
+            from easy_config_py.disk_cache import DiskCache
+            disk_cache = DiskCache() if disk_cache is True else DiskCache(disk_cache)
+        self._disk_cache = disk_cache
+        if disk_cache is None and self._instrument is None:
+            self._parse = parsers.load_file
+        else:
+            self._parse = parsers.FileParser(disk_cache, self._instrument)
+        # content_cache 可以是 ContentCache 对象或 True，load_by_content 按内容哈希复用解析结果
+        if content_cache is True:
+            content_cache = ContentCache()
+        self._content_cache = content_cache
+        # 按路径的合并策略，update / 加载文件 / 热重载都按同样的策略合并
+        self._strategies = merge.compile_strategies(merge_strategies)
+        self._schema = None
+        if schema is not None:
+            self.set_schema(schema)
 
     def __getattr__(self, item):
         return self._data.get(item)
@@ -64,57 +118,918 @@ class EasyConfig(object):
             >>> config.setattr('nested.sub-key', 123)
             >>> config.getattr('key-with-dash')  # 'value'
         """
-        self._data.setattr(key, value)
+        with self._lock:
+            self._data.setattr(key, value)
+            self._sources.append(('set', key, value))
+            self._publish()
+
+    def resolve(self, key, default=None):
+        """
+        读取配置值并解析 ${...} 插值，参见 Dict.resolve。
+
+        热重载替换 _data 后使用新配置上的解析器，缓存自然失效。
+
+        示例:
+            >>> config.load_by_content("host: db\nurl: postgres://${host}:${port:-5432}")
+            >>> config.resolve('url')  # 'postgres://db:5432'
+        """
+        return self._data.resolve(key, default)
+
+    def resolved(self):
+        """返回解析了全部插值的普通字典"""
+        return self._data.interpolator.resolve_all()
+
+    def accessor(self, key, cached=False):
+        """
+        预编译点号路径，返回可重复使用的访问器，参见 Dict.accessor。
+
+        访问器每次都从当前的 _data 读取，热重载替换 _data 后依然有效；
+        通过访问器写入等同于调用 setattr。
+
+        示例:
+            >>> host = config.accessor('database.host-name', cached=True)
+            >>> host.get()  # 'localhost'
+        """
+        return PathAccessor(key, lambda: self._data, cached, self.setattr)
+
+    def select(self, selector):
+        """
+        按选择器惰性产出匹配的值，参见 Dict.select 和 query.Query。
+
+        示例:
+            >>> list(config.select('services[?enabled].port'))
+            >>> config.select_first('services[-1].name')
+        """
+        return self._data.select(selector)
+
+    def select_first(self, selector, default=None):
+        """返回第一个匹配的值，没有匹配时返回 default"""
+        return self._data.select_first(selector, default)
+
+    def select_many(self, selectors):
+        """
+        在一次遍历中求值多个选择器，返回 {选择器: 值列表}，参见 query.select_many。
+
+        示例:
+            >>> result = config.select_many(['services.*.name', 'services.*.port'])
+        """
+        return self._data.select_many(selectors)
 
     @property
     def data(self):
         return self._data
 
+    def snapshot(self):
+        """
+        返回当前配置的不可变只读快照，参见 snapshot.Snapshot。
+
+        读取快照不加锁、不分配：不存在的键抛出异常或返回默认值，不会像 Dict 那样创建子节点。
+        写入方（update / load_file / setattr / reload 等）在锁内构建新快照（共享未变化的子树），
+        再整体替换引用发布，读取方要么拿到旧快照，要么拿到完整的新快照。
+        直接修改 config.data 后需要调用 mark_dirty() 发布。
+
+        示例:
+            >>> snap = config.snapshot()      # 每个请求取一次
+            >>> snap.database.host
+            >>> snap.get('missing', 'default')
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._snapshot = build_snapshot(self._data)
+                snapshot = self._snapshot
+        return snapshot
+
+    def frozen(self, key=None):
+        """
+        返回配置（或 key 指定的配置段）的深度冻结、可哈希副本，参见 frozen.FrozenConfig。
+
+        冻结副本与快照一样在每次写入后发布，未变化的子树复用上一次的节点和已经计算的指纹；
+        重载后内容没有变化的配置段与之前的副本相等、哈希相同，适合作为 lru_cache 的键，
+        按配置段缓存连接池、客户端、编译好的正则等。
+
+        Args:
+            key: 点号分隔的配置段路径，为 None 时返回整个配置
+
+        Returns:
+            FrozenConfig；key 对应的值不是字典时返回冻结后的值，不存在时返回 None
+
+        示例:
+            >>> @functools.lru_cache(maxsize=16)
+            ... def connect(database):
+            ...     return create_engine(database.url, pool_size=database.pool_size)
+            >>> engine = connect(config.frozen('database'))
+        """
+        root = self._frozen
+        if root is None:
+            with self._lock:
+                if self._frozen is None:
+                    self._frozen = deep_freeze(self._data)
+                root = self._frozen
+        return root if key is None else root.getattr(key)
+
+    def set_profiles(self, profiles, base='default', active=None):
+        """
+        声明配置中的剖面（profile）配置段，参见 profiles.Profiles。
+
+        同一个文件中保存 default、dev、prod 及各地域的配置段时，每个剖面的合并视图
+        （基础段 + 剖面段，按 merge_strategies 合并）在第一次读取时构建并缓存，不修改 config.data；
+        切换剖面只是替换名称，多个剖面可以同时读取。只有组成某个剖面的配置段发生变化
+        （写入、热重载、直接修改 config.data）时，该剖面的视图才会重新合并。
+
+        Args:
+            profiles: 剖面名称列表，或 {名称: 配置段路径列表}
+            base: 所有剖面共同的基础配置段，None 表示没有
+            active: 初始激活的剖面
+
+        示例:
+            >>> config.load_file('app.yml')    # default / dev / prod / regions.eu ...
+            >>> config.set_profiles({'dev': ['dev'], 'prod': ['prod'], 'prod-eu': ['prod', 'regions.eu']})
+            >>> config.use_profile('prod-eu')
+            >>> config.profile().database.host
+            >>> config.profile('dev').database.host
+        """
+        profiles = Profiles(profiles, base)
+        if active is not None:
+            profiles.sections(active)
+        with self._lock:
+            self._profiles = profiles
+            if active is not None or self._active_profile not in profiles:
+                self._active_profile = active
+
+    @property
+    def profiles(self):
+        """已声明的剖面名称列表"""
+        return self._profiles.names if self._profiles is not None else []
+
+    @property
+    def active_profile(self):
+        return self._active_profile
+
+    def use_profile(self, name):
+        """激活剖面 name（None 表示取消激活），视图在第一次读取时才构建"""
+        if name is not None:
+            self._require_profiles().sections(name)
+        self._active_profile = name
+
+    def profile(self, name=None):
+        """
+        返回剖面的合并视图（FrozenConfig，只读、可哈希），name 为 None 时返回当前激活的剖面。
+
+        缓存有效时只比较各配置段的版本号，不加锁、不合并。
+        """
+        profiles = self._require_profiles()
+        if name is None:
+            name = self._active_profile
+            if name is None:
+                raise ValueError("No active profile, call use_profile() first")
+        view = profiles.cached(self._data, name)
+        if view is None:
+            with self._lock:
+                view = profiles.build(self._data, name, partial(self._build_profile, name))
+        return view
+
+    def _require_profiles(self):
+        if self._profiles is None:
+            raise ValueError("No profiles set, call set_profiles() first")
+        return self._profiles
+
+    def _build_profile(self, name, sections, previous):
+        started = clock() if self._instrument is not None else None
+        if len(sections) == 1:
+            # 只有一个配置段时直接冻结，未变化的子树复用上一次的视图
+            view = deep_freeze(sections[0], previous)
+        else:
+            merged = Dict()
+            self._merge(merged, sections)
+            view = deep_freeze(merged)
+        if started is not None:
+            self._instrument.emit(MERGE, clock() - started, layers=len(sections), profile=name)
+        return view
+
+    def _publish(self, rebuild=False):
+        # 调用方持有 self._lock；还没有人使用快照时不构建。
+        # rebuild=True 时不复用上一次的快照和冻结副本（及其指纹）：未被跟踪的子树（如 LazyDict 尚未包装的字典）没有版本号可比较
+        if self._snapshot is not None:
+            self._snapshot = build_snapshot(self._data, None if rebuild else self._snapshot)
+        if self._frozen is not None:
+            self._frozen = deep_freeze(self._data, None if rebuild else self._frozen)
+        if self._shared_path is not None:
+            from easy_config_py import shared
+            shared.publish(self._data, self._shared_path, self._shared_pickle)
+
+    def share(self, path=None, allow_pickle=False):
+        """
+        把配置发布为跨进程共享的只读快照（内存文件映射），参见 shared.SharedSnapshot。
+
+        配置被编码为紧凑的二进制布局写入 path，之后每次写入（包括 reload）都原子地发布新的一代。
+        在 fork worker 之前调用，worker 中用 attach_shared(config.shared_path) 零拷贝读取。
+        每次发布都会重新编码整个配置，适合写入很少的主进程。
+
+        Args:
+            path: 快照文件路径，默认在 /dev/shm（或临时目录）下新建私有目录（0700），
+                用 mkstemp 创建文件名不可预测的快照文件（0600），close() 时删除
+            allow_pickle: 是否允许以 pickle 保存基本类型以外的键和值，默认遇到时抛出 TypeError；
+                开启后 worker 也需要 attach_shared(path, allow_pickle=True)
+
+        Returns:
+            快照文件路径
+
+        示例:
+            >>> config.load_file()
+            >>> config.share()                         # gunicorn 主进程，on_starting 钩子中
+            >>> shared = EasyConfig.attach_shared(config.shared_path)   # worker 中
+            >>> shared.view(refresh=True).database.host
+        """
+        # 共享快照（mmap、struct 等）只在第一次 share() 时导入
+        from easy_config_py import shared
+        with self._lock:
+            owned = path is None
+            if owned:
+                path = shared.create_path()
+            path = os.path.abspath(path)
+            try:
+                shared.publish(self._data, path, allow_pickle)
+            except BaseException:
+                if owned:
+                    shared.remove_path(path)
+                raise
+            self._shared_path = path
+            self._shared_owned = owned
+            self._shared_pickle = allow_pickle
+        return self._shared_path
+
+    @property
+    def shared_path(self):
+        """share() 发布的快照文件路径，未共享时为 None"""
+        return self._shared_path
+
+    @staticmethod
+    def attach_shared(path, allow_pickle=False):
+        """以只读方式映射 share() 发布的快照，返回 SharedSnapshot；allow_pickle 参见 SharedSnapshot"""
+        from easy_config_py import shared
+        return shared.SharedSnapshot(path, allow_pickle)
+
+    @property
+    def loader(self):
+        return self._loader
+
+    @property
+    def instrument(self):
+        return self._instrument
+
+    @property
+    def schema(self):
+        return self._schema
+
+    def set_schema(self, schema, extra=True):
+        """
+        设置配置的 schema，规格只编译一次，参见 schema.Schema。
+
+        设置时转换已有内容并填入默认值；之后 update / load_file / setattr 只校验写入的部分，
+        reload 只校验发生变化的子树，错误以 ValidationError 一次性报告（带点号路径）。
+        必须的键在全部来源加载完之后用 validate() 检查。
+
+        Args:
+            schema: Schema 对象或 schema 规格（dict、dataclass、TypedDict 等）；None 取消校验
+            extra: 是否允许 schema 中没有声明的键
+
+        示例:
+            >>> config = EasyConfig(path='./config', schema={
+            ...     'database': {'host': str, 'port': Field(int, default=5432)},
+            ... })
+            >>> config.load_file()        # 'port: "5433"' 被转换为 5433
+            >>> config.validate()
+        """
+        if schema is not None and not isinstance(schema, Schema):
+            schema = Schema(schema, extra)
+        with self._lock:
+            self._data.set_schema(None)
+            if schema is not None:
+                # 配置为空（还没有加载）时也要转换，填入默认值
+                self._data.apply_patch(tracking.diff(self._data, schema.coerce(self._data)))
+            self._data.set_schema(schema)
+            self._schema = schema
+            self._publish()
+
+    def validate(self):
+        """
+        完整校验当前配置（包括必须的键），返回转换后的普通字典。
+
+        Raises:
+            ValidationError: 包含全部错误及其路径
+        """
+        if self._schema is None:
+            raise ValueError("No schema set, call set_schema() first")
+        return self._schema.validate(self._data)
+
+    def stats(self):
+        """
+        返回加载统计：文件缓存、磁盘缓存，以及启用埋点时各操作的耗时直方图。
+
+        示例:
+            >>> config = EasyConfig(path='./config', instrument=True)
+            >>> config.load_file()
+            >>> config.stats()['operations']['parse']['mean']
+        """
+        result = {'file_cache': self._loader.cache.stats()}
+        if self._disk_cache is not None:
+            result['disk_cache'] = self._disk_cache.stats()
+        if self._content_cache is not None:
+            result['content_cache'] = self._content_cache.stats()
+        if self._profiles is not None:
+            result['profiles'] = dict(self._profiles.stats(), active=self._active_profile)
+        stats_sink = self._instrument.stats_sink if self._instrument is not None else None
+        if stats_sink is not None:
+            result.update(stats_sink.snapshot())
+        return result
+
     def to_dict(self):
         return self._data.to_dict()
 
     def update(self, *args, **kwargs):
-        self._data.update(*args, **kwargs)
+        if len(args) > 1:
+            raise TypeError("update() takes at most 1 positional argument")
+        with self._lock:
+            if self._instrument is not None:
+                started = clock()
+                self._merge(self._data, _layers(args, kwargs))
+                self._instrument.emit(MERGE, clock() - started)
+            else:
+                self._merge(self._data, _layers(args, kwargs))
+            self._sources.append(('update', args, kwargs))
+            self._publish()
+
+    def merge_many(self, sources):
+        """
+        一次性合并多个来源，每棵来源树只遍历一次，结果与依次调用 update 相同，参见 merge.merge_many。
+
+        各来源分别记录，热重载时按原顺序重新合并。
+
+        示例:
+            >>> config.merge_many([defaults, tenant_config, overrides])
+        """
+        sources = [source for source in sources if source]
+        with self._lock:
+            if self._instrument is not None:
+                started = clock()
+                self._merge(self._data, sources)
+                self._instrument.emit(MERGE, clock() - started, layers=len(sources))
+            else:
+                self._merge(self._data, sources)
+            self._sources.extend(('update', (source,), {}) for source in sources)
+            self._publish()
+
+    def _merge(self, data, layers, strategies=None):
+        merge.merge_many(data, layers, self._strategies if strategies is None else strategies)
 
     def load_file(self, path=None):
-        config = self._loader.get_file(path, anyconfig.load)
-        self._data.update(config)
+        path = os.path.abspath(self._loader.resolve_path(path))
+        config = self._loader.get_file(path, self._parse)
+        self._merge_file(path, config)
+
+    def load_files(self, paths_or_globs, max_workers=None, use_processes=False):
+        """
+        并发加载多个配置文件，支持 glob 和 conf.d 目录模式。
+
+        文件在线程池（或进程池）中并发解析，但总是按确定的顺序合并：
+        显式给出的顺序保持不变，目录和 glob 展开结果按文件名排序，越靠后优先级越高。
+
+        Args:
+            paths_or_globs: 路径、glob 或目录，或它们组成的列表
+            max_workers: 并发数
+            use_processes: 是否使用进程池解析（适合 CPU 密集的大 YAML 文件）
+
+        Returns:
+            按合并顺序排列的文件路径列表
+
+        示例:
+            >>> config.load_files(['base.yml', 'conf.d', 'overrides/*.json'])
+        """
+        paths = [os.path.abspath(path) for path in self._loader.expand_paths(paths_or_globs)]
+        configs = self._loader.get_files(paths, self._parse, max_workers, use_processes)
+        self._merge_files(paths, configs)
+        return paths
+
+    async def async_load_files(self, paths_or_globs):
+        """异步并发加载多个配置文件，合并顺序与 load_files 相同"""
+        paths = [os.path.abspath(path) for path in self._loader.expand_paths(paths_or_globs)]
+        configs = await self._loader.async_get_files(paths, self._parse)
+        self._merge_files(paths, configs)
+        return paths
+
+    def _merge_file(self, path, config):
+        self._merge_files((path,), (config,))
+
+    def _merge_files(self, paths, configs):
+        # 多个文件一次性合并，每个文件仍单独记录为来源
+        with self._lock:
+            if self._instrument is not None:
+                started = clock()
+                self._merge(self._data, configs)
+                if len(paths) == 1:
+                    self._instrument.emit(MERGE, clock() - started, path=paths[0])
+                else:
+                    self._instrument.emit(MERGE, clock() - started, files=len(paths))
+            else:
+                self._merge(self._data, configs)
+            for path, config in zip(paths, configs):
+                self._sources.append(('file', path, config))
+                if self._watcher is not None:
+                    self._watcher.add(path)
+            if len(self._sources) == 1:
+                # 配置只来自这一个文件，内容与文件一致，保存回该文件时可以跳过；
+                # 文件不存在时没有可以比较的内容，之后的 save 必须写入
+                signature = file_signature(paths[0])
+                if signature is not None:
+                    self._saved[paths[0]] = (tracking.version_of(self._data), signature)
+            self._publish()
+
+    def load_env(self, prefix='', separator='__', lowercase=True, environ=None):
+        """
+        用环境变量覆盖配置，例如 APP__DATABASE__HOST 覆盖 database.host。
+
+        环境变量解析一次后编译为路径索引，按已有值的类型转换后整体合并一次；
+        覆盖层被记录为来源，reload 时只有环境变量快照变化（或文件变化）才重新应用。
+        通常在加载完配置文件之后调用，参见 EnvOverlay。
+
+        Args:
+            prefix: 环境变量前缀，如 'APP'
+            separator: 层级分隔符
+            lowercase: 是否把键名转为小写
+            environ: 环境变量映射，默认 os.environ
+
+        Returns:
+            EnvOverlay 对象
+
+        示例:
+            >>> config.load_file()
+            >>> config.load_env('APP')   # APP__DATABASE__PORT=5433
+            >>> config.database.port     # 5433（按原有的 int 类型转换）
+        """
+        overlay = EnvOverlay(prefix, separator, lowercase, environ)
+        overlay.refresh()
+        with self._lock:
+            if self._instrument is not None:
+                started = clock()
+                overlay.apply(self._data)
+                self._instrument.emit(MERGE, clock() - started, source='env')
+            else:
+                overlay.apply(self._data)
+            self._sources.append(('env', overlay, None))
+            self._publish()
+        return overlay
 
     def load_by_content(self, content, parser_type='yml'):
-        parser_type_lower = parser_type.lower()
-        extension = "yaml" if parser_type_lower == "yml" else parser_type_lower
-        support_ext = anyconfig.list_types()
-        if extension not in support_ext:
-            raise ValueError(
-                f"Unsupported file format '{extension}'. "
-                f"Currently supported formats: {', '.join(support_ext)}"
-            )
-        config_dict = anyconfig.loads(content, ac_parser=extension)
-        self._data.update(config_dict)
+        extension = parsers.check_type(parser_type)
+        started = clock()
+        if self._content_cache is not None:
+            config_dict, hit = self._content_cache.load(content, extension, parsers.load_content)
+            if self._instrument is not None:
+                self._instrument.emit(PARSE, clock() - started, bytes=len(content), format=extension,
+                                      cache='hit' if hit else 'miss')
+        else:
+            config_dict = parsers.load_content(content, extension)
+            if self._instrument is not None:
+                self._instrument.emit(PARSE, clock() - started, bytes=len(content), format=extension)
+        self.update(config_dict)
 
     async def async_load_file(self, path=None):
         """异步加载配置文件"""
-        config = await self._loader.async_get_file(path, anyconfig.load)
-        self._data.update(config)
+        path = os.path.abspath(self._loader.resolve_path(path))
+        config = await self._loader.async_get_file(path, self._parse)
+        self._merge_file(path, config)
 
     async def async_load_by_content(self, content, parser_type='yml'):
         """异步从内容加载配置"""
-        parser_type_lower = parser_type.lower()
-        extension = "yaml" if parser_type_lower == "yml" else parser_type_lower
-        support_ext = anyconfig.list_types()
-        if extension not in support_ext:
-            raise ValueError(
-                f"Unsupported file format '{extension}'. "
-                f"Currently supported formats: {', '.join(support_ext)}"
-            )
-        # anyconfig.loads 是同步的，在线程池中运行
-        # 使用 partial 来传递关键字参数
-        load_func = partial(anyconfig.loads, content, ac_parser=extension)
+        extension = parsers.check_type(parser_type)
+        started = clock()
+        content_cache = self._content_cache
+        config_dict = _MISSING
+        if content_cache is not None:
+            # 命中时直接合并，不经过线程池；解析结果为空时也算命中
+            key = content_cache.key(content, extension)
+            config_dict = content_cache.get(key, _MISSING)
+        hit = config_dict is not _MISSING
+        if not hit:
+            # anyconfig.loads 是同步的，在线程池中运行
+            # 使用 partial 来传递关键字参数
+            load_func = partial(parsers.load_content, content, extension)
+            config_dict = await self._loader._run_in_thread(load_func)
+            if content_cache is not None:
+                content_cache.put(key, config_dict, len(content))
+        if self._instrument is not None:
+            if content_cache is not None:
+                self._instrument.emit(PARSE, clock() - started, bytes=len(content), format=extension,
+                                      cache='hit' if hit else 'miss')
+            else:
+                self._instrument.emit(PARSE, clock() - started, bytes=len(content), format=extension)
+        self.update(config_dict)
+
+    def iter_load(self, path=None, parser_type=None, sections=False, strategy=None):
+        """
+        流式加载配置文件，逐个产出文档（或顶层段），适合超大的多文档 YAML 和 JSON Lines。
+
+        文件按需增量读取，同一时刻只持有一个文档，不会经过文件缓存；
+        指定 strategy 时每个文档产出前先合并进配置，完整读取后记录为来源，
+        热重载时按同样的策略重新流式读取（文件未变化时跳过）。
+        快照、冻结副本和共享快照在流结束（或生成器被关闭）时发布一次，而不是每个文档发布一次。
+
+        Args:
+            path: 文件路径
+            parser_type: 解析器类型，默认根据扩展名推断（.jsonl / .ndjson 为 JSON Lines）
+            sections: 是否把每个文档拆成顶层段 {key: value} 逐个产出
+            strategy: None（默认）只产出文档，不合并；True 按 merge_strategies 逐个合并进当前配置；
+                也可以是 {路径: 策略} 或 MergeStrategies，只用于这个文件的合并
+
+        Returns:
+            生成器，产出 Dict（非字典文档原样产出）
+
+        示例:
+            >>> for flag in config.iter_load('flags.jsonl'):
+            ...     print(flag.name)
+            >>> for _ in config.iter_load('huge.yml', sections=True, strategy=True):
+            ...     pass
+            >>> for _ in config.iter_load('plugins.jsonl', strategy={'plugins': merge.APPEND}):
+            ...     pass
+        """
+        path = os.path.abspath(self._loader.resolve_path(path))
+        signature = file_signature(path)
+        strategies = self._stream_strategies(strategy)
         try:
-            # Python 3.9+ 使用 to_thread
-            config_dict = await asyncio.to_thread(load_func)
-        except AttributeError:
-            # Python 3.7-3.8 使用 run_in_executor
-            loop = asyncio.get_event_loop()
-            config_dict = await loop.run_in_executor(None, load_func)
-        self._data.update(config_dict)
+            for document in iter_documents(path, parser_type, sections):
+                yield self._stream_document(path, document, strategies)
+        finally:
+            self._finish_stream(strategies)
+        if strategies is not None:
+            self._record_stream(path, parser_type, sections, signature, strategies)
+
+    async def async_iter_load(self, path=None, parser_type=None, sections=False, strategy=None):
+        """
+        异步流式加载，参数与 iter_load 相同；每个文档在线程池中读取和解析。
+
+        示例:
+            >>> async for document in config.async_iter_load('flags.jsonl'):
+            ...     print(document.name)
+        """
+        path = os.path.abspath(self._loader.resolve_path(path))
+        signature = file_signature(path)
+        strategies = self._stream_strategies(strategy)
+        documents = iter_documents(path, parser_type, sections)
+        end = object()
+        try:
+            while True:
+                document = await self._loader._run_in_thread(next, documents, end)
+                if document is end:
+                    break
+                yield self._stream_document(path, document, strategies)
+        finally:
+            documents.close()
+            self._finish_stream(strategies)
+        if strategies is not None:
+            self._record_stream(path, parser_type, sections, signature, strategies)
+
+    def _stream_strategies(self, strategy):
+        # None / False 表示不合并；True 使用配置的合并策略
+        if strategy is None or strategy is False:
+            return None
+        if strategy is True:
+            return self._strategies
+        return merge.compile_strategies(strategy)
+
+    def _stream_document(self, path, document, strategies):
+        if not isinstance(document, dict):
+            if strategies is not None:
+                raise TypeError(
+                    f"Cannot merge non-dict document from '{path}' "
+                    f"(got {type(document).__name__})"
+                )
+            return self._dict_class._hook(document)
+        if strategies is not None:
+            with self._lock:
+                if self._instrument is not None:
+                    started = clock()
+                    self._merge(self._data, (document,), strategies)
+                    self._instrument.emit(MERGE, clock() - started, path=path)
+                else:
+                    self._merge(self._data, (document,), strategies)
+        return self._dict_class(document)
+
+    def _finish_stream(self, strategies):
+        # 流式合并期间不发布：共享快照每次发布都要重新编码整个配置，逐个文档发布的代价与文档数的平方成正比
+        if strategies is not None:
+            with self._lock:
+                self._publish()
+
+    def _record_stream(self, path, parser_type, sections, signature, strategies):
+        # 只记录读取方式、合并策略和文件签名，不保存文档本身
+        with self._lock:
+            self._sources.append(('stream', path, (parser_type, sections, signature, strategies)))
+            if self._watcher is not None:
+                self._watcher.add(path)
+
+    @property
+    def loaded_files(self):
+        """已加载的配置文件路径（按加载顺序）"""
+        return [source[1] for source in self._sources if source[0] in ('file', 'stream')]
+
+    def reload(self, path=None):
+        """
+        重新加载配置文件。
+
+        只重新解析发生变化的文件（未变化的文件命中缓存），然后只对这些文件涉及的顶层键
+        按原加载顺序重新合并；新配置只复制被修改路径上的节点，其余子树与旧配置共享，
+        最后整体替换 _data，读取方不会看到合并到一半的配置。
+
+        注意：直接修改 config.data 的内容不会被记录，重载后会丢失；
+        需要保留的修改请使用 update / setattr。
+
+        path 为 None 时还会检查 load_env 添加的环境变量覆盖层，快照变化时重新应用。
+
+        Args:
+            path: 只重新加载指定的文件；为 None 时检查全部已加载的文件
+
+        Returns:
+            是否有文件内容（或环境变量）发生了变化
+        """
+        with self._lock:
+            paths = self._reload_paths(path)
+            streams = self._stream_paths()
+            configs = {p: file_signature(p) if p in streams else self._loader.get_file(p, self._parse)
+                       for p in paths}
+            return self._apply_reload(configs, path is None and self._refresh_env())
+
+    async def async_reload(self, path=None):
+        """异步重新加载配置文件，语义与 reload 相同"""
+        paths = self._reload_paths(path)
+        streams = self._stream_paths()
+        configs = {}
+        for p in paths:
+            if p in streams:
+                configs[p] = file_signature(p)
+            else:
+                configs[p] = await self._loader.async_get_file(p, self._parse)
+        with self._lock:
+            return self._apply_reload(configs, path is None and self._refresh_env())
+
+    def _reload_paths(self, path):
+        if path is None:
+            return self.loaded_files
+        path = os.path.abspath(self._loader.resolve_path(path))
+        return [path] if path in self.loaded_files else []
+
+    def _stream_paths(self):
+        return {source[1] for source in self._sources if source[0] == 'stream'}
+
+    def _refresh_env(self):
+        changed = False
+        for source in self._sources:
+            if source[0] == 'env' and source[1].refresh():
+                changed = True
+        return changed
+
+    def _apply_reload(self, configs, env_changed=False):
+        sources = []
+        changed = env_changed
+        # 变化的文件涉及的顶层键（新旧内容的并集），只重新合并这些键；
+        # 流式文件不保存文档内容、环境变量可能涉及任意键，这两种情况重新合并全部键
+        keys = None if env_changed else set()
+        for source in self._sources:
+            if source[0] == 'stream' and source[1] in configs:
+                parser_type, sections, signature, strategies = source[2]
+                if configs[source[1]] != signature:
+                    changed = True
+                    keys = None
+                    source = ('stream', source[1], (parser_type, sections, configs[source[1]], strategies))
+            elif source[0] == 'file' and source[1] in configs:
+                config = configs[source[1]]
+                if config is not source[2]:
+                    changed = True
+                    if keys is not None:
+                        keys.update(_top_keys(source[2]))
+                        keys.update(_top_keys(config))
+                    source = ('file', source[1], config)
+            sources.append(source)
+        if not changed:
+            return False
+        data = self._remerge(sources, keys)
+        patch = tracking.diff(self._data, data, keys)
+        if self._schema is not None:
+            # 只校验发生变化的子树
+            patch = self._schema.check_patch(patch, self._data)
+        # 只复制修改路径上的节点，未变化的子树与旧配置共享并保留原版本号，changes_since 只返回真正的修改
+        new_data = tracking.patched(self._data, patch)
+        # 整体替换引用，读取方要么看到旧配置，要么看到完整的新配置
+        self._sources = sources
+        self._data = new_data
+        self._publish()
+        return True
+
+    def _remerge(self, sources, keys):
+        # 按原加载顺序在新的 Dict 上重新合并来源；keys 不为 None 时每个来源只取这些顶层键
+        data = self._dict_class()
+        # 相邻的文件和 update 先收集起来，一次性合并
+        layers = []
+        for kind, key, value in sources:
+            if kind == 'file':
+                layers.append(_restrict(value, keys))
+                continue
+            if kind == 'update':
+                layers.extend(_restrict(layer, keys) for layer in _layers(key, value))
+                continue
+            self._merge(data, layers)
+            layers = []
+            if kind == 'stream':
+                # 流式文档逐个合并，不同时持有整个文件；文件已被删除时跳过，与 get_file 对缺失文件返回 {} 一致
+                if value[2] is not None:
+                    for document in iter_documents(key, value[0], value[1]):
+                        self._merge(data, (_restrict(document, keys),), value[3])
+            elif kind == 'patch':
+                data.apply_patch([change for change in key if keys is None or change[1][0] in keys])
+            elif kind == 'env':
+                key.apply(data)
+            elif keys is None or key.split('.')[0] in keys:
+                data.setattr(key, value)
+        self._merge(data, layers)
+        return data
+
+    @property
+    def dirty(self):
+        """配置是否与最近一次保存（或唯一加载的文件）不一致"""
+        current = tracking.version_of(self._data)
+        return not any(version == current for version, _ in self._saved.values())
+
+    def mark_dirty(self):
+        """
+        原地修改了列表等可变值（或直接修改了 config.data）后调用，使下一次 save 重新写入并发布新快照。
+
+        不知道具体改了哪里，整棵树都标记为已修改，快照和冻结副本不复用上一次的任何子树。
+        """
+        with self._lock:
+            tracking.touch(self._data, deep=True)
+            self._publish(rebuild=True)
+
+    def changes_since(self, version):
+        """
+        返回 version（tracking.current_version() 的返回值）之后配置的修改，参见 Dict.changes_since。
+
+        热重载后同样只返回真正变化的路径，可以把结果发给其他进程用 apply_patch 重放。
+
+        示例:
+            >>> version = tracking.current_version()
+            >>> config.reload()
+            >>> patch = config.changes_since(version)
+            >>> worker_config.apply_patch(patch)
+        """
+        return self._data.changes_since(version)
+
+    def apply_patch(self, patch):
+        """应用 changes_since / diff 返回的修改，会被记录为来源"""
+        with self._lock:
+            if self._schema is not None:
+                patch = self._schema.check_patch(patch, self._data)
+            self._data.apply_patch(patch)
+            self._sources.append(('patch', list(patch), None))
+            self._publish()
+
+    def save(self, path=None, format=None, force=False):
+        """
+        把当前配置原子写入文件。
+
+        格式默认根据扩展名推断；写入使用临时文件 + fsync + rename，
+        写入后直接把结果放入文件缓存，下次加载同一文件无需重新解析。
+        配置自上次保存到该文件后没有变化、且文件未被外部修改时，跳过序列化和写入。
+
+        注意：直接修改 config.data 不会被记录，请使用 update / setattr，或在修改后调用 mark_dirty()。
+
+        Args:
+            path: 目标文件，默认与 load_file 相同
+            format: 序列化格式，如 'yaml'、'json'、'toml'
+            force: 是否忽略脏状态强制写入
+
+        Returns:
+            是否实际写入了文件
+
+        示例:
+            >>> config.setattr('database.port', 5433)
+            >>> config.save()                    # 写回 config.yml
+            >>> config.save('snapshot.json')     # 另存为 JSON
+        """
+        path = os.path.abspath(self._loader.resolve_path(path))
+        extension = self._dump_format(path, format)
+        with self._lock:
+            version = tracking.version_of(self._data)
+            if not force and self._is_saved(path, version):
+                return False
+            data = self._data.to_dict()
+            content = parsers.dump_content(data, extension)
+            self._loader.put_file(path, content, atomic=True, parsed=data, parse_func=self._parse)
+            self._after_save(path, version, data)
+        return True
+
+    async def async_save(self, path=None, format=None, force=False):
+        """异步保存，序列化和写入在线程池中完成，参数与 save 相同"""
+        return await self._loader._run_in_thread(self.save, path, format, force)
+
+    @staticmethod
+    def _dump_format(path, format):
+        return parsers.check_type(format or parsers.parser_type(path))
+
+    def _is_saved(self, path, version):
+        saved = self._saved.get(path)
+        return saved is not None and saved[0] == version and saved[1] == file_signature(path)
+
+    def _after_save(self, path, version, data):
+        # 保存到已加载的文件时，用写入的内容替换该来源，之后的 reload 不会把它当作外部修改
+        self._sources = [('file', path, data) if source[0] == 'file' and source[1] == path
+                         else source for source in self._sources]
+        self._saved[path] = (version, file_signature(path))
+
+    def watch(self, interval=1.0, callback=None, use_inotify=True):
+        """
+        在后台线程中监听已加载的配置文件，文件变化时自动 reload。
+
+        Args:
+            interval: 轮询间隔（秒）；inotify 可用时作为等待超时
+            callback: 重载完成后调用 callback(config, path)
+            use_inotify: 是否优先使用 inotify（需要安装 inotify_simple）
+        """
+        self.stop_watch()
+
+        def on_change(path):
+            if self.reload(path) and callback is not None:
+                callback(self, path)
+
+        self._watcher = self._loader.watch(self.loaded_files, on_change, interval, use_inotify)
+        return self._watcher
+
+    def stop_watch(self):
+        """停止后台监听"""
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+
+    def close(self):
+        """停止后台监听，关闭按 max_workers 创建的线程池，并删除 share() 创建的快照文件"""
+        self.stop_watch()
+        self._loader.close()
+        with self._lock:
+            path, owned = self._shared_path, self._shared_owned
+            self._shared_path = None
+            self._shared_owned = False
+        if owned:
+            # 已经 attach 的 worker 持有的映射不受影响
+            from easy_config_py import shared
+            shared.remove_path(path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    async def async_watch(self, interval=1.0, callback=None, use_inotify=True):
+        """
+        在当前事件循环中监听已加载的配置文件，直到任务被取消。
+
+        示例:
+            >>> task = asyncio.ensure_future(config.async_watch(interval=0.5))
+            >>> task.cancel()
+        """
+        async def on_change(path):
+            self._loader.invalidate(path)
+            if await self.async_reload(path) and callback is not None:
+                result = callback(self, path)
+                if hasattr(result, '__await__'):
+                    await result
+
+        watcher = FileWatcher(self.loaded_files, on_change, interval, use_inotify)
+        self._watcher = watcher
+        try:
+            await watcher.watch_async()
+        finally:
+            if self._watcher is watcher:
+                self._watcher = None
+
+
+def _top_keys(config):
+    return config.keys() if isinstance(config, dict) else ()
+
+
+def _restrict(layer, keys):
+    # 只保留 keys 中的顶层键；原样返回时不复制
+    if keys is None or not isinstance(layer, dict):
+        return layer
+    return {key: dict.__getitem__(layer, key) for key in keys if key in layer}
+
+
+def _layers(args, kwargs):
+    # update(*args, **kwargs) 的参数转换为合并层
+    layers = []
+    if args and args[0]:
+        other = args[0]
+        layers.append(other if isinstance(other, dict) else Dict(other))
+    if kwargs:
+        layers.append(kwargs)
+    return layers
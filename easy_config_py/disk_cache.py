@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/17-16:55
+# @Author  : 灯下客
+# @Email   :
+# @File    : disk_cache.py
+# @Software: PyCharm
+import os
+import sys
+import pickle
+
+# 缓存文件格式版本，格式变化时递增
+FORMAT_VERSION = 1
+DEFAULT_DIRNAME = '.easy_config_cache'
+
+
+class DiskCache(object):
+    """
+    预解析结果的磁盘缓存。
+
+    以 (内容哈希, 解析器名称和版本, Python 版本) 作为键，把解析结果 pickle 到磁盘，
+    新进程启动时命中缓存即可跳过 YAML 等格式的解析。
+
+    写入使用“临时文件 + os.replace”原子替换，多个进程同时读写同一个缓存目录是安全的；
+    缓存文件损坏、版本不一致或无法写入时都会回退到直接解析。
+
+    Args:
+        cache_dir: 缓存目录；为 None 时放在配置文件所在目录下的 .easy_config_cache 中
+        protocol: pickle 协议版本
+
+    示例:
+        >>> config = EasyConfig(path='./config', disk_cache=DiskCache('/tmp/app-config-cache'))
+        >>> config.load_file()  # 第二个进程启动时直接读取缓存
+    """
+
+    def __init__(self, cache_dir=None, protocol=pickle.HIGHEST_PROTOCOL):
+        self.cache_dir = cache_dir
+        self.protocol = protocol
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(content, parser):
+        """计算缓存键"""
+        import hashlib
+        digest = hashlib.sha256(content).hexdigest()
+        tag = '{}-py{}{}'.format(parser, *sys.version_info[:2])
+        return digest, tag
+
+    def entry_path(self, key, directory=None):
+        cache_dir = self.cache_dir or os.path.join(directory or os.getcwd(), DEFAULT_DIRNAME)
+        digest, tag = key
+        return os.path.join(cache_dir, '{}-{}.pickle'.format(digest[:32], tag))
+
+    def get(self, key, directory=None):
+        """
+        读取缓存。
+
+        Returns:
+            (是否命中, 值)
+        """
+        try:
+            with open(self.entry_path(key, directory), 'rb') as file_to_read:
+                header, value = pickle.load(file_to_read)
+        except Exception:
+            return False, None
+        if header != (FORMAT_VERSION,) + tuple(key):
+            return False, None
+        return True, value
+
+    def lookup(self, key, directory=None):
+        """与 get 相同，同时计入命中 / 未命中统计"""
+        hit, value = self.get(key, directory)
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return hit, value
+
+    def put(self, key, value, directory=None):
+        """原子写入缓存，失败时静默忽略"""
+        path = self.entry_path(key, directory)
+        cache_dir = os.path.dirname(path)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            import tempfile
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        except OSError:
+            return False
+        try:
+            with os.fdopen(fd, 'wb') as file_to_write:
+                pickle.dump(((FORMAT_VERSION,) + tuple(key), value), file_to_write, self.protocol)
+            os.replace(tmp_path, path)
+        except Exception:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            return False
+        return True
+
+    def load(self, content, parser, parse, directory=None):
+        """
+        读取缓存，未命中时调用 parse() 解析并写入缓存。
+
+        Args:
+            content: 文件原始字节
+            parser: 解析器名称和版本
+            parse: 无参数的解析函数
+            directory: 配置文件所在目录（未指定 cache_dir 时使用）
+        """
+        key = self.key(content, parser)
+        hit, value = self.lookup(key, directory)
+        if hit:
+            return value
+        value = parse()
+        self.put(key, value, directory)
+        return value
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses}
+
+    def clear(self, directory=None):
+        """删除缓存目录中的所有缓存文件"""
+        cache_dir = self.cache_dir or os.path.join(directory or os.getcwd(), DEFAULT_DIRNAME)
+        try:
+            names = os.listdir(cache_dir)
+        except OSError:
+            return
+        for name in names:
+            if name.endswith('.pickle'):
+                try:
+                    os.unlink(os.path.join(cache_dir, name))
+                except OSError:
+                    pass
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/17-21:30
+# @Author  : 灯下客
+# @Email   :
+# @File    : env.py
+# @Software: PyCharm
+import json
+import os
+
+_TRUE = ('1', 'true', 'yes', 'on')
+_FALSE = ('0', 'false', 'no', 'off')
+
+
+class EnvOverlay(object):
+    """
+    预编译的环境变量覆盖层。
+
+    以 prefix + separator 开头的环境变量按 separator 拆成键路径，例如 APP__DATABASE__HOST
+    对应 database.host。环境变量只在快照变化时重新解析一次，得到 (路径, 原始值) 索引；
+    apply 时按已有值的类型转换后组装成一个嵌套字典，整体合并一次。
+
+    类型转换以配置中已有的值为准：bool 接受 1/true/yes/on 和 0/false/no/off，
+    int / float 直接转换，list / dict 按 JSON 解析（list 也接受逗号分隔），
+    已有值不存在或是字符串时保留原始字符串。
+
+    Args:
+        prefix: 环境变量前缀，如 'APP'；为空时匹配所有包含 separator 的变量
+        separator: 层级分隔符
+        lowercase: 是否把键名转为小写；已有键名大小写不同时按已有键名写入
+        environ: 环境变量映射，默认 os.environ
+
+    示例:
+        >>> overlay = EnvOverlay('APP')
+        >>> overlay.apply(config.data)   # APP__DATABASE__PORT=5433 -> database.port == 5433
+    """
+
+    def __init__(self, prefix='', separator='__', lowercase=True, environ=None):
+        if not separator:
+            raise ValueError("separator must not be empty")
+        self.prefix = prefix + separator if prefix else ''
+        self.separator = separator
+        self.lowercase = lowercase
+        self.environ = os.environ if environ is None else environ
+        self._snapshot = None
+        self._index = ()
+
+    def snapshot(self):
+        """当前环境中匹配前缀的变量，按名称排序的 (名称, 值) 元组"""
+        prefix = self.prefix
+        separator = self.separator
+        return tuple(sorted(
+            (name, value) for name, value in self.environ.items()
+            if name.startswith(prefix) and (prefix or separator in name)
+        ))
+
+    def refresh(self):
+        """
+        重新读取环境变量，快照未变化时不重新解析。
+
+        Returns:
+            快照是否发生了变化
+        """
+        snapshot = self.snapshot()
+        if snapshot == self._snapshot:
+            return False
+        self._index = self._compile(snapshot)
+        self._snapshot = snapshot
+        return True
+
+    @property
+    def index(self):
+        """编译后的 (键路径元组, 原始值, 环境变量名) 列表"""
+        if self._snapshot is None:
+            self.refresh()
+        return self._index
+
+    def _compile(self, snapshot):
+        index = []
+        start = len(self.prefix)
+        for name, value in snapshot:
+            keys = name[start:].split(self.separator)
+            if not all(keys):
+                continue
+            if self.lowercase:
+                keys = [key.lower() for key in keys]
+            index.append((tuple(keys), value, name))
+        return tuple(index)
+
+    def build(self, data):
+        """
+        按 data 中已有值的类型转换，返回可以直接 update 的嵌套字典。
+
+        Raises:
+            ValueError: 环境变量的值无法转换为已有值的类型
+        """
+        overlay = {}
+        for keys, raw, name in self.index:
+            target = overlay
+            current = data
+            for key in keys[:-1]:
+                key = self._match_key(current, key)
+                current = current.get(key) if isinstance(current, dict) else None
+                child = target.get(key)
+                if not isinstance(child, dict):
+                    child = target[key] = {}
+                target = child
+            key = self._match_key(current, keys[-1])
+            existing = current.get(key) if isinstance(current, dict) else None
+            target[key] = coerce(raw, existing, name)
+        return overlay
+
+    def apply(self, data):
+        """把环境变量合并进 data（一次 update），返回合并的嵌套字典"""
+        try:
+            overlay = self.build(data)
+        except ValueError:
+            # 下一次 refresh 重新报告变化，修正环境变量后 reload 可以恢复
+            self._snapshot = None
+            raise
+        if overlay:
+            data.update(overlay)
+        return overlay
+
+    def _match_key(self, node, key):
+        if not self.lowercase or not isinstance(node, dict) or key in node:
+            return key
+        for existing in node:
+            if isinstance(existing, str) and existing.lower() == key:
+                return existing
+        return key
+
+
+def coerce(raw, existing, name=None):
+    """
+    把环境变量的字符串值转换为 existing 的类型。
+
+    Raises:
+        ValueError: 无法转换
+    """
+    if existing is None or isinstance(existing, str):
+        return raw
+    try:
+        if isinstance(existing, bool):
+            lowered = raw.strip().lower()
+            if lowered in _TRUE:
+                return True
+            if lowered in _FALSE:
+                return False
+            raise ValueError(raw)
+        if isinstance(existing, int):
+            return int(raw)
+        if isinstance(existing, float):
+            return float(raw)
+        if isinstance(existing, (list, tuple)):
+            if raw.lstrip().startswith('['):
+                return json.loads(raw)
+            return [item.strip() for item in raw.split(',')] if raw.strip() else []
+        if isinstance(existing, dict):
+            value = json.loads(raw)
+            if not isinstance(value, dict):
+                raise ValueError(raw)
+            return value
+    except ValueError:
+        raise ValueError(
+            f"Cannot convert environment variable '{name}'={raw!r} "
+            f"to {type(existing).__name__}"
+        ) from None
+    return raw
@@ -5,110 +5,412 @@
 # @File    : file_loader.py
 # @Software: PyCharm
 import os
-import asyncio
+import glob
+import stat
+import threading
+from functools import partial
 
-# 模块级文件缓存，键为文件路径，值为文件内容或解析后的配置
-_files_cached = {}
+from easy_config_py.cache import FileCache, RAW, file_signature
+from easy_config_py.file_watcher import FileWatcher
+from easy_config_py.instrumentation import clock, STAT, READ
+
+# 模块级共享文件缓存，按 (mtime_ns, size, inode) 校验，LRU 淘汰
+_files_cached = FileCache()
+_MISSING = object()
+# 目录模式下加载的配置片段扩展名
+FRAGMENT_EXTENSIONS = ('.yml', '.yaml', '.json', '.toml', '.ini')
+
+# 单飞（single-flight）去重：同一路径同一时间只解析一次；
+# path -> _PathLock，最后一个使用者释放后删除，加载大量不同路径的长期进程中不会无限增长
+_path_locks = {}
+_path_locks_guard = threading.Lock()
+# 正在进行的异步加载，键为 (事件循环 id, path, kind)
+_inflight = {}
+
+
+def _finish_inflight(key, task):
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    if not task.cancelled():
+        # 标记异常已被读取，所有等待者都被取消时不产生警告
+        task.exception()
+
+
+class _PathLock(object):
+    """按路径的锁，记录正在使用（持有或等待）的线程数"""
+    __slots__ = ('path', 'lock', 'users')
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.users = 0
+
+    def __enter__(self):
+        self.lock.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.lock.release()
+        with _path_locks_guard:
+            self.users -= 1
+            if not self.users:
+                del _path_locks[self.path]
+
+
+def _path_lock(path):
+    with _path_locks_guard:
+        lock = _path_locks.get(path)
+        if lock is None:
+            lock = _path_locks[path] = _PathLock(path)
+        lock.users += 1
+        return lock
+
+
+def _atomic_write(path, content, mode="w"):
+    """写入同目录下的临时文件并 fsync，再用 os.replace 原子替换目标文件"""
+    import tempfile
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path), suffix='.tmp')
+    try:
+        # mkstemp 创建的文件权限是 0600，沿用目标文件原有的权限
+        try:
+            file_mode = stat.S_IMODE(os.stat(path).st_mode)
+        except OSError:
+            file_mode = 0o644
+        os.chmod(tmp_path, file_mode)
+        encoding = None if 'b' in mode else 'utf-8'
+        with os.fdopen(fd, mode, encoding=encoding) as file_to_write:
+            file_to_write.write(content)
+            file_to_write.flush()
+            os.fsync(file_to_write.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    # 尽量把目录项也刷到磁盘，部分平台不支持打开目录
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
 
 
 class FileLoader(object):
     default_file = None
     path = None
 
-    def __init__(self, path, default_filename):
+    def __init__(self, path, default_filename, cache=None, executor=None, max_workers=None,
+                 instrument=None):
         self.path = path
         self.default_file = default_filename
+        # 未指定缓存时使用模块级共享缓存
+        self.cache = cache if cache is not None else _files_cached
+        # 异步加载使用的线程池；指定 max_workers 时使用独立的有界线程池，
+        # 避免突发的大量加载占满默认线程池
+        self.max_workers = max_workers
+        self._executor = executor
+        # 按 max_workers 创建的线程池由 close() 关闭；外部传入的 executor 由调用方管理
+        self._own_executor = None
+        # 埋点（Instrumentation），为 None 时不记录
+        self.instrument = instrument
 
-    def get_file(self, path=None, parse_func=None):
+    def close(self, wait=True):
+        """关闭按 max_workers 创建的线程池；之后的异步加载会重新创建"""
+        executor = self._own_executor
+        if executor is not None:
+            self._own_executor = self._executor = None
+            executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def invalidate(self, path=None):
+        """使指定文件（或全部文件）的缓存失效"""
+        if path is not None and os.path.isdir(path):
+            path = os.path.join(path, self.default_file)
+        self.cache.invalidate(path)
+
+    def resolve_path(self, path=None):
+        """将目录解析为其中的默认配置文件路径"""
         if path is None:
             path = self.path
         if os.path.isdir(path):
             path = os.path.join(path, self.default_file)
-        return self._get_conf_from_file(path, parse_func)
+        return path
 
-    def put_file(self, path, content, mode="w"):
-        """同步写入文件"""
-        with open(path, mode) as file_to_write:
-            file_to_write.write(content)
+    def get_file(self, path=None, parse_func=None):
+        return self._get_conf_from_file(self.resolve_path(path), parse_func)
+
+    @staticmethod
+    def expand_paths(paths_or_globs, extensions=FRAGMENT_EXTENSIONS):
+        """
+        把路径、glob 和目录展开为文件列表。
+
+        目录展开为其中扩展名在 extensions 中的文件（conf.d 模式），
+        目录和 glob 的展开结果按文件名排序；显式给出的顺序保持不变，
+        越靠后的文件合并时优先级越高。
+
+        Args:
+            paths_or_globs: 单个路径或路径列表，支持 glob 通配符
+            extensions: 目录模式下加载的扩展名
+
+        Returns:
+            去重后的文件路径列表
+        """
+        if isinstance(paths_or_globs, (str, bytes, os.PathLike)):
+            paths_or_globs = [paths_or_globs]
+        result = []
+        for item in paths_or_globs:
+            item = os.fspath(item)
+            if os.path.isdir(item):
+                names = sorted(
+                    name for name in os.listdir(item)
+                    if os.path.splitext(name)[1].lower() in extensions
+                )
+                matched = [os.path.join(item, name) for name in names]
+                matched = [path for path in matched if os.path.isfile(path)]
+            elif any(char in item for char in '*?['):
+                matched = sorted(glob.glob(item))
+            else:
+                matched = [item]
+            for path in matched:
+                if path not in result:
+                    result.append(path)
+        return result
+
+    def get_files(self, paths, parse_func=None, max_workers=None, use_processes=False):
+        """
+        并发读取多个文件，返回结果的顺序与 paths 一致，与完成先后无关。
+
+        Args:
+            paths: 文件路径列表（不做 glob 展开，参见 expand_paths）
+            parse_func: 解析函数
+            max_workers: 并发数，默认由线程池/进程池决定
+            use_processes: 是否在进程池中解析（适合 CPU 密集的 YAML 解析），
+                要求 parse_func 可以被 pickle，或提供 load_many(paths, pool)
+
+        Returns:
+            与 paths 顺序一致的解析结果列表
+        """
+        paths = [self.resolve_path(path) for path in paths]
+        if len(paths) <= 1:
+            return [self._get_conf_from_file(path, parse_func) for path in paths]
+        if not (use_processes and parse_func):
+            # concurrent.futures 会导入 logging，只在并发加载时导入
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers) as pool:
+                return list(pool.map(partial(self._get_conf_from_file, parse_func=parse_func), paths))
+
+        # 进程池模式：缓存命中的文件直接返回，其余文件交给子进程解析
+        results = [None] * len(paths)
+        pending = []
+        for index, path in enumerate(paths):
+            signature = file_signature(path)
+            if signature is None:
+                results[index] = {}
+                continue
+            result = self.cache.get(path, parse_func, _MISSING, signature)
+            if result is _MISSING:
+                pending.append((index, path, signature))
+            else:
+                results[index] = result
+        if pending:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers) as pool:
+                load_many = getattr(parse_func, 'load_many', None)
+                if load_many is not None:
+                    # 解析函数自己决定交给子进程的部分（如 parsers.FileParser）
+                    parsed = load_many([path for _, path, _ in pending], pool)
+                else:
+                    futures = [pool.submit(parse_func, path) for _, path, _ in pending]
+                    parsed = [future.result() for future in futures]
+            for (index, path, signature), result in zip(pending, parsed):
+                results[index] = result
+                self.cache.put(path, result, parse_func, signature)
+        return results
+
+    async def async_get_files(self, paths, parse_func=None):
+        """异步并发读取多个文件，返回结果的顺序与 paths 一致"""
+        import asyncio
+        return list(await asyncio.gather(
+            *[self.async_get_file(path, parse_func) for path in paths]
+        ))
+
+    def watch(self, paths, callback, interval=1.0, use_inotify=True):
+        """
+        在后台线程中监听文件变化，文件变化时先使其缓存失效再调用 callback(path)。
+
+        Returns:
+            已启动的 FileWatcher
+        """
+        return FileWatcher(
+            [self.resolve_path(path) for path in paths],
+            partial(self._on_file_changed, callback),
+            interval, use_inotify
+        ).start()
+
+    def _on_file_changed(self, callback, path):
+        self.cache.invalidate(path)
+        return callback(path)
+
+    def put_file(self, path, content, mode="w", atomic=False, parsed=_MISSING, parse_func=None):
+        """
+        同步写入文件。
+
+        Args:
+            path: 文件路径
+            content: 写入的内容
+            mode: 打开模式
+            atomic: 是否原子写入（临时文件 + fsync + rename），读取方不会看到写了一半的文件
+            parsed: 内容对应的解析结果；给出时直接放入缓存，下次读取无需重新解析
+            parse_func: parsed 对应的解析函数（缓存键）
+        """
+        if atomic:
+            _atomic_write(path, content, mode)
+        else:
+            with open(path, mode) as file_to_write:
+                file_to_write.write(content)
+        self.cache.invalidate(path)
+        if parsed is not _MISSING:
+            self.cache.put(path, parsed, parse_func or RAW)
 
     def _get_conf_from_file(self, path, parse_func=None):
         if path and os.path.isdir(path):
             path = os.path.join(path, self.default_file)
 
-        if not path or not os.path.isfile(path):
+        signature, result = self._lookup(path, parse_func or RAW)
+        if signature is None:
             return {}
-        if path not in _files_cached:
-            self.path = path
-            if parse_func:
-                _files_cached[path] = parse_func(path)
-            else:
-                with open(path, "rb") as file_to_read:
-                    content = file_to_read.read()
-                _files_cached[path] = content
-        return _files_cached[path]
+        if result is _MISSING:
+            result = self._load_locked(path, parse_func)
+        return result
+
+    def _lookup(self, path, kind):
+        """stat 文件并查询缓存，返回 (签名, 缓存结果或 _MISSING)"""
+        instrument = self.instrument
+        if instrument is not None:
+            started = clock()
+        signature = file_signature(path) if path else None
+        result = _MISSING
+        if signature is not None:
+            result = self.cache.get(path, kind, _MISSING, signature)
+        if instrument is not None:
+            instrument.emit(STAT, clock() - started, path=path,
+                            cache='miss' if result is _MISSING else 'hit')
+        return signature, result
+
+    def _load_locked(self, path, parse_func=None):
+        # 同一路径同一时间只解析一次，其余线程等待后直接读取缓存
+        kind = parse_func or RAW
+        with _path_lock(path):
+            signature = file_signature(path)
+            if signature is None:
+                return {}
+            result = self.cache.get(path, kind, _MISSING, signature, count=False)
+            if result is _MISSING:
+                self.path = path
+                if parse_func:
+                    result = parse_func(path)
+                elif self.instrument is not None:
+                    started = clock()
+                    result = self._sync_read_file(path)
+                    self.instrument.emit(READ, clock() - started, path=path, bytes=len(result))
+                else:
+                    result = self._sync_read_file(path)
+                self.cache.put(path, result, kind, signature)
+        return result
 
     async def async_get_file(self, path=None, parse_func=None):
         """异步获取文件内容"""
-        if path is None:
-            path = self.path
-        if os.path.isdir(path):
-            path = os.path.join(path, self.default_file)
-        return await self._async_get_conf_from_file(path, parse_func)
+        return await self._async_get_conf_from_file(self.resolve_path(path), parse_func)
 
-    async def async_put_file(self, path, content, mode="w"):
-        """异步写入文件"""
+    async def async_put_file(self, path, content, mode="w", atomic=False, parsed=_MISSING,
+                             parse_func=None):
+        """异步写入文件，参数与 put_file 相同"""
+        if atomic or parsed is not _MISSING:
+            # 原子写入需要 fsync 和 rename，直接在线程池中完成
+            await self._run_in_thread(self.put_file, path, content, mode, atomic, parsed, parse_func)
+            return
         try:
             import aiofiles
             async with aiofiles.open(path, mode) as file_to_write:
                 await file_to_write.write(content)
+            self.cache.invalidate(path)
         except ImportError:
             # 如果没有安装 aiofiles，回退到同步方式（在线程池中运行）
-            try:
-                # Python 3.9+ 使用 to_thread
-                await asyncio.to_thread(self.put_file, path, content, mode)
-            except AttributeError:
-                # Python 3.7-3.8 使用 run_in_executor
-                loop = asyncio.get_event_loop()
-                await loop.run_in_executor(None, self.put_file, path, content, mode)
+            await self._run_in_thread(self.put_file, path, content, mode)
+
+    async def _run_in_thread(self, func, *args):
+        """在线程池中运行同步函数"""
+        # asyncio 只在异步接口中用到，延迟导入使 import easy_config_py 更快
+        import asyncio
+        if self._executor is None and self.max_workers:
+            from concurrent.futures import ThreadPoolExecutor
+            self._executor = self._own_executor = ThreadPoolExecutor(
+                self.max_workers, thread_name_prefix='easy-config')
+        if self._executor is None and hasattr(asyncio, 'to_thread'):
+            # Python 3.9+ 使用 to_thread
+            return await asyncio.to_thread(func, *args)
+        # Python 3.7-3.8 或指定了线程池时使用 run_in_executor
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args))
 
     async def _async_get_conf_from_file(self, path, parse_func=None):
         """异步从文件获取配置"""
+        import asyncio
         if path and os.path.isdir(path):
             path = os.path.join(path, self.default_file)
 
-        if not path or not os.path.isfile(path):
+        kind = parse_func or RAW
+        signature, result = self._lookup(path, kind)
+        if signature is None:
             return {}
-        
-        if path not in _files_cached:
-            self.path = path
-            if parse_func:
-                # 如果提供了解析函数，在线程池中运行（因为 anyconfig 是同步的）
-                try:
-                    # Python 3.9+ 使用 to_thread
-                    _files_cached[path] = await asyncio.to_thread(parse_func, path)
-                except AttributeError:
-                    # Python 3.7-3.8 使用 run_in_executor
-                    loop = asyncio.get_event_loop()
-                    _files_cached[path] = await loop.run_in_executor(None, parse_func, path)
+        if result is not _MISSING:
+            return result
+
+        # 同一路径已有协程在加载时等待同一个任务，而不是重复解析；
+        # 加载在独立的任务中运行，任何一个等待者（包括发起者）被取消都不会取消加载本身，
+        # 其他等待者照常拿到结果
+        loop = asyncio.get_event_loop()
+        key = (id(loop), path, kind)
+        task = _inflight.get(key)
+        if task is None:
+            task = _inflight[key] = loop.create_task(self._async_load(path, parse_func))
+            task.add_done_callback(partial(_finish_inflight, key))
+        return await asyncio.shield(task)
+
+    async def _async_load(self, path, parse_func):
+        if not parse_func:
+            # 异步读取文件内容
+            try:
+                import aiofiles
+            except ImportError:
+                # 如果没有安装 aiofiles，回退到同步方式
+                pass
             else:
-                # 异步读取文件内容
-                try:
-                    import aiofiles
-                    async with aiofiles.open(path, "rb") as file_to_read:
-                        content = await file_to_read.read()
-                    _files_cached[path] = content
-                except ImportError:
-                    # 如果没有安装 aiofiles，回退到同步方式
-                    try:
-                        # Python 3.9+ 使用 to_thread
-                        _files_cached[path] = await asyncio.to_thread(self._sync_read_file, path)
-                    except AttributeError:
-                        # Python 3.7-3.8 使用 run_in_executor
-                        loop = asyncio.get_event_loop()
-                        _files_cached[path] = await loop.run_in_executor(
-                            None, self._sync_read_file, path
-                        )
-        return _files_cached[path]
+                signature = file_signature(path)
+                started = clock()
+                async with aiofiles.open(path, "rb") as file_to_read:
+                    result = await file_to_read.read()
+                if self.instrument is not None:
+                    self.instrument.emit(READ, clock() - started, path=path, bytes=len(result))
+                self.path = path
+                self.cache.put(path, result, RAW, signature)
+                return result
+        # 解析函数（anyconfig 是同步的）在线程池中运行，
+        # 与同步加载共用按路径加锁的逻辑
+        return await self._run_in_thread(self._load_locked, path, parse_func)
 
     def _sync_read_file(self, path):
         """同步读取文件的辅助方法（用于回退）"""
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/17-11:20
+# @Author  : 灯下客
+# @Email   :
+# @File    : file_watcher.py
+# @Software: PyCharm
+import os
+import threading
+
+from easy_config_py.cache import file_signature
+
+
+class FileWatcher(object):
+    """
+    监听配置文件变化。
+
+    安装了 inotify_simple 时（Linux）使用 inotify 监听文件所在目录，
+    否则回退到按 interval 周期性 stat 轮询。两种方式最终都通过文件签名
+    (mtime_ns, size, inode) 判断文件是否真正发生变化。
+
+    Args:
+        paths: 需要监听的文件路径列表
+        callback: 文件变化时调用 callback(path)；异步模式下可以是协程函数
+        interval: 轮询间隔（秒），inotify 模式下作为读取超时
+        use_inotify: 是否尝试使用 inotify
+
+    示例:
+        >>> watcher = FileWatcher(['config.yml'], print, interval=0.5)
+        >>> watcher.start()
+        >>> watcher.stop()
+    """
+
+    def __init__(self, paths=(), callback=None, interval=1.0, use_inotify=True):
+        self.callback = callback
+        self.interval = interval
+        self.use_inotify = use_inotify
+        self._signatures = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._watched_dirs = set()
+        for path in paths:
+            self.add(path)
+
+    @property
+    def paths(self):
+        return list(self._signatures)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def add(self, path):
+        """添加监听的文件"""
+        path = os.path.abspath(path)
+        with self._lock:
+            if path not in self._signatures:
+                self._signatures[path] = file_signature(path)
+
+    def remove(self, path):
+        """移除监听的文件"""
+        with self._lock:
+            self._signatures.pop(os.path.abspath(path), None)
+
+    def poll(self):
+        """
+        对所有监听的文件做一次 stat 检查。
+
+        Returns:
+            发生变化的文件路径列表
+        """
+        changed = []
+        with self._lock:
+            for path, old_signature in list(self._signatures.items()):
+                signature = file_signature(path)
+                if signature != old_signature:
+                    self._signatures[path] = signature
+                    changed.append(path)
+        return changed
+
+    def start(self):
+        """在后台线程中开始监听"""
+        if self.running:
+            return self
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='easy-config-watcher')
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        """停止后台线程"""
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        inotify = self._open_inotify()
+        try:
+            while not self._stop_event.is_set():
+                if inotify is not None:
+                    # 只关心事件是否发生，具体变化由签名比较确定
+                    inotify.read(timeout=int(self.interval * 1000))
+                    self._watch_dirs(inotify)
+                else:
+                    self._stop_event.wait(self.interval)
+                if self._stop_event.is_set():
+                    break
+                for path in self.poll():
+                    self._notify(path)
+        finally:
+            if inotify is not None:
+                inotify.close()
+
+    def _notify(self, path):
+        if self.callback is not None:
+            self.callback(path)
+
+    async def watch_async(self):
+        """
+        在当前事件循环中监听文件变化，直到任务被取消。
+
+        callback 如果返回 awaitable 会被等待。
+        """
+        import asyncio
+        loop = asyncio.get_event_loop()
+        inotify = self._open_inotify()
+        event = asyncio.Event()
+        if inotify is not None:
+            def on_readable():
+                inotify.read(timeout=0)
+                event.set()
+            loop.add_reader(inotify.fileno(), on_readable)
+        try:
+            while True:
+                if inotify is not None:
+                    try:
+                        await asyncio.wait_for(event.wait(), self.interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    event.clear()
+                    self._watch_dirs(inotify)
+                else:
+                    await asyncio.sleep(self.interval)
+                for path in self.poll():
+                    if self.callback is not None:
+                        result = self.callback(path)
+                        if hasattr(result, '__await__'):
+                            await result
+        finally:
+            if inotify is not None:
+                loop.remove_reader(inotify.fileno())
+                inotify.close()
+
+    def _open_inotify(self):
+        if not self.use_inotify:
+            return None
+        try:
+            from inotify_simple import INotify
+        except ImportError:
+            return None
+        try:
+            inotify = INotify()
+        except OSError:
+            return None
+        self._watched_dirs = set()
+        self._watch_dirs(inotify)
+        return inotify
+
+    def _watch_dirs(self, inotify):
+        # 监听所在目录而不是文件本身，编辑器常用“写临时文件 + rename”的方式保存
+        from inotify_simple import flags
+        mask = (flags.MODIFY | flags.CLOSE_WRITE | flags.MOVED_TO |
+                flags.CREATE | flags.DELETE | flags.ATTRIB)
+        with self._lock:
+            dirs = set(os.path.dirname(path) for path in self._signatures)
+        for directory in dirs - self._watched_dirs:
+            try:
+                inotify.add_watch(directory, mask)
+            except OSError:
+                continue
+            self._watched_dirs.add(directory)
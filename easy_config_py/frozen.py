@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/18-02:10
+# @Author  : 灯下客
+# @Email   :
+# @File    : frozen.py
+# @Software: PyCharm
+import weakref
+from collections.abc import Mapping
+
+from easy_config_py import tracking
+
+# 键不超过这个数量时线性查找，不建立索引
+_SCAN_LIMIT = 8
+
+_MISSING = object()
+
+
+def _digest(*parts):
+    # hashlib 只在第一次计算指纹时导入
+    import hashlib
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(part)
+    return h.digest()
+
+
+def fingerprint_of(value):
+    """
+    返回值的内容指纹（16 字节）。
+
+    FrozenConfig 的指纹在第一次计算后缓存，父节点由子节点的指纹组合而成；
+    映射的指纹与键的顺序无关，1、1.0 和 True 的指纹不同。
+    """
+    if isinstance(value, FrozenConfig):
+        return value._get_fingerprint()
+    if isinstance(value, tuple):
+        return _digest(b'L', *(fingerprint_of(item) for item in value))
+    if isinstance(value, frozenset):
+        return _digest(b'S', *sorted(fingerprint_of(item) for item in value))
+    if isinstance(value, str):
+        return _digest(b's', value.encode('utf-8', 'surrogatepass'))
+    return _digest(b'v', type(value).__qualname__.encode('utf-8'), b':', repr(value).encode('utf-8'))
+
+
+class FrozenConfig(Mapping):
+    """
+    深度冻结、可哈希的配置节点。
+
+    键和值保存在两个元组中（__slots__，没有每个实例的 __dict__），
+    嵌套字典是 FrozenConfig，列表转换为元组，集合转换为 frozenset。
+    指纹（fingerprint）按内容计算一次后缓存；哈希和相等比较都基于指纹，
+    重载后内容没有变化的配置段与旧的冻结节点相等、哈希相同，可以直接作为 lru_cache 的参数。
+
+    读取接口与 Snapshot 相同：属性访问、下标访问、get、按点号路径的 getattr，
+    不存在的键抛出 AttributeError / KeyError 或返回默认值。
+
+    示例:
+        >>> @functools.lru_cache(maxsize=32)
+        ... def make_pool(database):
+        ...     return Pool(database.host, database.port)
+        >>> pool = make_pool(config.frozen('database'))   # 重载后 database 未变化时命中缓存
+    """
+    __slots__ = ('_keys', '_values', '_index', '_fingerprint', '_hash', '_source', '_version')
+
+    def __init__(self, items=()):
+        if isinstance(items, Mapping):
+            items = items.items()
+        keys = []
+        values = []
+        for key, value in items:
+            keys.append(key)
+            values.append(deep_freeze(value))
+        self._init(tuple(keys), tuple(values))
+
+    def _init(self, keys, values, source=None, version=None):
+        object.__setattr__(self, '_keys', keys)
+        object.__setattr__(self, '_values', values)
+        object.__setattr__(self, '_index', None)
+        object.__setattr__(self, '_fingerprint', None)
+        object.__setattr__(self, '_hash', None)
+        # 只弱引用源节点：冻结副本常被 lru_cache 等长期持有，不能因此让旧的 Dict 树一直存活
+        object.__setattr__(self, '_source', weakref.ref(source) if source is not None else None)
+        object.__setattr__(self, '_version', version)
+
+    def _position(self, key):
+        keys = self._keys
+        if len(keys) <= _SCAN_LIMIT:
+            for position, candidate in enumerate(keys):
+                if candidate == key:
+                    return position
+            return -1
+        index = self._index
+        if index is None:
+            index = {candidate: position for position, candidate in enumerate(keys)}
+            object.__setattr__(self, '_index', index)
+        return index.get(key, -1)
+
+    def __getitem__(self, key):
+        try:
+            position = self._position(key)
+        except TypeError:
+            position = -1
+        if position < 0:
+            raise KeyError(key)
+        return self._values[position]
+
+    def __getattr__(self, item):
+        if item.startswith('__'):
+            raise AttributeError(item)
+        try:
+            return self[item]
+        except KeyError:
+            raise AttributeError(item) from None
+
+    def __contains__(self, key):
+        try:
+            return self._position(key) >= 0
+        except TypeError:
+            return False
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def get(self, key, default=None):
+        try:
+            position = self._position(key)
+        except TypeError:
+            return default
+        return self._values[position] if position >= 0 else default
+
+    def getattr(self, key, default=None):
+        """按点号路径读取，路径不存在时返回 default"""
+        current = self
+        for k in key.split('.') if '.' in key else (key,):
+            if not isinstance(current, FrozenConfig):
+                return default
+            current = current.get(k, _MISSING)
+            if current is _MISSING:
+                return default
+        return current
+
+    def _get_fingerprint(self):
+        fingerprint = self._fingerprint
+        if fingerprint is None:
+            entries = sorted(fingerprint_of(key) + fingerprint_of(value)
+                             for key, value in zip(self._keys, self._values))
+            fingerprint = _digest(b'M', *entries)
+            object.__setattr__(self, '_fingerprint', fingerprint)
+        return fingerprint
+
+    @property
+    def fingerprint(self):
+        """内容指纹（32 位十六进制字符串），计算一次后缓存"""
+        return self._get_fingerprint().hex()
+
+    @property
+    def version(self):
+        """构建时源节点的版本号，参见 tracking.version_of；不是由 Dict 构建时为 None"""
+        return self._version
+
+    def __hash__(self):
+        value = self._hash
+        if value is None:
+            value = hash(self._get_fingerprint())
+            object.__setattr__(self, '_hash', value)
+        return value
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if isinstance(other, FrozenConfig):
+            return self._get_fingerprint() == other._get_fingerprint()
+        if isinstance(other, Mapping):
+            return self.to_dict() == _thaw(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("'FrozenConfig' object is read-only")
+
+    __setattr__ = __delattr__ = __setitem__ = __delitem__ = _readonly
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (FrozenConfig, (self.to_dict(),))
+
+    def to_dict(self):
+        return {key: _thaw(value) for key, value in zip(self._keys, self._values)}
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, self.to_dict())
+
+
+def _thaw(value):
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, (tuple, list)):
+        return [_thaw(item) for item in value]
+    if isinstance(value, frozenset):
+        return set(value)
+    return value
+
+
+def deep_freeze(value, previous=None):
+    """
+    把 Dict / dict / 列表 / 集合递归转换为 FrozenConfig / 元组 / frozenset，其他值原样返回。
+
+    不会修改源节点（LazyDict 也不会被触发包装）。传入上一次的冻结结果时，
+    源节点是同一个对象且版本号（tracking.version_of）没有变化的子树直接复用，
+    已经计算过的指纹也随之保留。
+    """
+    if isinstance(value, FrozenConfig):
+        return value
+    if isinstance(value, dict):
+        version = tracking.version_of(value) or None
+        if (previous is not None and version is not None and previous._source is not None
+                and previous._source() is value and previous._version == version):
+            return previous
+        keys = []
+        values = []
+        for key, item in dict.items(value):
+            old = None
+            if previous is not None and isinstance(item, dict):
+                old = previous.get(key)
+                if not isinstance(old, FrozenConfig):
+                    old = None
+            keys.append(key)
+            values.append(deep_freeze(item, old))
+        node = FrozenConfig.__new__(FrozenConfig)
+        node._init(tuple(keys), tuple(values),
+                   value if version is not None else None, version)
+        return node
+    if isinstance(value, (list, tuple)):
+        return tuple(deep_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(deep_freeze(item) for item in value)
+    return value
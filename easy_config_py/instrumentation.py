@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/17-19:10
+# @Author  : 灯下客
+# @Email   :
+# @File    : instrumentation.py
+# @Software: PyCharm
+import threading
+import time
+
+# 操作名称
+STAT = 'stat'
+READ = 'read'
+PARSE = 'parse'
+MERGE = 'merge'
+
+clock = time.perf_counter
+
+
+class Instrumentation(object):
+    """
+    加载过程的埋点。
+
+    FileLoader 和 EasyConfig 在 stat / read / parse / merge 等操作完成后调用 emit，
+    事件是一个 dict，包含 op、seconds 以及 path、bytes、format、cache 等可选字段，
+    依次交给各个 sink 处理。sink 是任意接受事件的可调用对象。
+
+    未启用时（instrument=None）只多一次 is None 判断。
+
+    示例:
+        >>> stats = StatsSink()
+        >>> config = EasyConfig(path='./config', instrument=Instrumentation(stats, LoggingSink()))
+        >>> config.load_file()
+        >>> config.stats()['operations']['parse']['count']  # 1
+    """
+
+    def __init__(self, *sinks):
+        self.sinks = list(sinks)
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+        return sink
+
+    @property
+    def stats_sink(self):
+        """第一个 StatsSink，没有时返回 None"""
+        for sink in self.sinks:
+            if isinstance(sink, StatsSink):
+                return sink
+        return None
+
+    def emit(self, op, seconds, **fields):
+        fields['op'] = op
+        fields['seconds'] = seconds
+        for sink in self.sinks:
+            sink(fields)
+
+
+def make_instrumentation(instrument):
+    """
+    把 instrument 参数统一为 Instrumentation 或 None。
+
+    Args:
+        instrument: None、Instrumentation、True（使用 StatsSink）或单个 sink
+    """
+    if instrument is None or instrument is False:
+        return None
+    if instrument is True:
+        return Instrumentation(StatsSink())
+    if isinstance(instrument, Instrumentation):
+        return instrument
+    return Instrumentation(instrument)
+
+
+class CallbackSink(object):
+    """把事件转发给回调函数 callback(event)"""
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def __call__(self, event):
+        self.callback(event)
+
+
+class LoggingSink(object):
+    """把事件写入 logging"""
+
+    def __init__(self, logger=None, level=None):
+        # logging 导入较慢，只在使用 LoggingSink 时导入
+        import logging
+        self.logger = logger or logging.getLogger('easy_config_py')
+        self.level = logging.DEBUG if level is None else level
+
+    def __call__(self, event):
+        if not self.logger.isEnabledFor(self.level):
+            return
+        extra = ' '.join(
+            '{}={}'.format(key, value) for key, value in event.items()
+            if key not in ('op', 'seconds')
+        )
+        self.logger.log(self.level, '%s %.3fms %s', event['op'], event['seconds'] * 1000, extra)
+
+
+class Histogram(object):
+    """按 2 的幂（微秒）分桶的耗时直方图"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.buckets = {}
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+        bucket = 1 << int(seconds * 1e6).bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else 0.0,
+            'min': self.min,
+            'max': self.max,
+            'buckets_us': {'<{}'.format(bucket): self.buckets[bucket]
+                           for bucket in sorted(self.buckets)},
+        }
+
+
+class StatsSink(object):
+    """内存中的统计：每种操作的耗时直方图、字节数，以及缓存命中计数"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.histograms = {}
+            self.bytes = {}
+            self.counters = {}
+
+    def __call__(self, event):
+        op = event['op']
+        with self._lock:
+            histogram = self.histograms.get(op)
+            if histogram is None:
+                histogram = self.histograms[op] = Histogram()
+            histogram.add(event['seconds'])
+            size = event.get('bytes')
+            if size:
+                self.bytes[op] = self.bytes.get(op, 0) + size
+            cache = event.get('cache')
+            if cache:
+                name = 'cache_' + cache
+                self.counters[name] = self.counters.get(name, 0) + 1
+            fmt = event.get('format')
+            if fmt:
+                name = '{}.{}'.format(op, fmt)
+                self.counters[name] = self.counters.get(name, 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            operations = {}
+            for op, histogram in self.histograms.items():
+                operations[op] = histogram.snapshot()
+                operations[op]['bytes'] = self.bytes.get(op, 0)
+            return {'operations': operations, 'counters': dict(self.counters)}
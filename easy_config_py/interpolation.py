@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/17-22:10
+# @Author  : 灯下客
+# @Email   :
+# @File    : interpolation.py
+# @Software: PyCharm
+import os
+import re
+import weakref
+from functools import lru_cache
+
+_MISSING = object()
+
+# ${name}、${name:-default}、${env:NAME}；$${ 表示字面量 ${
+_PATTERN = re.compile(r'\$\$\{|\$\{((?:env:)?[^}:]+)(?::-([^}]*))?\}')
+_ENV_PREFIX = 'env:'
+
+
+class Reference(object):
+    """模板中的一个 ${...} 引用"""
+    __slots__ = ('path', 'env', 'default')
+
+    def __init__(self, path, env, default):
+        self.path = path
+        self.env = env
+        self.default = default
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, '.'.join(self.path))
+
+
+@lru_cache(maxsize=4096)
+def parse(template):
+    """
+    把模板拆成字面量字符串和 Reference 组成的元组，结果按模板字符串缓存。
+
+    不包含 ${ 的字符串返回 None。
+
+    示例:
+        >>> parse('postgres://${database.host}:${database.port:-5432}')
+        ('postgres://', Reference('database.host'), ':', Reference('database.port'))
+    """
+    if '${' not in template:
+        return None
+    parts = []
+    position = 0
+    for match in _PATTERN.finditer(template):
+        literal = template[position:match.start()]
+        position = match.end()
+        name = match.group(1)
+        if name is None:
+            parts.append(literal + '${')
+            continue
+        if literal:
+            parts.append(literal)
+        name = name.strip()
+        env = name.startswith(_ENV_PREFIX)
+        if env:
+            path = (name[len(_ENV_PREFIX):],)
+        else:
+            path = tuple(name.split('.'))
+        parts.append(Reference(path, env, match.group(2)))
+    if position < len(template):
+        parts.append(template[position:])
+    return tuple(parts)
+
+
+def watch_key(node, key, watcher):
+    """登记 watcher，node[key] 被写入或删除时调用 watcher.invalidate()"""
+    watchers = node.__dict__.get('__watchers')
+    if watchers is None:
+        watchers = {}
+        object.__setattr__(node, '__watchers', watchers)
+    keyed = watchers.get(key)
+    if keyed is None:
+        keyed = watchers[key] = weakref.WeakSet()
+    keyed.add(watcher)
+
+
+def notify_key(node, key):
+    """node[key] 被写入或删除，通知登记在该键上的 watcher"""
+    keyed = node.__dict__['__watchers'].pop(key, None)
+    if keyed:
+        for watcher in list(keyed):
+            watcher.invalidate()
+
+
+class _Watcher(object):
+    __slots__ = ('interpolator', 'path', '__weakref__')
+
+    def __init__(self, interpolator, path):
+        self.interpolator = interpolator
+        self.path = path
+
+    def invalidate(self):
+        self.interpolator.invalidate(self.path)
+
+
+class Interpolator(object):
+    """
+    带缓存的 ${...} 插值解析器。
+
+    模板只解析一次（按字符串缓存），解析结果按路径缓存，并记录引用依赖图：
+    路径 A 的模板引用了路径 B，则 B 的依赖方包含 A。解析时在经过的每个
+    Dict 节点的对应键上登记，某个键被写入（__setitem__ / setattr / update / 删除）时
+    只使该路径及其依赖方（递归）的缓存失效。
+
+    引用按以下顺序查找：配置中的路径、同名环境变量、默认值；
+    ${env:NAME} 只查找环境变量。整个字符串只有一个引用时保留被引用值的类型。
+    环境变量的变化不会被跟踪，修改后请调用 invalidate()。
+
+    Args:
+        root: 根 Dict
+        environ: 环境变量映射，默认 os.environ
+
+    示例:
+        >>> d = Dict({'database': {'host': 'db', 'port': 5432},
+        ...           'url': 'postgres://${database.host}:${database.port}'})
+        >>> d.resolve('url')            # 'postgres://db:5432'
+        >>> d.database.host = 'db2'     # 只有 url 的缓存失效
+        >>> d.resolve('url')            # 'postgres://db2:5432'
+    """
+
+    def __init__(self, root, environ=None):
+        self.root = root
+        self.environ = os.environ if environ is None else environ
+        self._memo = {}
+        self._dependents = {}
+        self._watchers = {}
+
+    def get(self, path, default=None):
+        """
+        解析路径上的值，路径不存在时返回 default。
+
+        Raises:
+            ValueError: 引用存在循环
+            KeyError: 引用的路径、环境变量都不存在且没有默认值
+        """
+        if isinstance(path, str):
+            path = tuple(path.split('.'))
+        value = self._resolve(path)
+        return default if value is _MISSING else value
+
+    def invalidate(self, path=None):
+        """使 path 及其依赖方的缓存失效；path 为 None 时清空全部缓存"""
+        if path is None:
+            self._memo.clear()
+            self._dependents.clear()
+            return
+        pending = [path]
+        while pending:
+            path = pending.pop()
+            self._memo.pop(path, None)
+            pending.extend(self._dependents.pop(path, ()))
+
+    def dependents(self, path):
+        """直接引用 path 的路径集合"""
+        if isinstance(path, str):
+            path = tuple(path.split('.'))
+        return set(self._dependents.get(path, ()))
+
+    def resolve_all(self, node=None, prefix=()):
+        """返回解析了全部插值的普通字典"""
+        node = self.root if node is None else node
+        result = {}
+        for key in node:
+            path = prefix + (key,)
+            value = node[key]
+            if isinstance(value, dict):
+                result[key] = self.resolve_all(value, path)
+            else:
+                value = self._resolve(path)
+                result[key] = self._plain(value)
+        return result
+
+    def _plain(self, value):
+        if isinstance(value, dict):
+            return {key: self._plain(val) for key, val in value.items()}
+        if isinstance(value, (list, tuple)):
+            return type(value)(self._plain(item) for item in value)
+        return value
+
+    def _resolve(self, path, resolving=()):
+        # resolving: 当前调用链上正在解析的路径，作为参数传递，多个线程同时解析互不影响
+        value = self._memo.get(path, _MISSING)
+        if value is not _MISSING:
+            return value
+        if path in resolving:
+            cycle = resolving[resolving.index(path):] + (path,)
+            raise ValueError(
+                "Interpolation cycle: " + ' -> '.join('.'.join(p) for p in cycle)
+            )
+        raw = self._lookup(path)
+        if raw is _MISSING:
+            return _MISSING
+        parts = parse(raw) if isinstance(raw, str) else None
+        if parts is None:
+            self._memo[path] = raw
+            return raw
+        resolving += (path,)
+        if len(parts) == 1 and isinstance(parts[0], Reference):
+            value = self._reference(path, parts[0], resolving)
+        else:
+            value = ''.join(
+                part if isinstance(part, str) else str(self._reference(path, part, resolving))
+                for part in parts
+            )
+        self._memo[path] = value
+        return value
+
+    def _reference(self, owner, reference, resolving):
+        value = _MISSING
+        if not reference.env:
+            self._dependents.setdefault(reference.path, set()).add(owner)
+            value = self._resolve(reference.path, resolving)
+        if value is _MISSING and len(reference.path) == 1:
+            value = self.environ.get(reference.path[0], _MISSING)
+        if value is _MISSING:
+            if reference.default is None:
+                raise KeyError(
+                    f"Cannot resolve '${{{'.'.join(reference.path)}}}' "
+                    f"referenced by '{'.'.join(owner)}'"
+                )
+            value = reference.default
+        return value
+
+    def _lookup(self, path):
+        # 先登记再读取，路径上任意一个键被写入都会使 path 失效
+        watcher = self._watchers.get(path)
+        if watcher is None:
+            watcher = self._watchers[path] = _Watcher(self, path)
+        current = self.root
+        for key in path:
+            if not isinstance(current, dict):
+                return _MISSING
+            if hasattr(current, '__dict__'):
+                watch_key(current, key, watcher)
+            if key not in current:
+                return _MISSING
+            current = current[key]
+        return current
@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/17-15:30
+# @Author  : 灯下客
+# @Email   :
+# @File    : layered.py
+# @Software: PyCharm
+import os.path
+import threading
+from collections.abc import Mapping
+
+from easy_config_py import FileLoader
+from easy_config_py import parsers
+from easy_config_py.snapshot import build_snapshot
+
+_ABSENT = object()
+_BLOCKED = object()
+
+
+def _walk(data, keys):
+    """
+    在单个层中查找路径。
+
+    Returns:
+        找到时返回对应的值；路径不存在返回 _ABSENT；
+        路径的某个前缀是非字典值（会遮挡下层）时返回 _BLOCKED
+    """
+    current = data
+    for k in keys:
+        if not isinstance(current, dict):
+            return _BLOCKED
+        if k not in current:
+            return _ABSENT
+        current = current[k]
+    return current
+
+
+def _paths(data, prefix=()):
+    """遍历层中的所有路径，返回 (path, is_mapping)"""
+    for key, value in data.items():
+        path = prefix + (key,)
+        if isinstance(value, dict):
+            yield path, True
+            for item in _paths(value, path):
+                yield item
+        else:
+            yield path, False
+
+
+class LayeredView(Mapping):
+    """
+    分层配置中某个字典路径的只读视图，读取时自上而下在各层中解析。
+    """
+    __slots__ = ('_config', '_keys')
+
+    def __init__(self, config, keys):
+        self._config = config
+        self._keys = keys
+
+    def __getattr__(self, item):
+        if item.startswith('__'):
+            raise AttributeError(item)
+        return self._config._value(self._keys + (item,), None)
+
+    def __getitem__(self, item):
+        value = self._config._value(self._keys + (item,), _ABSENT)
+        if value is _ABSENT:
+            raise KeyError(item)
+        return value
+
+    def __iter__(self):
+        return iter(self._config._child_keys(self._keys))
+
+    def __len__(self):
+        return len(self._config._child_keys(self._keys))
+
+    def __contains__(self, item):
+        return self._config._value(self._keys + (item,), _ABSENT) is not _ABSENT
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, self.to_dict())
+
+    def getattr(self, key, default=None):
+        """通过点号分隔的路径读取，参见 Dict.getattr"""
+        return self._config._value(self._keys + tuple(key.split('.')), default)
+
+    def to_dict(self):
+        base = {}
+        for key in self:
+            value = self[key]
+            base[key] = value.to_dict() if isinstance(value, LayeredView) else value
+        return base
+
+
+class LayeredConfig(object):
+    """
+    分层配置：每个来源作为一个独立的不可变层保存，读取时自上而下解析。
+
+    与 EasyConfig 每次加载都深度合并到同一个 Dict 不同，这里加载新层
+    只需要转换该层本身；每个路径的解析结果会被缓存，增删层时只使该层
+    涉及的路径失效，代价与该层大小成正比，而与配置总大小无关。
+
+    层之间的合并语义与 Dict.update 一致：上层的字典与下层的字典按键合并，
+    上层的非字典值会整体遮挡下层同一路径（及其子路径）的值。
+
+    每个层保存为只读的 Snapshot（列表转换为元组），层的内容不能原地修改，
+    修改配置只能通过 add_layer / remove_layer，缓存的解析结果不会过期。
+
+    示例:
+        >>> config = LayeredConfig(path='./config')
+        >>> config.load_file('base.yml')
+        >>> config.load_file('prod.yml', name='env')
+        >>> config.add_layer('runtime', {'database': {'host': '10.0.0.1'}})
+        >>> config.database.host             # '10.0.0.1'
+        >>> config.which('database.host')    # 'runtime'
+        >>> config.remove_layer('runtime')
+    """
+
+    def __init__(self, layers=None, path=None, default_filename='config.yml', cache=None):
+        self._layers = []
+        # 解析结果缓存，按路径组织成前缀树：node = [entry, child_keys, children]
+        self._memo = [None, None, {}]
+        self._lock = threading.RLock()
+        self._root = LayeredView(self, ())
+        if path is not None and os.path.isfile(path):
+            path = os.path.dirname(path)
+        if path is None:
+            path = os.path.dirname(__file__)
+        self.path = path
+        self._loader = FileLoader(path, default_filename, cache)
+        for name, data in (layers or ()):
+            self.add_layer(name, data)
+
+    def __getattr__(self, item):
+        if item.startswith('__'):
+            raise AttributeError(item)
+        return self._value((item,), None)
+
+    @property
+    def data(self):
+        """合并后配置的只读视图"""
+        return self._root
+
+    @property
+    def layers(self):
+        """层名称列表，从底层到顶层"""
+        return [name for name, _ in self._layers]
+
+    def layer(self, name):
+        """返回指定层的数据（只读的 Snapshot）"""
+        for layer_name, data in self._layers:
+            if layer_name == name:
+                return data
+        raise KeyError(name)
+
+    def add_layer(self, name, data, index=None):
+        """
+        添加一个层；同名层已存在时原位替换。
+
+        Args:
+            name: 层名称
+            data: 层数据（字典）
+            index: 插入位置，默认放在最顶层
+        """
+        # 复制为只读快照：Dict.freeze 只禁止新增键，原地修改已有的值会使缓存的解析结果过期
+        data = build_snapshot(data if isinstance(data, dict) else dict(data or ()))
+        with self._lock:
+            position = self._index(name)
+            if position is not None:
+                self._invalidate(self._layers.pop(position)[1])
+                if index is None:
+                    index = position
+            if index is None:
+                index = len(self._layers)
+            self._layers.insert(index, (name, data))
+            self._invalidate(data)
+
+    def remove_layer(self, name):
+        """移除指定的层"""
+        with self._lock:
+            position = self._index(name)
+            if position is None:
+                raise KeyError(name)
+            self._invalidate(self._layers.pop(position)[1])
+
+    def load_file(self, path=None, name=None, index=None):
+        """加载配置文件作为一个层，默认以文件路径作为层名称"""
+        path = os.path.abspath(self._loader.resolve_path(path))
+        config = self._loader.get_file(path, parsers.load_file)
+        self.add_layer(name or path, config or {}, index)
+
+    async def async_load_file(self, path=None, name=None, index=None):
+        """异步加载配置文件作为一个层"""
+        path = os.path.abspath(self._loader.resolve_path(path))
+        config = await self._loader.async_get_file(path, parsers.load_file)
+        self.add_layer(name or path, config or {}, index)
+
+    def load_by_content(self, content, name, parser_type='yml', index=None):
+        """从字符串内容加载一个层"""
+        extension = parsers.check_type(parser_type)
+        self.add_layer(name, parsers.load_content(content, extension) or {}, index)
+
+    def getattr(self, key, default=None):
+        """
+        通过点号分隔的路径读取配置值。
+
+        示例:
+            >>> config.getattr('database.host-name', 'localhost')
+        """
+        return self._value(tuple(key.split('.')), default)
+
+    def which(self, key):
+        """
+        返回提供该值的层名称；字典路径返回提供它的最上层，路径不存在返回 None。
+        """
+        entry = self._resolve(tuple(key.split('.')))
+        return None if entry is None else entry[1]
+
+    def to_dict(self):
+        return self._root.to_dict()
+
+    def _index(self, name):
+        for position, (layer_name, _) in enumerate(self._layers):
+            if layer_name == name:
+                return position
+        return None
+
+    def _node(self, keys, create=False):
+        node = self._memo
+        for k in keys:
+            child = node[2].get(k)
+            if child is None:
+                if not create:
+                    return None
+                child = node[2][k] = [None, None, {}]
+            node = child
+        return node
+
+    def _invalidate(self, data):
+        # 只清理该层涉及的路径：路径本身及其祖先的解析结果，
+        # 非字典值会遮挡子路径，因此连同其子树一起丢弃
+        self._memo[0] = self._memo[1] = None
+        for keys, is_mapping in _paths(data):
+            node = self._memo
+            for k in keys:
+                node = node[2].get(k)
+                if node is None:
+                    break
+                node[0] = node[1] = None
+            if node is not None and not is_mapping:
+                node[2].clear()
+
+    def _resolve(self, keys):
+        with self._lock:
+            node = self._node(keys)
+            if node is None or node[0] is None:
+                entry = self._lookup(keys)
+                if entry is _ABSENT:
+                    # 不存在的路径不进入缓存，读取任意路径不会使缓存无限增长
+                    return None
+                if node is None:
+                    node = self._node(keys, create=True)
+                node[0] = entry
+            entry = node[0]
+        return None if entry is _ABSENT else entry
+
+    def _lookup(self, keys):
+        for name, data in reversed(self._layers):
+            value = _walk(data, keys)
+            if value is _BLOCKED:
+                break
+            if value is _ABSENT:
+                continue
+            if isinstance(value, dict):
+                return LayeredView(self, keys), name
+            return value, name
+        return _ABSENT
+
+    def _value(self, keys, default):
+        entry = self._resolve(keys)
+        return default if entry is None else entry[0]
+
+    def _child_keys(self, keys):
+        with self._lock:
+            node = self._node(keys)
+            if node is None or node[1] is None:
+                mappings = []
+                for _, data in reversed(self._layers):
+                    value = _walk(data, keys)
+                    if value is _BLOCKED:
+                        break
+                    if value is _ABSENT:
+                        continue
+                    if not isinstance(value, dict):
+                        break
+                    mappings.append(value)
+                # 与 Dict.update 合并后的键顺序一致：先下层，后上层新增的键
+                child_keys = {}
+                for value in reversed(mappings):
+                    for k in value:
+                        child_keys.setdefault(k, None)
+                if not mappings:
+                    # 路径不存在或不是字典：返回临时的空结果，不进入缓存
+                    return []
+                if node is None:
+                    node = self._node(keys, create=True)
+                node[1] = list(child_keys)
+            return node[1]
@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/18-01:20
+# @Author  : 灯下客
+# @Email   :
+# @File    : merge.py
+# @Software: PyCharm
+from collections import namedtuple
+
+# 合并策略
+REPLACE = 'replace'   # 整体替换
+MERGE = 'merge'       # 字典深度合并（字典的默认策略）
+APPEND = 'append'     # 列表追加
+
+# 按元素中的某个字段合并列表：字段值相同的字典元素深度合并，其余元素追加
+ByKey = namedtuple('ByKey', 'field')
+
+_MISSING = object()
+
+
+class _Delete(object):
+    """删除标记：合并时删除对应的键"""
+    __slots__ = ()
+
+    def __repr__(self):
+        return 'DELETE'
+
+    def __reduce__(self):
+        return 'DELETE'
+
+
+DELETE = _Delete()
+
+
+def by_key(field):
+    """返回按 field 字段合并列表的策略，如 by_key('name')"""
+    return ByKey(field)
+
+
+class _Rule(object):
+    __slots__ = ('strategy', 'children')
+
+    def __init__(self):
+        self.strategy = None
+        self.children = {}
+
+    def child(self, key):
+        children = self.children
+        if not children:
+            return None
+        rule = children.get(key)
+        if rule is None:
+            rule = children.get('*')
+        return rule
+
+
+class MergeStrategies(object):
+    """
+    按路径指定的合并策略，编译为前缀树，合并时随遍历逐层查找。
+
+    路径用点号分隔，'*' 匹配任意一段；未指定的路径字典深度合并、其他值（包括列表）整体替换。
+
+    Args:
+        strategies: {路径: 策略}，策略为 REPLACE、MERGE、APPEND 或 by_key(字段)
+        delete_marker: 额外的删除标记，如 '~delete' 或 None（JSON Merge Patch 风格）；
+            DELETE 对象总是删除标记
+
+    示例:
+        >>> strategies = MergeStrategies({
+        ...     'servers': by_key('name'),
+        ...     'plugins': APPEND,
+        ...     'logging': REPLACE,
+        ... }, delete_marker='~delete')
+    """
+
+    def __init__(self, strategies=None, delete_marker=DELETE):
+        self.root = _Rule()
+        self.delete_marker = delete_marker
+        for path, strategy in (strategies or {}).items():
+            if strategy not in (REPLACE, MERGE, APPEND) and not isinstance(strategy, ByKey):
+                raise ValueError("Unknown merge strategy {!r} for '{}'".format(strategy, path))
+            rule = self.root
+            for key in path.split('.'):
+                rule = rule.children.setdefault(key, _Rule())
+            rule.strategy = strategy
+
+    def is_delete(self, value):
+        """value 是否为删除标记"""
+        if value is DELETE:
+            return True
+        marker = self.delete_marker
+        if marker is DELETE:
+            return False
+        if marker is None:
+            return value is None
+        return type(value) is type(marker) and value == marker
+
+
+_DEFAULT = MergeStrategies()
+
+
+def compile_strategies(strategies):
+    """把 None、{路径: 策略} 或 MergeStrategies 统一为 MergeStrategies"""
+    if strategies is None:
+        return _DEFAULT
+    if isinstance(strategies, MergeStrategies):
+        return strategies
+    return MergeStrategies(strategies)
+
+
+def is_delete(value):
+    """value 是否为 DELETE 删除标记"""
+    return value is DELETE
+
+
+def merge_many(target, sources, strategies=None):
+    """
+    把多个来源按顺序合并进 target（Dict），每棵来源树只遍历一次。
+
+    与依次调用 update 不同，同一个键在各层中的值先收集起来：最后一个会覆盖前面内容的值
+    （标量、整体替换的列表、删除标记）之前的层直接跳过，不会被转换；
+    多层中的字典只在对应的节点上合并一次，不会在每一层重建中间的 Dict。
+    target 设置了 schema 时，每层先经过 Schema.check_update 校验。
+
+    Args:
+        target: 合并的目标 Dict / LazyDict
+        sources: 普通 dict（或 Dict）组成的列表，越靠后优先级越高
+        strategies: None、{路径: 策略} 或 MergeStrategies
+
+    示例:
+        >>> merge_many(data, [defaults, config, overrides], {'plugins': APPEND})
+    """
+    from easy_config_py.addict import Dict
+    strategies = compile_strategies(strategies)
+    layers = [source for source in sources if source]
+    if not layers:
+        return target
+    schema = target.__dict__.get('__schema')
+    if schema is not None:
+        if strategies.delete_marker is not DELETE:
+            # schema 只认识 DELETE，先把自定义删除标记换成 DELETE（校验本身也要遍历整层）
+            layers = [_normalize_markers(layer, strategies.is_delete) for layer in layers]
+        layers = [schema.check_update(target, layer) for layer in layers]
+    _Merger(Dict, strategies).fold(target, layers, strategies.root)
+    return target
+
+
+def merge(target, source, strategies=None):
+    """把单个来源合并进 target，参见 merge_many"""
+    return merge_many(target, (source,), strategies)
+
+
+def _normalize_markers(value, is_delete_):
+    if isinstance(value, dict):
+        return {key: DELETE if is_delete_(item) else _normalize_markers(item, is_delete_)
+                for key, item in value.items()}
+    return value
+
+
+class _Merger(object):
+    __slots__ = ('node_class', 'is_delete')
+
+    def __init__(self, node_class, strategies):
+        self.node_class = node_class
+        self.is_delete = is_delete if strategies.delete_marker is DELETE else strategies.is_delete
+
+    def _kind(self, value, strategy):
+        # 可以与前一层合并的值的类别；None 表示会覆盖前面的所有层
+        if isinstance(value, dict):
+            return None if strategy == REPLACE else 'map'
+        if isinstance(value, list) and (strategy == APPEND or isinstance(strategy, ByKey)):
+            return 'list'
+        return None
+
+    def fold(self, target, layers, rule):
+        if len(layers) == 1:
+            layer = layers[0]
+            for key in layer:
+                value = dict.__getitem__(layer, key)
+                self.merge_key(target, key, (value,), rule.child(key) if rule is not None else None)
+            return
+        keys = dict.fromkeys(key for layer in layers for key in layer)
+        for key in keys:
+            values = [dict.__getitem__(layer, key) for layer in layers if key in layer]
+            self.merge_key(target, key, values, rule.child(key) if rule is not None else None)
+
+    def merge_key(self, target, key, values, rule):
+        strategy = rule.strategy if rule is not None else None
+        last = values[-1]
+        kind = self._kind(last, strategy)
+        if kind is None:
+            if self.is_delete(last):
+                if key in target:
+                    del target[key]
+            else:
+                target[key] = self.convert(type(target), last, rule)
+            return
+        # 从后往前找到连续可合并的层，之前的层被覆盖，不需要处理
+        start = len(values) - 1
+        while start > 0 and self._kind(values[start - 1], strategy) == kind:
+            start -= 1
+        tail = values[start:]
+        existing = _MISSING
+        if start == 0 and key in target:
+            existing = target[key]
+        if kind == 'map':
+            self.merge_map(target, key, existing, tail, rule)
+        else:
+            self.merge_list(target, key, existing, tail, strategy)
+
+    def merge_map(self, target, key, existing, tail, rule):
+        cls = type(target)
+        if isinstance(existing, dict):
+            if isinstance(existing, self.node_class):
+                self.fold(existing, tail, rule)
+                return
+            child = cls(existing)
+        elif len(tail) == 1:
+            target[key] = self.convert(cls, tail[0], rule)
+            return
+        else:
+            child = cls()
+        # 新建的子节点在挂到 target 之前填充，不会沿父节点链逐层更新版本号
+        self.fold(child, tail, rule)
+        target[key] = child
+
+    def merge_list(self, target, key, existing, tail, strategy):
+        cls = type(target)
+        result = list(existing) if isinstance(existing, (list, tuple)) else []
+        for items in tail:
+            if strategy == APPEND:
+                result.extend(cls._hook(items))
+            else:
+                result = self.merge_by_key(cls, result, items, strategy.field)
+        target[key] = result
+
+    def merge_by_key(self, cls, current, items, field):
+        result = list(current)
+        index = {}
+        for position, item in enumerate(result):
+            if isinstance(item, dict) and field in item:
+                index.setdefault(item[field], position)
+        for item in items:
+            if isinstance(item, dict) and field in item and item[field] in index:
+                position = index[item[field]]
+                merged = result[position]
+                merged = cls(merged) if isinstance(merged, dict) else cls()
+                self.fold(merged, (item,), None)
+                result[position] = merged
+                continue
+            if isinstance(item, dict) and field in item:
+                index[item[field]] = len(result)
+            result.append(self.convert(cls, item, None) if isinstance(item, dict) else cls._hook(item))
+        return result
+
+    def convert(self, cls, value, rule):
+        """把来源中的值转换为写入 target 的值"""
+        if isinstance(value, dict):
+            if getattr(cls, '_wrap', None) is not None and not isinstance(value, self.node_class):
+                # LazyDict 原样保存新增的子树，首次访问时才包装
+                return value
+            node = cls()
+            self.fold(node, (value,), rule)
+            return node
+        if isinstance(value, (list, tuple)):
+            return cls._hook(value)
+        return value
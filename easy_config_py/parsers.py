@@ -0,0 +1,329 @@
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/17-16:40
+# @Author  : 灯下客
+# @Email   :
+# @File    : parsers.py
+# @Software: PyCharm
+import os.path
+import json
+import threading
+
+from easy_config_py.env import _TRUE
+from easy_config_py.instrumentation import clock, READ, PARSE
+
+_parser_versions = {}
+
+# anyconfig 在第一次使用时才导入：它在导入时会探测所有后端，对短命令行程序开销很大
+_anyconfig = None
+_supported_types = None
+_import_lock = threading.Lock()
+
+# 可选：常见格式直接使用 json / tomllib / PyYAML 解析，跳过 anyconfig 的插件发现；
+# 默认关闭，环境变量 EASY_CONFIG_FAST_PARSERS=1 或 use_fast_path() 开启，参见 use_fast_path
+FAST_FORMATS = ('json', 'yaml', 'toml')
+_fast_path = os.environ.get('EASY_CONFIG_FAST_PARSERS', '').strip().lower() in _TRUE
+_fast_loaders = {}
+_MISSING = object()
+
+
+def get_anyconfig():
+    """返回 anyconfig 模块，第一次调用时导入"""
+    global _anyconfig
+    if _anyconfig is None:
+        with _import_lock:
+            if _anyconfig is None:
+                import anyconfig as module
+                _anyconfig = module
+    return _anyconfig
+
+
+def use_fast_path(enabled=True):
+    """
+    是否对 json / yaml / toml 直接使用标准库或 PyYAML 解析（默认关闭，
+    进程启动时设置环境变量 EASY_CONFIG_FAST_PARSERS=1 则默认开启）。
+
+    直接解析与经过 anyconfig 的结果有以下差异：
+        - 结果总是普通 dict，键的顺序与文件一致；不经过 anyconfig 的容器选项（ac_dict、ac_ordered）
+          以及模板、schema 等处理
+        - 空的 YAML 文档返回 {}，与文件缺失时一致
+        - TOML 使用 tomllib（3.11+）或 tomli，按 TOML 1.0 解析，日期时间是 datetime / date / time 对象；
+          anyconfig 可能使用 toml 等其他后端，日期时间和数值的类型可能不同
+        - 文件按 UTF-8 严格解码，解析错误直接抛出 json.JSONDecodeError、yaml.YAMLError、
+          tomllib.TOMLDecodeError，不经过 anyconfig 包装
+
+    关闭时所有格式都交给 anyconfig，行为与早期版本完全一致。两种方式的磁盘缓存键不同，切换后不会复用对方的解析结果。
+
+    示例:
+        >>> from easy_config_py import parsers
+        >>> parsers.use_fast_path()
+    """
+    global _fast_path
+    _fast_path = enabled
+
+
+def fast_loader(ac_parser):
+    """
+    返回 ac_parser 的直接解析函数 loader(content: str)，不可用时返回 None。
+
+    YAML 需要安装 PyYAML（优先使用 CSafeLoader），TOML 使用 tomllib（3.11+）或 tomli。
+    """
+    if not _fast_path or ac_parser not in FAST_FORMATS:
+        return None
+    loader = _fast_loaders.get(ac_parser, _MISSING)
+    if loader is _MISSING:
+        loader = _fast_loaders[ac_parser] = _make_fast_loader(ac_parser)
+    return loader
+
+
+def _make_fast_loader(ac_parser):
+    if ac_parser == "json":
+        return json.loads
+    if ac_parser == "yaml":
+        try:
+            import yaml
+        except ImportError:
+            return None
+        yaml_loader = parser_options("yaml").get('Loader', yaml.SafeLoader)
+
+        def load_yaml(content):
+            result = yaml.load(content, Loader=yaml_loader)
+            # 空文档与文件缺失时一致，返回空字典
+            return {} if result is None else result
+        return load_yaml
+    try:
+        import tomllib
+    except ImportError:
+        try:
+            import tomli as tomllib
+        except ImportError:
+            return None
+    return tomllib.loads
+
+
+def supported_types():
+    """支持的格式列表：anyconfig 的后端加上直接解析的格式，第一次调用后缓存"""
+    global _supported_types
+    if _supported_types is None:
+        types = set(get_anyconfig().list_types())
+        types.update(fmt for fmt in FAST_FORMATS if _make_fast_loader(fmt) is not None)
+        _supported_types = sorted(types)
+    return _supported_types
+
+
+def check_type(parser_type):
+    """
+    规范化格式名称（yml -> yaml）并检查是否支持。
+
+    可以直接解析的格式不需要导入 anyconfig。
+
+    Raises:
+        ValueError: 不支持的格式
+    """
+    extension = parser_type.lower()
+    extension = "yaml" if extension == "yml" else extension
+    if fast_loader(extension) is not None:
+        return extension
+    support_ext = supported_types()
+    if extension not in support_ext:
+        raise ValueError(
+            f"Unsupported file format '{extension}'. "
+            f"Currently supported formats: {', '.join(support_ext)}"
+        )
+    return extension
+
+
+def parser_type(path):
+    """根据扩展名推断解析器类型，yml 统一为 yaml"""
+    extension = os.path.splitext(path)[1][1:].lower()
+    return "yaml" if extension == "yml" else extension
+
+
+def parser_options(ac_parser):
+    """
+    返回传给 anyconfig 的额外参数。
+
+    对 YAML 自动选择 PyYAML 的 C 加速加载器（CSafeLoader），未编译 libyaml 时保持默认。
+    """
+    if ac_parser == "yaml":
+        try:
+            import yaml
+        except ImportError:
+            return {}
+        if getattr(yaml, '__with_libyaml__', False):
+            return {'Loader': yaml.CSafeLoader}
+    return {}
+
+
+def parser_version(ac_parser):
+    """解析器名称和版本，作为磁盘缓存键的一部分"""
+    fast = fast_loader(ac_parser) is not None
+    version = _parser_versions.get((ac_parser, fast))
+    if version is None:
+        if fast:
+            parts = ['direct']
+        else:
+            try:
+                parts = ['anyconfig-' + '.'.join(get_anyconfig().version())]
+            except (AttributeError, TypeError):
+                parts = ['anyconfig']
+        if ac_parser == "yaml":
+            try:
+                import yaml
+                parts.append('pyyaml-' + yaml.__version__)
+                if parser_options(ac_parser):
+                    parts.append('libyaml')
+            except ImportError:
+                pass
+        version = _parser_versions[(ac_parser, fast)] = '-'.join([ac_parser] + parts)
+    return version
+
+
+def load_file(path, disk_cache=None, instrument=None):
+    """
+    解析配置文件。
+
+    Args:
+        path: 文件路径
+        disk_cache: 可选的 DiskCache，命中时跳过解析
+        instrument: 可选的 Instrumentation，记录 read / parse 耗时
+
+    Returns:
+        解析结果
+    """
+    ac_parser = parser_type(path)
+    if disk_cache is None and instrument is None:
+        loader = fast_loader(ac_parser)
+        if loader is not None:
+            with open(path, "rb") as file_to_read:
+                return loader(file_to_read.read().decode('utf-8'))
+        return get_anyconfig().load(path, **parser_options(ac_parser))
+    started = clock()
+    with open(path, "rb") as file_to_read:
+        content = file_to_read.read()
+    if instrument is not None:
+        instrument.emit(READ, clock() - started, path=path, bytes=len(content), format=ac_parser)
+
+    def parse():
+        started = clock()
+        result = load_content(content.decode('utf-8'), ac_parser)
+        if instrument is not None:
+            instrument.emit(PARSE, clock() - started, path=path, bytes=len(content),
+                            format=ac_parser)
+        return result
+
+    if disk_cache is None:
+        return parse()
+    return disk_cache.load(
+        content, parser_version(ac_parser), parse,
+        os.path.dirname(os.path.abspath(path))
+    )
+
+
+class FileParser(object):
+    """
+    绑定了磁盘缓存和埋点的 load_file，作为文件缓存的解析函数（缓存键）使用。
+
+    磁盘缓存和埋点对象（StatsSink 持有锁）无法 pickle，不能直接交给进程池；
+    load_many 在当前进程中读取文件、查询和写入磁盘缓存并记录埋点，子进程只负责解析内容。
+
+    Args:
+        disk_cache: 可选的 DiskCache
+        instrument: 可选的 Instrumentation
+    """
+    __slots__ = ('disk_cache', 'instrument')
+
+    def __init__(self, disk_cache=None, instrument=None):
+        self.disk_cache = disk_cache
+        self.instrument = instrument
+
+    def __call__(self, path):
+        return load_file(path, self.disk_cache, self.instrument)
+
+    def load_many(self, paths, pool):
+        """
+        在进程池 pool 中解析多个文件。
+
+        Returns:
+            与 paths 顺序一致的解析结果列表
+        """
+        disk_cache = self.disk_cache
+        instrument = self.instrument
+        results = [None] * len(paths)
+        pending = []
+        for index, path in enumerate(paths):
+            ac_parser = parser_type(path)
+            started = clock()
+            with open(path, "rb") as file_to_read:
+                content = file_to_read.read()
+            if instrument is not None:
+                instrument.emit(READ, clock() - started, path=path, bytes=len(content), format=ac_parser)
+            key = directory = None
+            if disk_cache is not None:
+                key = disk_cache.key(content, parser_version(ac_parser))
+                directory = os.path.dirname(os.path.abspath(path))
+                hit, value = disk_cache.lookup(key, directory)
+                if hit:
+                    results[index] = value
+                    continue
+            future = pool.submit(_parse_in_process, content, ac_parser, _fast_path)
+            pending.append((index, path, ac_parser, len(content), key, directory, future))
+        for index, path, ac_parser, size, key, directory, future in pending:
+            result, seconds = future.result()
+            if instrument is not None:
+                instrument.emit(PARSE, seconds, path=path, bytes=size, format=ac_parser)
+            if disk_cache is not None:
+                disk_cache.put(key, result, directory)
+            results[index] = result
+        return results
+
+
+def _parse_in_process(content, ac_parser, fast_path):
+    # 在子进程中运行，按父进程的设置选择解析方式，返回 (解析结果, 耗时)
+    use_fast_path(fast_path)
+    started = clock()
+    result = load_content(content.decode('utf-8'), ac_parser)
+    return result, clock() - started
+
+
+def load_content(content, ac_parser):
+    """解析字符串内容"""
+    loader = fast_loader(ac_parser)
+    if loader is not None:
+        return loader(content)
+    return get_anyconfig().loads(content, ac_parser=ac_parser, **parser_options(ac_parser))
+
+
+def dumper_options(ac_parser):
+    """返回序列化时传给 anyconfig 的额外参数，YAML 优先使用 CSafeDumper"""
+    if ac_parser == "yaml":
+        try:
+            import yaml
+        except ImportError:
+            return {}
+        dumper = getattr(yaml, 'CSafeDumper', None) if getattr(yaml, '__with_libyaml__', False) else None
+        return {'Dumper': dumper or yaml.SafeDumper, 'allow_unicode': True,
+                'default_flow_style': False}
+    return {}
+
+
+def dump_content(data, ac_parser):
+    """
+    把普通字典序列化为字符串。
+
+    JSON 在安装了 orjson 时使用 orjson，否则使用标准库 json；其余格式交给 anyconfig。
+    orjson 无法序列化的数据（如超过 64 位的整数）回退到标准库 json，与未安装 orjson 时一致。
+    """
+    if ac_parser == "json":
+        # orjson 是可选依赖，安装后用于加速大 JSON 的序列化
+        try:
+            import orjson
+        except ImportError:
+            orjson = None
+        if orjson is not None:
+            try:
+                # 与标准库 json 一样把 int / float / bool / None 键转为字符串
+                return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+            except TypeError:
+                pass
+        return json.dumps(data, indent=2, ensure_ascii=False)
+    return get_anyconfig().dumps(data, ac_parser=ac_parser, **dumper_options(ac_parser))
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/18-04:10
+# @Author  : 灯下客
+# @Email   :
+# @File    : profiles.py
+# @Software: PyCharm
+from collections.abc import Mapping
+
+from easy_config_py import tracking
+
+
+def _sections(value):
+    if not value:
+        return ()
+    if isinstance(value, str):
+        return (value,)
+    return tuple(value)
+
+
+def _find(data, path):
+    # 读取时不触发 Dict 的 __missing__，不存在的配置段返回 None
+    current = data
+    for key in path.split('.'):
+        if not isinstance(current, dict) or key not in current:
+            return None
+        current = current[key]
+    return current if isinstance(current, dict) else None
+
+
+class Profiles(object):
+    """
+    剖面（profile）定义及其合并视图的缓存。
+
+    每个剖面是若干配置段的有序列表，越靠后优先级越高，基础段（如 default）总是排在最前面。
+    合并视图在第一次读取时构建一次并缓存；缓存按各配置段的版本号（tracking.version_of）校验，
+    只有组成该剖面的某个配置段被修改、替换、删除或新增时才重新合并，其他剖面的视图不受影响。
+
+    Args:
+        profiles: 剖面名称列表（每个名称对应同名的顶层配置段），
+            或 {名称: 配置段路径列表}，路径用点号分隔，如 {'prod-eu': ['prod', 'regions.eu']}
+        base: 所有剖面共同的基础配置段（路径或路径列表），None 表示没有
+
+    示例:
+        >>> profiles = Profiles(['dev', 'staging', 'prod'], base='default')
+        >>> profiles.sections('prod')   # ('default', 'prod')
+    """
+
+    def __init__(self, profiles, base='default'):
+        base = _sections(base)
+        if isinstance(profiles, Mapping):
+            chains = {name: _sections(sections) for name, sections in profiles.items()}
+        else:
+            chains = {name: (name,) for name in profiles}
+        self.base = base
+        self._chains = {name: base + tuple(path for path in chain if path not in base)
+                        for name, chain in chains.items()}
+        # 剖面名称 -> (配置段版本号签名, 合并视图)
+        self._views = {}
+        self.hits = 0
+        self.builds = 0
+
+    @property
+    def names(self):
+        """剖面名称列表"""
+        return list(self._chains)
+
+    def __contains__(self, name):
+        return name in self._chains
+
+    def sections(self, name):
+        """剖面 name 依次合并的配置段路径"""
+        try:
+            return self._chains[name]
+        except KeyError:
+            raise KeyError("Unknown profile '{}', expected one of {}".format(name, self.names)) from None
+
+    def _resolve(self, data, name):
+        nodes = [_find(data, path) for path in self.sections(name)]
+        signature = []
+        for node in nodes:
+            if node is None:
+                signature.append(None)
+                continue
+            version = tracking.version_of(node)
+            if not version:
+                # 未被跟踪的节点无法判断是否变化，不缓存
+                return nodes, None
+            signature.append(version)
+        return nodes, tuple(signature)
+
+    def cached(self, data, name):
+        """返回仍然有效的缓存视图，没有时返回 None"""
+        entry = self._views.get(name)
+        if entry is None:
+            self.sections(name)
+            return None
+        _, signature = self._resolve(data, name)
+        if signature is None or entry[0] != signature:
+            return None
+        self.hits += 1
+        return entry[1]
+
+    def build(self, data, name, build):
+        """
+        返回剖面 name 的合并视图，缓存失效时调用 build(配置段列表, 上一次的视图) 重新构建。
+
+        调用方负责加锁，保证构建期间 data 不被修改。
+        """
+        nodes, signature = self._resolve(data, name)
+        entry = self._views.get(name)
+        if entry is not None and signature is not None and entry[0] == signature:
+            self.hits += 1
+            return entry[1]
+        view = build([node for node in nodes if node is not None],
+                     entry[1] if entry is not None else None)
+        self._views[name] = (signature, view)
+        self.builds += 1
+        return view
+
+    def clear(self):
+        self._views.clear()
+
+    def stats(self):
+        return {
+            'profiles': len(self._chains),
+            'cached': len(self._views),
+            'hits': self.hits,
+            'builds': self.builds,
+        }
@@ -0,0 +1,363 @@
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/18-03:30
+# @Author  : 灯下客
+# @Email   :
+# @File    : query.py
+# @Software: PyCharm
+import operator
+import re
+from functools import lru_cache
+
+_MISSING = object()
+
+
+class _Key(object):
+    """按键（或列表下标）取一个子节点"""
+    __slots__ = ('key', 'index')
+
+    def __init__(self, key, index=None):
+        self.key = key
+        self.index = index
+
+    def children(self, node):
+        if isinstance(node, dict):
+            if self.key in node:
+                yield self.key, node[self.key]
+            elif self.index is not None and self.index in node:
+                yield self.index, node[self.index]
+        elif isinstance(node, (list, tuple)) and self.index is not None:
+            index = self.index
+            if -len(node) <= index < len(node):
+                yield index % len(node), node[index]
+
+
+class _Slice(object):
+    __slots__ = ('slice',)
+
+    def __init__(self, value):
+        self.slice = value
+
+    def children(self, node):
+        if isinstance(node, (list, tuple)):
+            for index in range(*self.slice.indices(len(node))):
+                yield index, node[index]
+
+
+class _Wildcard(object):
+    """所有子节点：字典的值或列表的元素"""
+    __slots__ = ()
+
+    def children(self, node):
+        return _all_children(node)
+
+
+class _Filter(object):
+    """满足条件的子节点"""
+    __slots__ = ('keys', 'op', 'value')
+
+    def __init__(self, keys, op, value):
+        self.keys = keys
+        self.op = op
+        self.value = value
+
+    def test(self, item):
+        current = item
+        for key in self.keys:
+            if not isinstance(current, dict) or key not in current:
+                return False
+            current = current[key]
+        if self.op is None:
+            return bool(current)
+        try:
+            return self.op(current, self.value)
+        except TypeError:
+            return False
+
+    def children(self, node):
+        for key, item in _all_children(node):
+            if self.test(item):
+                yield key, item
+
+
+class _Descend(object):
+    """递归下降：匹配当前节点及任意深度的子孙节点"""
+    __slots__ = ()
+
+
+_WILDCARD = _Wildcard()
+_DESCEND = _Descend()
+
+
+def _all_children(node):
+    if isinstance(node, dict):
+        return ((key, node[key]) for key in list(dict.keys(node)))
+    if isinstance(node, (list, tuple)):
+        return enumerate(node)
+    return ()
+
+
+_OPERATORS = {
+    '==': operator.eq, '!=': operator.ne,
+    '<=': operator.le, '>=': operator.ge,
+    '<': operator.lt, '>': operator.gt,
+}
+_FILTER = re.compile(r'^\s*([^\s=!<>]+)\s*(?:(==|!=|<=|>=|<|>)\s*(.+?))?\s*$')
+_SLICE = re.compile(r'^\s*(-?\d*)\s*:\s*(-?\d*)\s*(?::\s*(-?\d*)\s*)?$')
+
+
+def _literal(text):
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in '\'"':
+        return text[1:-1]
+    lowered = text.lower()
+    if lowered == 'true':
+        return True
+    if lowered == 'false':
+        return False
+    if lowered in ('null', 'none'):
+        return None
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return text
+
+
+def _name_step(name):
+    if name == '*':
+        return _WILDCARD
+    if name == '**':
+        return _DESCEND
+    try:
+        return _Key(name, int(name))
+    except ValueError:
+        return _Key(name)
+
+
+def _bracket_step(text, selector):
+    text = text.strip()
+    if text == '*':
+        return _WILDCARD
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in '\'"':
+        return _Key(text[1:-1])
+    if text.startswith('?'):
+        match = _FILTER.match(text[1:])
+        if match is None:
+            raise ValueError("Invalid filter '[{}]' in selector '{}'".format(text, selector))
+        path, op, value = match.groups()
+        return _Filter(tuple(path.split('.')), _OPERATORS.get(op), _literal(value) if op else None)
+    match = _SLICE.match(text)
+    if match is not None:
+        start, stop, step = (int(part) if part else None for part in match.groups())
+        return _Slice(slice(start, stop, step))
+    try:
+        return _Key(int(text), int(text))
+    except ValueError:
+        raise ValueError("Invalid index '[{}]' in selector '{}'".format(text, selector)) from None
+
+
+def _parse(selector):
+    steps = []
+    position = 0
+    size = len(selector)
+    expect_name = True
+    while position < size:
+        char = selector[position]
+        if char == '[':
+            end = _closing_bracket(selector, position)
+            steps.append(_bracket_step(selector[position + 1:end], selector))
+            position = end + 1
+            expect_name = False
+        elif char == '.':
+            position += 1
+            expect_name = True
+        else:
+            if not expect_name:
+                raise ValueError("Expected '.' or '[' at position {} in selector '{}'".format(position, selector))
+            end = position
+            while end < size and selector[end] not in '.[':
+                if selector[end] == ']':
+                    raise ValueError("Unexpected ']' at position {} in selector '{}'".format(end, selector))
+                end += 1
+            steps.append(_name_step(selector[position:end]))
+            position = end
+            expect_name = False
+    return tuple(steps)
+
+
+def _closing_bracket(selector, start):
+    quote = None
+    for position in range(start + 1, len(selector)):
+        char = selector[position]
+        if quote is not None:
+            if char == quote:
+                quote = None
+        elif char in '\'"':
+            quote = char
+        elif char == ']':
+            return position
+    raise ValueError("Unclosed '[' in selector '{}'".format(selector))
+
+
+class Query(object):
+    """
+    编译后的选择器，可以在多个配置上重复使用，结果按文档顺序惰性产出。
+
+    语法（点号分隔，与 getattr 的路径兼容）：
+
+    - ``database.host``：按键逐层查找；数字段同时可以作为列表下标，如 ``services.0.port``
+    - ``services[0]`` / ``services[-1]`` / ``services[1:3]``：下标和切片
+    - ``services.*.port`` 或 ``services[*].port``：通配所有子节点（字典的值或列表的元素）
+    - ``**.port``：递归下降，任意深度的 port
+    - ``services[?enabled]`` / ``services[?port >= 8000]`` / ``services[?meta.name == "api"]``：过滤
+    - ``["key.with.dots"]``：包含特殊字符的键名
+
+    读取不会创建子节点（不触发 Dict 的 __missing__）。
+
+    示例:
+        >>> ports = Query('services[?enabled].port')
+        >>> list(ports.iter(config.data))
+        >>> ports.first(config.data, 80)
+    """
+    __slots__ = ('selector', 'steps')
+
+    def __init__(self, selector):
+        self.selector = selector
+        self.steps = _parse(selector)
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, self.selector)
+
+    def iter(self, root):
+        """按文档顺序产出匹配的值"""
+        for _, value in self.iter_paths(root):
+            yield value
+
+    def iter_paths(self, root):
+        """按文档顺序产出 (路径元组, 值)"""
+        programs = (self.steps,)
+        for _, path, value in _walk(root, (), _closure(((0, 0),), programs), _Closures(programs)):
+            yield path, value
+
+    def all(self, root):
+        return list(self.iter(root))
+
+    def first(self, root, default=None):
+        for value in self.iter(root):
+            return value
+        return default
+
+
+@lru_cache(maxsize=512)
+def compile_query(selector):
+    """编译选择器，相同的选择器只编译一次"""
+    if isinstance(selector, Query):
+        return selector
+    return Query(selector)
+
+
+def select_many(root, selectors):
+    """
+    在一次遍历中同时求值多个选择器。
+
+    所有选择器共享同一次深度优先遍历，只进入至少有一个选择器可能匹配的子树，
+    适合在包含大量条目的配置上一次取出多组值。
+
+    Returns:
+        {选择器: 匹配值的列表}，每个列表按文档顺序排列
+
+    示例:
+        >>> result = select_many(config.data, ['services.*.port', 'services.*.name', 'database.host'])
+        >>> result['services.*.port']
+    """
+    queries = [compile_query(selector) for selector in selectors]
+    programs = tuple(query.steps for query in queries)
+    results = [[] for _ in queries]
+    start = _closure(tuple((index, 0) for index in range(len(queries))), programs)
+    for index, _, value in _walk(root, (), start, _Closures(programs)):
+        results[index].append(value)
+    return {query.selector: result for query, result in zip(queries, results)}
+
+
+def _closure(states, programs):
+    # 递归下降可以匹配零层：同时进入下一步；没有递归下降时原样返回
+    for index, step in states:
+        steps = programs[index]
+        if step < len(steps) and steps[step] is _DESCEND:
+            break
+    else:
+        return states
+    result = []
+    seen = set()
+    pending = list(states)
+    while pending:
+        state = pending.pop(0)
+        if state in seen:
+            continue
+        seen.add(state)
+        result.append(state)
+        index, step = state
+        steps = programs[index]
+        if step < len(steps) and steps[step] is _DESCEND:
+            pending.append((index, step + 1))
+    return tuple(result)
+
+
+class _Closures(dict):
+    """一次遍历中状态集合的闭包缓存：相同的状态集合会在大量节点上重复出现"""
+    __slots__ = ('programs',)
+
+    def __init__(self, programs):
+        super(_Closures, self).__init__()
+        self.programs = programs
+
+    def __missing__(self, states):
+        result = self[states] = _closure(states, self.programs)
+        return result
+
+
+def _walk(node, path, states, closures):
+    # states: 在当前节点上活跃的 (选择器序号, 步骤序号)
+    programs = closures.programs
+    moving = []
+    for index, step in states:
+        steps = programs[index]
+        if step == len(steps):
+            yield index, path, node
+        else:
+            moving.append((index, step, steps[step]))
+    if not moving or not isinstance(node, (dict, list, tuple)):
+        return
+    if all(type(matcher) is _Key for _, _, matcher in moving):
+        # 只有具体的键 / 下标：直接查找，不遍历全部子节点
+        targets = {}
+        order = []
+        for index, step, matcher in moving:
+            for key, child in matcher.children(node):
+                if key not in targets:
+                    targets[key] = (child, [])
+                    order.append(key)
+                targets[key][1].append((index, step + 1))
+        for key in order:
+            child, next_states = targets[key]
+            yield from _walk(child, path + (key,), closures[tuple(next_states)], closures)
+        return
+    # 每个步骤在当前节点上的匹配条件只计算一次
+    plan = []
+    for index, step, matcher in moving:
+        if matcher is _DESCEND:
+            plan.append((None, (index, step)))
+        elif matcher is _WILDCARD:
+            plan.append((None, (index, step + 1)))
+        elif type(matcher) is _Filter:
+            plan.append((matcher, (index, step + 1)))
+        else:
+            plan.append((frozenset(key for key, _ in matcher.children(node)), (index, step + 1)))
+    for key, child in _all_children(node):
+        next_states = tuple(
+            state for condition, state in plan
+            if condition is None or (
+                key in condition if type(condition) is frozenset else condition.test(child))
+        )
+        if next_states:
+            yield from _walk(child, path + (key,), closures[next_states], closures)
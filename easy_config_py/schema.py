@@ -0,0 +1,432 @@
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/17-22:50
+# @Author  : 灯下客
+# @Email   :
+# @File    : schema.py
+# @Software: PyCharm
+import copy
+
+from easy_config_py.env import _TRUE, _FALSE
+from easy_config_py.merge import DELETE
+
+_MISSING = object()
+
+
+class ValidationError(ValueError):
+    """
+    配置不符合 schema。
+
+    Attributes:
+        errors: (点号路径, 错误信息) 列表，包含本次校验发现的全部错误
+    """
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        lines = ['{}: {}'.format(path or '<root>', message) for path, message in self.errors]
+        super(ValidationError, self).__init__(
+            '{} validation error(s):\n  {}'.format(len(lines), '\n  '.join(lines))
+        )
+
+
+class Field(object):
+    """
+    schema 中的字段声明。
+
+    Args:
+        type: 字段类型，可以是任何 schema 规格，None 表示任意类型
+        default: 默认值，缺失时填入（不校验默认值本身）
+        required: 是否必须存在，默认在没有默认值时为 True
+        validator: 额外校验 validator(value)，返回 False 或抛出 ValueError 表示不合法
+        choices: 允许的取值
+
+    示例:
+        >>> {'port': Field(int, default=5432, validator=lambda p: 0 < p < 65536)}
+    """
+
+    def __init__(self, type=None, default=_MISSING, required=None, validator=None, choices=None):
+        self.type = type
+        self.default = default
+        self.required = default is _MISSING if required is None else required
+        self.validator = validator
+        self.choices = choices
+
+
+class _Node(object):
+    """编译后的校验节点，check 返回转换后的值，错误追加到 errors"""
+
+    def check(self, value, path, errors, current=_MISSING, partial=False):
+        raise NotImplementedError
+
+    def child(self, key):
+        return _ANY
+
+    def field(self, key):
+        """key 对应的 (node, required, default)，不是声明的字段时返回 None"""
+        return None
+
+
+class _AnyNode(_Node):
+
+    def check(self, value, path, errors, current=_MISSING, partial=False):
+        return value
+
+
+_ANY = _AnyNode()
+
+
+class _ScalarNode(_Node):
+
+    def __init__(self, type_):
+        self.type = type_
+
+    def check(self, value, path, errors, current=_MISSING, partial=False):
+        type_ = self.type
+        if isinstance(value, type_) and not (isinstance(value, bool) and type_ is not bool):
+            return value
+        try:
+            if isinstance(value, str):
+                if type_ is bool:
+                    lowered = value.strip().lower()
+                    if lowered in _TRUE:
+                        return True
+                    if lowered in _FALSE:
+                        return False
+                elif type_ in (int, float):
+                    return type_(value)
+            elif type_ is float and isinstance(value, int) and not isinstance(value, bool):
+                return float(value)
+            elif type_ is str and isinstance(value, (int, float)) and not isinstance(value, bool):
+                return str(value)
+        except ValueError:
+            pass
+        errors.append((_format(path), 'expected {}, got {} {!r}'.format(
+            type_.__name__, type(value).__name__, value)))
+        return value
+
+
+class _FieldNode(_Node):
+
+    def __init__(self, field, extra=True):
+        self.node = compile_schema(field.type, extra)
+        self.validator = field.validator
+        self.choices = field.choices
+
+    def check(self, value, path, errors, current=_MISSING, partial=False):
+        count = len(errors)
+        value = self.node.check(value, path, errors, current, partial)
+        if len(errors) != count:
+            return value
+        if self.choices is not None and value not in self.choices:
+            errors.append((_format(path), 'expected one of {!r}, got {!r}'.format(
+                list(self.choices), value)))
+        elif self.validator is not None:
+            try:
+                valid = self.validator(value)
+            except ValueError as e:
+                errors.append((_format(path), str(e)))
+            else:
+                if valid is False:
+                    errors.append((_format(path), 'invalid value {!r}'.format(value)))
+        return value
+
+    def child(self, key):
+        return self.node.child(key)
+
+    def field(self, key):
+        return self.node.field(key)
+
+
+class _OptionalNode(_Node):
+
+    def __init__(self, node):
+        self.node = node
+
+    def check(self, value, path, errors, current=_MISSING, partial=False):
+        if value is None:
+            return None
+        return self.node.check(value, path, errors, current, partial)
+
+    def child(self, key):
+        return self.node.child(key)
+
+    def field(self, key):
+        return self.node.field(key)
+
+
+class _UnionNode(_Node):
+
+    def __init__(self, nodes):
+        self.nodes = nodes
+
+    def check(self, value, path, errors, current=_MISSING, partial=False):
+        # 先找类型完全匹配的分支，避免 Union[int, str] 把 '1' 转成 1
+        for node in self.nodes:
+            if isinstance(node, _ScalarNode) and isinstance(value, node.type):
+                return value
+        for node in self.nodes:
+            attempt = []
+            result = node.check(value, path, attempt, current, partial)
+            if not attempt:
+                return result
+        errors.append((_format(path), 'value {!r} does not match any of the allowed types'.format(value)))
+        return value
+
+
+class _ListNode(_Node):
+
+    def __init__(self, item):
+        self.item = item
+
+    def check(self, value, path, errors, current=_MISSING, partial=False):
+        if not isinstance(value, (list, tuple)):
+            errors.append((_format(path), 'expected list, got {} {!r}'.format(type(value).__name__, value)))
+            return value
+        return type(value)(self.item.check(item, path + (index,), errors)
+                           for index, item in enumerate(value))
+
+
+class _MappingNode(_Node):
+
+    def __init__(self, fields=None, values=None, extra=True):
+        # fields: key -> (node, required, default)
+        self.fields = fields or {}
+        self.values = values
+        self.extra = extra
+
+    def child(self, key):
+        field = self.fields.get(key)
+        if field is not None:
+            return field[0]
+        return self.values or _ANY
+
+    def field(self, key):
+        return self.fields.get(key)
+
+    def check(self, value, path, errors, current=_MISSING, partial=False):
+        if not isinstance(value, dict):
+            errors.append((_format(path), 'expected mapping, got {} {!r}'.format(type(value).__name__, value)))
+            return value
+        has_current = isinstance(current, dict)
+        result = {}
+        for key, item in value.items():
+            field = self.fields.get(key)
+            if item is DELETE:
+                # 合并时的删除标记：删除必须且没有默认值的键是错误
+                if field is not None and field[1] and field[2] is _MISSING:
+                    errors.append((_format(path + (key,)), 'cannot delete required key'))
+                result[key] = item
+                continue
+            if field is not None:
+                node = field[0]
+            elif self.values is not None:
+                node = self.values
+            elif self.extra:
+                result[key] = item
+                continue
+            else:
+                errors.append((_format(path + (key,)), 'unexpected key'))
+                continue
+            child_current = current[key] if has_current and key in current else _MISSING
+            result[key] = node.check(item, path + (key,), errors, child_current, partial)
+        # 部分更新时缺失且没有默认值的键可能由之后的来源提供，完整性交给 validate 检查；
+        # 当前配置和传入内容中都没有的键仍然填入默认值
+        for key, (node, required, default) in self.fields.items():
+            if key in value or (has_current and key in current):
+                continue
+            if default is not _MISSING:
+                result[key] = copy.deepcopy(default)
+            elif required and not partial:
+                errors.append((_format(path + (key,)), 'missing required key'))
+        return result
+
+
+def _format(path):
+    return '.'.join(str(key) for key in path)
+
+
+def _mapping(hints, defaults, required_keys, extra):
+    fields = {}
+    for key, spec in hints.items():
+        if isinstance(spec, Field):
+            node = _FieldNode(spec, extra)
+            fields[key] = (node, spec.required, spec.default)
+        else:
+            node = compile_schema(spec, extra)
+            default = defaults.get(key, _MISSING)
+            # Optional[...] 的字段可以缺失
+            required = key in required_keys and default is _MISSING and not isinstance(node, _OptionalNode)
+            fields[key] = (node, required, default)
+    return _MappingNode(fields, extra=extra)
+
+
+def compile_schema(spec, extra=True):
+    """
+    把 schema 规格编译为校验节点树，只在创建 Schema 时执行一次。
+
+    支持的规格：
+        - 类型：str、int、float、bool、list、dict、typing.Any
+        - dict：{键: 规格}，嵌套字典表示嵌套配置
+        - [规格]：元素满足规格的列表
+        - Field(...)：带默认值、是否必须、取值范围和自定义校验
+        - typing：Optional[X]、Union[X, Y]、List[X]、Dict[str, X]
+        - dataclass、TypedDict：按字段注解编译，dataclass 的默认值作为默认值
+    """
+    # typing 导入较慢，只在编译 schema 时导入
+    import typing
+    if isinstance(spec, _Node):
+        return spec
+    if isinstance(spec, Schema):
+        return spec.root
+    if spec is typing.Any or spec is object or spec is None:
+        return _ANY
+    if isinstance(spec, Field):
+        return _FieldNode(spec, extra)
+    if isinstance(spec, dict):
+        return _mapping(spec, {}, set(spec), extra)
+    if isinstance(spec, list):
+        if len(spec) != 1:
+            raise TypeError("List schema must contain exactly one item spec, e.g. [int]")
+        return _ListNode(compile_schema(spec[0], extra))
+    origin = getattr(spec, '__origin__', None)
+    if origin is not None:
+        args = [arg for arg in getattr(spec, '__args__', ()) if not isinstance(arg, typing.TypeVar)]
+        if origin is typing.Union:
+            nodes = [compile_schema(arg, extra) for arg in args if arg is not type(None)]
+            node = nodes[0] if len(nodes) == 1 else _UnionNode(nodes)
+            return _OptionalNode(node) if type(None) in args else node
+        if origin in (list, tuple, typing.List):
+            return _ListNode(compile_schema(args[0], extra) if args else _ANY)
+        if origin in (dict, typing.Dict):
+            return _MappingNode(values=compile_schema(args[1], extra) if len(args) == 2 else _ANY)
+        raise TypeError("Unsupported schema type: {!r}".format(spec))
+    if hasattr(spec, '__dataclass_fields__'):
+        import dataclasses
+        hints = typing.get_type_hints(spec)
+        defaults = {}
+        for field in dataclasses.fields(spec):
+            if field.default is not dataclasses.MISSING:
+                defaults[field.name] = field.default
+            elif field.default_factory is not dataclasses.MISSING:
+                defaults[field.name] = field.default_factory()
+        return _mapping({f.name: hints[f.name] for f in dataclasses.fields(spec)},
+                        defaults, set(hints), extra)
+    if isinstance(spec, type) and issubclass(spec, dict) and hasattr(spec, '__total__'):
+        hints = typing.get_type_hints(spec)
+        required_keys = getattr(spec, '__required_keys__', set(hints) if spec.__total__ else set())
+        return _mapping(hints, {}, required_keys, extra)
+    if spec is list:
+        return _ListNode(_ANY)
+    if spec is dict:
+        return _MappingNode()
+    if isinstance(spec, type):
+        return _ScalarNode(spec)
+    raise TypeError("Unsupported schema type: {!r}".format(spec))
+
+
+class Schema(object):
+    """
+    编译后的配置 schema。
+
+    规格只编译一次，得到校验/转换函数树；Dict.update 合并时只校验传入的部分，
+    setattr 只校验写入的路径，reload 只校验发生变化的子树。
+    类型不符时尽量转换（'5432' -> 5432、'true' -> True），无法转换的收集为错误，
+    一次性以 ValidationError 抛出，每条错误带点号路径。
+
+    Args:
+        spec: schema 规格，参见 compile_schema
+        extra: 是否允许 schema 中没有声明的键
+
+    示例:
+        >>> schema = Schema({'database': {'host': str, 'port': Field(int, default=5432)},
+        ...                  'debug': Field(bool, default=False)})
+        >>> schema.validate({'database': {'host': 'db', 'port': '5433'}})
+        {'database': {'host': 'db', 'port': 5433}, 'debug': False}
+    """
+
+    def __init__(self, spec, extra=True):
+        self.spec = spec
+        self.root = compile_schema(spec, extra)
+
+    def validate(self, data):
+        """
+        完整校验，填入默认值并检查必须的键。
+
+        Returns:
+            转换后的普通字典
+
+        Raises:
+            ValidationError: 包含全部错误
+        """
+        errors = []
+        result = self.root.check(data, (), errors)
+        if errors:
+            raise ValidationError(errors)
+        return result
+
+    def coerce(self, data):
+        """校验并转换 data，填入默认值，但不检查必须的键（data 可能还不完整）"""
+        errors = []
+        result = self.root.check(data, (), errors, partial=True)
+        if errors:
+            raise ValidationError(errors)
+        return result
+
+    def check_update(self, current, incoming):
+        """校验合并进 current 的 incoming，只遍历 incoming，返回转换后的 incoming"""
+        errors = []
+        result = self.root.check(incoming, (), errors, current, partial=True)
+        if errors:
+            raise ValidationError(errors)
+        return result
+
+    def check_value(self, keys, value):
+        """校验写入 keys 路径（整体替换原有值）的值，返回转换后的值"""
+        node = self.root
+        for key in keys:
+            node = node.child(key)
+        errors = []
+        result = node.check(value, tuple(keys), errors)
+        if errors:
+            raise ValidationError(errors)
+        return result
+
+    def check_patch(self, patch, current=None):
+        """
+        校验 changes_since / diff 产生的修改，只检查被修改的子树。
+
+        写入的子树做完整校验；删除必须的键时报错，有默认值的改为写入默认值；
+        转换后与 current 中已有值相同的修改会被丢弃。
+
+        Returns:
+            转换后的修改列表
+        """
+        from easy_config_py.tracking import Change, SET_OPS
+        errors = []
+        result = []
+        for op, path, value in patch:
+            path = tuple(path)
+            parent = self.root
+            for key in path[:-1]:
+                parent = parent.child(key)
+            field = parent.field(path[-1])
+            if op in SET_OPS:
+                value = parent.child(path[-1]).check(value, path, errors)
+            elif field is not None and field[2] is not _MISSING:
+                op, value = 'set', copy.deepcopy(field[2])
+            elif field is not None and field[1]:
+                errors.append((_format(path), 'missing required key'))
+                continue
+            if op in SET_OPS and current is not None and _lookup(current, path) == value:
+                continue
+            result.append(Change(op, path, value))
+        if errors:
+            raise ValidationError(errors)
+        return result
+
+
+def _lookup(node, path):
+    for key in path:
+        if not isinstance(node, dict) or key not in node:
+            return _MISSING
+        node = node[key]
+    return node
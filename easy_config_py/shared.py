@@ -0,0 +1,410 @@
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/18-00:10
+# @Author  : 灯下客
+# @Email   :
+# @File    : shared.py
+# @Software: PyCharm
+import mmap
+import os
+import pickle
+import struct
+import threading
+from collections.abc import Mapping, Sequence
+
+from easy_config_py.file_loader import _atomic_write
+
+MAGIC = b'ECSM'
+FORMAT_VERSION = 1
+
+# 文件头：魔数、格式版本、保留、代数、根节点偏移、总长度
+_HEADER = struct.Struct('<4sHHQQQ')
+_U32 = struct.Struct('<I')
+_I64 = struct.Struct('<q')
+_F64 = struct.Struct('<d')
+# 映射条目：键偏移、键长度、值偏移
+_ENTRY = struct.Struct('<III')
+
+_MISSING = object()
+
+
+def default_directory():
+    """共享快照文件的默认目录：有 /dev/shm（tmpfs）时放在内存中，否则使用临时目录"""
+    if os.path.isdir('/dev/shm'):
+        return '/dev/shm'
+    import tempfile
+    return tempfile.gettempdir()
+
+
+def create_path(directory=None):
+    """
+    在 directory（默认 default_directory()）下新建只有当前用户可以访问的私有目录（0700），
+    并在其中用 mkstemp 创建快照文件（0600），返回文件路径。
+
+    文件名不可预测，其他用户无法抢先创建或替换快照文件；fork 出来的 worker 与主进程是同一个用户，可以正常读取。
+    """
+    import tempfile
+    private = tempfile.mkdtemp(prefix='easy_config-', dir=directory or default_directory())
+    fd, path = tempfile.mkstemp(suffix='.ecsm', dir=private)
+    os.close(fd)
+    return path
+
+
+def remove_path(path):
+    """删除 create_path() 创建的快照文件及其私有目录；已经映射的进程不受影响"""
+    for remove, target in ((os.unlink, path), (os.rmdir, os.path.dirname(path))):
+        try:
+            remove(target)
+        except OSError:
+            pass
+
+
+def _pickle_error(kind):
+    return TypeError("Cannot share {} without allow_pickle=True (only str, int, float, bool, None, "
+                     "dict and list are stored natively)".format(kind))
+
+
+def _key_bytes(key, allow_pickle=True):
+    # 映射的键按编码后的字节排序，查找时用同样的编码二分查找
+    if isinstance(key, str):
+        return b's' + key.encode('utf-8')
+    if isinstance(key, int) and not isinstance(key, bool):
+        return b'i' + str(key).encode('ascii')
+    if not allow_pickle:
+        raise _pickle_error('key of type {}'.format(type(key).__name__))
+    return b'p' + pickle.dumps(key, pickle.HIGHEST_PROTOCOL)
+
+
+def _unpickle(payload, allow_pickle):
+    # 快照文件可能被其他进程写入，不信任时不执行 pickle.loads
+    if not allow_pickle:
+        raise ValueError("Shared snapshot contains pickled data, attach with allow_pickle=True to load it")
+    return pickle.loads(payload)
+
+
+def _decode_key(raw, allow_pickle=False):
+    tag, payload = raw[:1], raw[1:]
+    if tag == b's':
+        return payload.decode('utf-8')
+    if tag == b'i':
+        return int(payload)
+    return _unpickle(payload, allow_pickle)
+
+
+class _Encoder(object):
+    """把字典树编码为紧凑的二进制布局，子节点先写入，父节点记录子节点的偏移"""
+
+    def __init__(self, allow_pickle=False):
+        self.buffer = bytearray(_HEADER.size)
+        self.allow_pickle = allow_pickle
+
+    def write(self, value):
+        buffer = self.buffer
+        if isinstance(value, dict):
+            entries = sorted(
+                (_key_bytes(key, self.allow_pickle), self.write(item)) for key, item in dict.items(value)
+            )
+            keys = []
+            for raw, offset in entries:
+                keys.append((len(buffer), len(raw), offset))
+                buffer += raw
+            position = len(buffer)
+            buffer += b'M' + _U32.pack(len(keys))
+            for entry in keys:
+                buffer += _ENTRY.pack(*entry)
+            return position
+        if isinstance(value, (list, tuple)):
+            offsets = [self.write(item) for item in value]
+            position = len(buffer)
+            buffer += b'L' + _U32.pack(len(offsets))
+            for offset in offsets:
+                buffer += _U32.pack(offset)
+            return position
+        position = len(buffer)
+        if value is None:
+            buffer += b'N'
+        elif value is True:
+            buffer += b'T'
+        elif value is False:
+            buffer += b'F'
+        elif isinstance(value, int) and -2 ** 63 <= value < 2 ** 63:
+            buffer += b'I' + _I64.pack(value)
+        elif isinstance(value, float):
+            buffer += b'D' + _F64.pack(value)
+        elif isinstance(value, str):
+            raw = value.encode('utf-8')
+            buffer += b'S' + _U32.pack(len(raw)) + raw
+        elif self.allow_pickle:
+            raw = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            buffer += b'P' + _U32.pack(len(raw)) + raw
+        else:
+            raise _pickle_error('value of type {}'.format(type(value).__name__))
+        return position
+
+
+def encode(data, generation=1, allow_pickle=False):
+    """
+    把字典树编码为共享快照的二进制内容。
+
+    不会修改源节点（LazyDict 也不会被触发包装）。默认只接受基本类型（str、int、float、bool、None）
+    及其组成的字典和列表，其他类型的键或值抛出 TypeError；allow_pickle=True 时以 pickle 保存，
+    读取方也必须以 allow_pickle=True 映射。
+    """
+    encoder = _Encoder(allow_pickle)
+    root = encoder.write(data)
+    buffer = encoder.buffer
+    if len(buffer) >= 2 ** 32:
+        raise ValueError("Config is too large for a shared snapshot (limit 4 GiB)")
+    _HEADER.pack_into(buffer, 0, MAGIC, FORMAT_VERSION, 0, generation, root, len(buffer))
+    return bytes(buffer)
+
+
+def _decode(buffer, offset, allow_pickle=False):
+    tag = buffer[offset]
+    if tag == 0x4D:  # M
+        return SharedView(buffer, offset, allow_pickle)
+    if tag == 0x4C:  # L
+        return SharedList(buffer, offset, allow_pickle)
+    if tag == 0x53:  # S
+        size = _U32.unpack_from(buffer, offset + 1)[0]
+        return str(buffer[offset + 5:offset + 5 + size], 'utf-8')
+    if tag == 0x49:  # I
+        return _I64.unpack_from(buffer, offset + 1)[0]
+    if tag == 0x44:  # D
+        return _F64.unpack_from(buffer, offset + 1)[0]
+    if tag == 0x4E:  # N
+        return None
+    if tag == 0x54:  # T
+        return True
+    if tag == 0x46:  # F
+        return False
+    size = _U32.unpack_from(buffer, offset + 1)[0]
+    return _unpickle(buffer[offset + 5:offset + 5 + size], allow_pickle)
+
+
+def _thaw(value):
+    if isinstance(value, SharedView):
+        return value.to_dict()
+    if isinstance(value, SharedList):
+        return [_thaw(item) for item in value]
+    return value
+
+
+class SharedView(Mapping):
+    """
+    共享快照中一个映射节点的零拷贝只读视图。
+
+    访问接口与 Snapshot 相同：属性访问、下标访问、get、按点号路径的 getattr；
+    不存在的键抛出 AttributeError / KeyError 或返回默认值。值在访问时才从共享内存中解码，
+    键按编码后的字节排序，查找是二分查找。
+    """
+    __slots__ = ('_buffer', '_offset', '_count', '_allow_pickle')
+
+    def __init__(self, buffer, offset, allow_pickle=False):
+        self._buffer = buffer
+        self._offset = offset
+        self._count = _U32.unpack_from(buffer, offset + 1)[0]
+        self._allow_pickle = allow_pickle
+
+    def _entry(self, index):
+        return _ENTRY.unpack_from(self._buffer, self._offset + 5 + index * _ENTRY.size)
+
+    def _find(self, key):
+        try:
+            target = _key_bytes(key)
+        except Exception:
+            return None
+        buffer = self._buffer
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            key_offset, key_size, value_offset = self._entry(middle)
+            raw = bytes(buffer[key_offset:key_offset + key_size])
+            if raw == target:
+                return value_offset
+            if raw < target:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def __getitem__(self, key):
+        offset = self._find(key)
+        if offset is None:
+            raise KeyError(key)
+        return _decode(self._buffer, offset, self._allow_pickle)
+
+    def __getattr__(self, item):
+        if item.startswith('__'):
+            raise AttributeError(item)
+        offset = self._find(item)
+        if offset is None:
+            raise AttributeError(item)
+        return _decode(self._buffer, offset, self._allow_pickle)
+
+    def __contains__(self, key):
+        return self._find(key) is not None
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        buffer = self._buffer
+        for index in range(self._count):
+            key_offset, key_size, _ = self._entry(index)
+            yield _decode_key(bytes(buffer[key_offset:key_offset + key_size]), self._allow_pickle)
+
+    def items(self):
+        buffer = self._buffer
+        for index in range(self._count):
+            key_offset, key_size, value_offset = self._entry(index)
+            yield (_decode_key(bytes(buffer[key_offset:key_offset + key_size]), self._allow_pickle),
+                   _decode(buffer, value_offset, self._allow_pickle))
+
+    def getattr(self, key, default=None):
+        """按点号路径读取，路径不存在时返回 default"""
+        current = self
+        for k in key.split('.') if '.' in key else (key,):
+            if not isinstance(current, SharedView):
+                return default
+            offset = current._find(k)
+            if offset is None:
+                return default
+            current = _decode(current._buffer, offset, current._allow_pickle)
+        return current
+
+    def to_dict(self):
+        return {key: _thaw(value) for key, value in self.items()}
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, self.to_dict())
+
+
+class SharedList(Sequence):
+    """共享快照中列表节点的零拷贝只读视图，行为类似元组"""
+    __slots__ = ('_buffer', '_offset', '_count', '_allow_pickle')
+
+    def __init__(self, buffer, offset, allow_pickle=False):
+        self._buffer = buffer
+        self._offset = offset
+        self._count = _U32.unpack_from(buffer, offset + 1)[0]
+        self._allow_pickle = allow_pickle
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self[i] for i in range(*index.indices(self._count)))
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        offset = _U32.unpack_from(self._buffer, self._offset + 5 + index * _U32.size)[0]
+        return _decode(self._buffer, offset, self._allow_pickle)
+
+    def __eq__(self, other):
+        if isinstance(other, (SharedList, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, list(self))
+
+
+def read_header(buffer):
+    """返回 (格式版本, 代数, 根节点偏移, 总长度)，内容无效时抛出 ValueError"""
+    if len(buffer) < _HEADER.size:
+        raise ValueError("Shared snapshot is truncated")
+    magic, version, _, generation, root, size = _HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC or version != FORMAT_VERSION or size != len(buffer):
+        raise ValueError("Not a valid shared snapshot (format {})".format(version))
+    return version, generation, root, size
+
+
+def publish(data, path, allow_pickle=False):
+    """
+    把配置编码后原子发布到 path（临时文件 + fsync + rename），返回新的代数。
+
+    已经 attach 的进程继续持有旧文件的映射，调用 refresh() 后切换到新的一代；
+    同一时刻任何进程看到的都是某一代的完整内容。新文件沿用 path 原有的权限，
+    用 create_path() 创建的文件保持 0600。allow_pickle 参见 encode。
+    """
+    generation = 1
+    try:
+        with open(path, 'rb') as file_to_read:
+            header = file_to_read.read(_HEADER.size)
+        if len(header) == _HEADER.size:
+            magic, _, _, previous, _, _ = _HEADER.unpack(header)
+            if magic == MAGIC:
+                generation = previous + 1
+    except OSError:
+        pass
+    _atomic_write(path, encode(data, generation, allow_pickle), 'wb')
+    return generation
+
+
+class SharedSnapshot(object):
+    """
+    以只读方式映射共享快照文件，提供零拷贝的读取视图。
+
+    适合 gunicorn / multiprocessing 等 pre-fork 场景：主进程 publish 一次，
+    各个 worker attach 后直接读取映射的页面，不会因为引用计数变化而破坏写时复制的共享。
+    主进程发布新的一代后，worker 调用 refresh()（或 view(refresh=True)）切换。
+
+    要求文件系统支持在映射期间原子替换文件（POSIX）。
+
+    Args:
+        path: 快照文件路径
+        allow_pickle: 是否解码以 pickle 保存的键和值；默认遇到时抛出 ValueError，
+            只应在快照文件来自可信的进程时开启
+
+    示例:
+        >>> shared = SharedSnapshot('/dev/shm/app-config.ecsm')
+        >>> root = shared.view()
+        >>> root.database.host
+        >>> shared.refresh()   # 主进程 reload 后
+    """
+
+    def __init__(self, path, allow_pickle=False):
+        self.path = path
+        self.allow_pickle = allow_pickle
+        self._lock = threading.Lock()
+        self._inode = None
+        self._root = None
+        self._generation = 0
+        self.refresh()
+
+    @property
+    def generation(self):
+        return self._generation
+
+    def refresh(self):
+        """
+        检查是否发布了新的一代，有则重新映射。
+
+        Returns:
+            是否切换到了新的一代
+        """
+        st = os.stat(self.path)
+        inode = (st.st_dev, st.st_ino)
+        if inode == self._inode:
+            return False
+        with self._lock:
+            if inode == self._inode:
+                return False
+            with open(self.path, 'rb') as file_to_read:
+                st = os.fstat(file_to_read.fileno())
+                mapped = mmap.mmap(file_to_read.fileno(), 0, access=mmap.ACCESS_READ)
+            buffer = memoryview(mapped)
+            _, generation, root, _ = read_header(buffer)
+            # 旧的映射由仍在使用的视图持有，视图全部释放后自动回收
+            self._root = SharedView(buffer, root, self.allow_pickle)
+            self._generation = generation
+            self._inode = (st.st_dev, st.st_ino)
+        return True
+
+    def view(self, refresh=False):
+        """返回当前一代的根视图；refresh=True 时先检查是否有新的一代"""
+        if refresh:
+            self.refresh()
+        return self._root
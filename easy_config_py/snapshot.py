@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/17-23:30
+# @Author  : 灯下客
+# @Email   :
+# @File    : snapshot.py
+# @Software: PyCharm
+from easy_config_py import tracking
+
+_MISSING = object()
+
+
+class Snapshot(dict):
+    """
+    配置的不可变只读视图。
+
+    与 Dict 不同，读取不存在的键不会创建子节点：snap['x'] 抛出 KeyError，
+    snap.x 抛出 AttributeError，get / getattr 返回默认值；任何写入都抛出 TypeError。
+    嵌套字典是 Snapshot，列表转换为元组。
+
+    快照一旦发布就不再变化，多个线程可以不加锁地并发读取。
+
+    示例:
+        >>> snap = config.snapshot()
+        >>> snap.database.host
+        >>> snap.getattr('database.timeout', 30)
+    """
+    __slots__ = ('_source', '_version')
+
+    def __getattr__(self, item):
+        try:
+            return dict.__getitem__(self, item)
+        except KeyError:
+            raise AttributeError(item) from None
+
+    def getattr(self, key, default=None):
+        """按点号路径读取，路径不存在时返回 default"""
+        current = self
+        for k in key.split('.') if '.' in key else (key,):
+            if not isinstance(current, dict) or k not in current:
+                return default
+            current = dict.__getitem__(current, k)
+        return current
+
+    @property
+    def version(self):
+        """构建快照时源节点的版本号，参见 tracking.version_of"""
+        return self._version
+
+    def to_dict(self):
+        return {key: _thaw(value) for key, value in self.items()}
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("'Snapshot' object is read-only")
+
+    __setitem__ = __delitem__ = __setattr__ = __delattr__ = _readonly
+    update = setdefault = pop = popitem = clear = __ior__ = _readonly
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (build_snapshot, (self.to_dict(),))
+
+
+def _thaw(value):
+    if isinstance(value, Snapshot):
+        return value.to_dict()
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+def build_snapshot(node, previous=None):
+    """
+    从 Dict 树构建 Snapshot，不会修改源节点（LazyDict 也不会被触发包装）。
+
+    传入上一次的快照时共享未变化的子树：源节点是同一个对象且版本号
+    （tracking.version_of）没有变化的子树直接复用，代价与修改量成正比。
+    """
+    version = tracking.version_of(node)
+    if (previous is not None and previous._source is node
+            and previous._version == version):
+        return previous
+    snapshot = Snapshot()
+    for key, value in dict.items(node):
+        if isinstance(value, dict):
+            old = dict.get(previous, key) if previous is not None else None
+            value = build_snapshot(value, old if isinstance(old, Snapshot) else None)
+        elif isinstance(value, (list, tuple)):
+            value = _freeze_sequence(value)
+        dict.__setitem__(snapshot, key, value)
+    object.__setattr__(snapshot, '_source', node)
+    object.__setattr__(snapshot, '_version', version)
+    return snapshot
+
+
+def _freeze_sequence(value):
+    return tuple(
+        build_snapshot(item) if isinstance(item, dict) else
+        _freeze_sequence(item) if isinstance(item, (list, tuple)) else item
+        for item in value
+    )
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/17-19:50
+# @Author  : 灯下客
+# @Email   :
+# @File    : streaming.py
+# @Software: PyCharm
+import io
+import json
+
+from easy_config_py import parsers
+
+# ijson 是可选依赖，用于增量解析单个大 JSON 文档；第一次流式读取 JSON 时才探测
+_ijson = None
+
+JSON_LINES_TYPES = ('jsonl', 'ndjson')
+
+
+def _load_ijson():
+    """返回 ijson 模块，未安装时返回 None"""
+    global _ijson
+    if _ijson is None:
+        try:
+            import ijson
+        except ImportError:
+            ijson = False
+        _ijson = ijson
+    return _ijson or None
+
+
+def _yaml_loader():
+    import yaml
+    return parsers.parser_options('yaml').get('Loader', yaml.SafeLoader)
+
+
+def _first_char(stream):
+    """返回第一个非空白字符并把读取位置恢复到开头"""
+    position = stream.tell()
+    while True:
+        char = stream.read(1)
+        if not char or not char.isspace():
+            stream.seek(position)
+            return char.decode() if isinstance(char, bytes) else char
+
+
+def _iter_yaml(stream):
+    import yaml
+    for document in yaml.load_all(stream, Loader=_yaml_loader()):
+        if document is not None:
+            yield document
+
+
+def _iter_json_lines(stream):
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def _iter_json(stream, sections):
+    ijson = _load_ijson()
+    if ijson is None:
+        document = json.load(stream)
+        if isinstance(document, list):
+            for item in document:
+                yield item
+        else:
+            yield document
+        return
+    # 顶层为数组时逐个元素产出；顶层为对象且按段产出时逐个顶层键产出
+    first = _first_char(stream)
+    if first == '[':
+        for item in ijson.items(stream, 'item'):
+            yield item
+    elif first == '{' and sections:
+        for key, value in ijson.kvitems(stream, ''):
+            yield {key: value}
+    else:
+        yield json.load(stream)
+
+
+def iter_documents(source, parser_type=None, sections=False):
+    """
+    逐个产出配置文档（普通 dict），内存占用与单个文档（或单个顶层段）大小相关。
+
+    - YAML：按 ``---`` 分隔的多文档流逐个解析
+    - JSON Lines（.jsonl / .ndjson）：逐行解析
+    - JSON：顶层为数组时逐个元素产出；安装了 ijson 时增量解析，否则整体解析后逐个产出
+    - 其他格式：整体解析后产出
+
+    Args:
+        source: 文件路径或已打开的文件对象
+        parser_type: 解析器类型，默认根据扩展名推断；传入文件对象时必须指定
+        sections: 是否把每个文档拆成顶层段 {key: value} 逐个产出
+
+    示例:
+        >>> for document in iter_documents('flags.jsonl'):
+        ...     print(document['name'])
+    """
+    if parser_type is None:
+        if not isinstance(source, str):
+            raise ValueError("parser_type is required when source is a file object")
+        parser_type = parsers.parser_type(source)
+    parser_type = parser_type.lower()
+    if parser_type == 'yml':
+        parser_type = 'yaml'
+
+    if not isinstance(source, str):
+        for document in _iter_sections(_iter_stream(source, parser_type, sections), sections):
+            yield document
+        return
+    # ijson 需要二进制流，其余格式按文本逐块读取
+    if parser_type == 'json' and _load_ijson() is not None:
+        stream = io.open(source, 'rb')
+    else:
+        stream = io.open(source, 'r', encoding='utf-8')
+    with stream:
+        for document in _iter_sections(_iter_stream(stream, parser_type, sections), sections):
+            yield document
+
+
+def _iter_stream(stream, parser_type, sections):
+    if parser_type == 'yaml':
+        return _iter_yaml(stream)
+    if parser_type in JSON_LINES_TYPES:
+        return _iter_json_lines(stream)
+    if parser_type == 'json':
+        return _iter_json(stream, sections)
+    # 可以直接解析的格式不需要导入 anyconfig
+    if parsers.fast_loader(parser_type) is None:
+        support_ext = parsers.supported_types()
+        if parser_type not in support_ext:
+            raise ValueError(
+                f"Unsupported file format '{parser_type}'. "
+                f"Currently supported formats: {', '.join(list(support_ext) + list(JSON_LINES_TYPES))}"
+            )
+    return iter([parsers.load_content(stream.read(), parser_type)])
+
+
+def _iter_sections(documents, sections):
+    for document in documents:
+        if sections and isinstance(document, dict):
+            for key, value in document.items():
+                yield {key: value}
+        else:
+            yield document
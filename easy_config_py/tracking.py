@@ -0,0 +1,329 @@
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/17-20:40
+# @Author  : 灯下客
+# @Email   :
+# @File    : tracking.py
+# @Software: PyCharm
+import copy
+import itertools
+import weakref
+from collections import namedtuple
+
+# 全局单调递增的版本号，每次被跟踪的修改取一个新值
+_clock = itertools.count(1)
+
+# op: 'added' / 'modified' / 'removed'（diff），或 'set' / 'removed'（changes_since）
+Change = namedtuple('Change', ['op', 'path', 'value'])
+
+SET_OPS = ('set', 'added', 'modified')
+
+
+def current_version():
+    """
+    返回当前版本号，之后发生的任何修改的版本号都大于它。
+
+    示例:
+        >>> version = current_version()
+        >>> d.database.port = 5433
+        >>> d.changes_since(version)  # [Change('set', ('database', 'port'), 5433)]
+    """
+    return next(_clock)
+
+
+def _state(node):
+    return getattr(node, '__dict__', None) if isinstance(node, dict) else None
+
+
+def version_of(node):
+    """节点（含子树）最后一次被修改时的版本号，未被跟踪的节点返回 0"""
+    state = _state(node)
+    return state.get('__stamp', 0) if state else 0
+
+
+def start(node):
+    """节点构造完成后开始跟踪，构造过程中的写入不单独记录"""
+    stamp = next(_clock)
+    object.__setattr__(node, '__created', stamp)
+    object.__setattr__(node, '__stamp', stamp)
+
+
+def adopt(parent, child, stamp=None):
+    """记录子节点的所属父节点，子节点的修改沿父节点链向上传播；子节点原来的父节点不再接收传播"""
+    object.__setattr__(child, '__owner', weakref.ref(parent))
+    if stamp is not None:
+        object.__setattr__(child, '__created', stamp)
+        object.__setattr__(child, '__stamp', stamp)
+        # 兄弟节点可能取到相同的版本号，另取一个唯一的来源标识供 diff 区分
+        object.__setattr__(child, '__origin', next(_clock))
+
+
+def share(parent, child):
+    """
+    浅拷贝后子节点同时属于原节点和副本：保留原来的父节点，再增加 parent，
+    子节点的修改向所有仍然存活的父节点传播。
+    """
+    owner = child.__dict__.get('__owner')
+    if owner is None:
+        adopt(parent, child)
+        return
+    owners = owner if type(owner) is tuple else (owner,)
+    owners = tuple(ref for ref in owners if ref() is not None and ref() is not parent)
+    object.__setattr__(child, '__owner', owners + (weakref.ref(parent),))
+
+
+def record(node, key):
+    """记录 node[key] 被写入或删除"""
+    state = node.__dict__
+    if '__created' not in state:
+        return
+    stamp = next(_clock)
+    keys = state.get('__keys')
+    if keys is None:
+        keys = {}
+        object.__setattr__(node, '__keys', keys)
+    keys[key] = stamp
+    _propagate(node, stamp)
+
+
+def touch(node, deep=False):
+    """
+    不针对具体键地标记节点已修改（例如原地修改了其中的列表）。
+
+    deep=True 时子树中所有被跟踪的节点都取新的版本号，用于不知道具体改了哪里的情况，
+    按版本号复用子树的快照、冻结副本和剖面视图都会重新构建。
+    """
+    if '__created' in node.__dict__:
+        stamp = next(_clock)
+        if deep:
+            _stamp_tree(node, stamp)
+        _propagate(node, stamp)
+
+
+def _stamp_tree(value, stamp):
+    if isinstance(value, dict):
+        state = _state(value)
+        if state is not None and '__created' in state:
+            object.__setattr__(value, '__stamp', stamp)
+        # dict.values 不会触发 LazyDict 的包装
+        for item in dict.values(value):
+            _stamp_tree(item, stamp)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _stamp_tree(item, stamp)
+
+
+def _propagate(node, stamp):
+    while node is not None:
+        object.__setattr__(node, '__stamp', stamp)
+        owner = node.__dict__.get('__owner')
+        if type(owner) is tuple:
+            # 被浅拷贝共享的子节点有多个父节点
+            for ref in owner:
+                parent = ref()
+                if parent is not None:
+                    _propagate(parent, stamp)
+            return
+        node = owner() if owner is not None else None
+
+
+def key_version(node, key):
+    """node[key] 最后一次被写入或删除时的版本号"""
+    state = _state(node)
+    if not state:
+        return 0
+    keys = state.get('__keys')
+    if keys is not None and key in keys:
+        return keys[key]
+    return state.get('__created', 0)
+
+
+def copy_state(source, target):
+    """复制版本信息，使副本与原节点在 diff 时可以按版本号剪枝"""
+    state = source.__dict__
+    for name in ('__created', '__stamp', '__origin'):
+        if name in state:
+            object.__setattr__(target, name, state[name])
+    keys = state.get('__keys')
+    object.__setattr__(target, '__keys', dict(keys) if keys else None)
+
+
+def _plain(value):
+    # 局部导入避免循环依赖
+    from easy_config_py.addict import _plain_copy
+    return _plain_copy(value)
+
+
+def changes_since(node, version):
+    """
+    返回 version 之后 node 发生的修改，只进入版本号变化过的子树。
+
+    Returns:
+        Change 列表，op 为 'set'（新增或修改）或 'removed'；路径是键的元组
+    """
+    changes = []
+    _changes_since(node, version, (), changes)
+    return changes
+
+
+def _changes_since(node, version, prefix, changes):
+    state = _state(node)
+    created = state.get('__created') if state else None
+    if created is None:
+        # 未被跟踪的节点无法判断，整体视为修改
+        for key, value in dict.items(node):
+            changes.append(Change('set', prefix + (key,), _plain(value)))
+        return
+    if state['__stamp'] <= version:
+        return
+    keys = state.get('__keys') or {}
+    if created > version:
+        # 节点本身在 version 之后创建，所有键都是新的
+        for key, value in dict.items(node):
+            changes.append(Change('set', prefix + (key,), _plain(value)))
+        for key, stamp in keys.items():
+            if key not in node:
+                changes.append(Change('removed', prefix + (key,), None))
+        return
+    for key, stamp in keys.items():
+        if stamp > version:
+            if key in node:
+                changes.append(Change('set', prefix + (key,), _plain(dict.__getitem__(node, key))))
+            else:
+                changes.append(Change('removed', prefix + (key,), None))
+    for key, value in dict.items(node):
+        if _state(value) and keys.get(key, created) <= version:
+            _changes_since(value, version, prefix + (key,), changes)
+
+
+def diff(old, new, keys=None):
+    """
+    比较两棵字典树，返回从 old 变为 new 所需的修改。
+
+    new 由 old 复制（copy.deepcopy / Dict.deepcopy）而来时，创建版本号和版本号都相同的子树
+    直接跳过，代价与修改量成正比；无关的两棵树则逐键比较。
+
+    Args:
+        keys: 只比较这些顶层键，为 None 时比较全部
+
+    Returns:
+        Change 列表，op 为 'added'、'modified' 或 'removed'
+    """
+    changes = []
+    if keys is None:
+        _diff(old, new, (), changes)
+    else:
+        for key in keys:
+            _diff_key(old, new, key, (key,), changes)
+    return changes
+
+
+def _identity(node):
+    """(来源, 版本号)：只有同一节点及其副本才会相同，未被跟踪的节点返回 None"""
+    state = _state(node)
+    if not state or '__created' not in state:
+        return None
+    return state.get('__origin', state['__created']), state['__stamp']
+
+
+def _diff(old, new, prefix, changes):
+    if old is new:
+        return
+    # 版本号本身不唯一（修改会把同一个版本号写到所有祖先，mark_dirty 会写到整棵子树），
+    # 只有创建版本号也相同（即 new 由 old 复制而来）时才能跳过
+    identity = _identity(old)
+    if identity is not None and identity == _identity(new):
+        return
+    for key in old:
+        if key not in new:
+            changes.append(Change('removed', prefix + (key,), None))
+    for key in new:
+        _diff_key(old, new, key, prefix + (key,), changes)
+
+
+def _diff_key(old, new, key, path, changes):
+    if key not in new:
+        if key in old:
+            changes.append(Change('removed', path, None))
+        return
+    value = dict.__getitem__(new, key)
+    if key not in old:
+        changes.append(Change('added', path, _plain(value)))
+        return
+    old_value = dict.__getitem__(old, key)
+    if isinstance(old_value, dict) and isinstance(value, dict):
+        _diff(old_value, value, path, changes)
+    elif old_value != value:
+        changes.append(Change('modified', path, _plain(value)))
+
+
+def apply_patch(target, patch):
+    """
+    把 diff / changes_since 的结果应用到另一棵字典树上。
+
+    Args:
+        target: 目标 Dict（或普通 dict）
+        patch: Change 列表，也可以是 (op, path, value) 元组的列表
+    """
+    for op, path, value in patch:
+        path = tuple(path)
+        parent = target
+        for k in path[:-1]:
+            child = parent.get(k)
+            if not isinstance(child, dict):
+                if op not in SET_OPS:
+                    parent = None
+                    break
+                parent[k] = type(parent)()
+                child = parent[k]
+            parent = child
+        if parent is None:
+            continue
+        if op in SET_OPS:
+            value = copy.deepcopy(value)
+            hook = getattr(parent, '_hook', None)
+            parent[path[-1]] = hook(value) if hook is not None else value
+        elif op == 'removed':
+            if path[-1] in parent:
+                del parent[path[-1]]
+        else:
+            raise ValueError(f"Unknown patch op '{op}'")
+    return target
+
+
+def patched(root, patch):
+    """
+    返回应用了 patch 的新树，只复制修改路径上的节点，其余子树与 root 共享。
+
+    复制的节点保留原版本号，共享的子树改为归属新树，之后的修改沿新树的父节点链传播；
+    root 本身不会被修改，读取方可以继续使用旧树直到引用被整体替换。
+    代价与修改的路径数量和深度成正比，与配置总大小无关。
+    """
+    copies = set()
+    new_root = _copy_node(root, copies)
+    for _, path, _ in patch:
+        parent = new_root
+        for k in tuple(path)[:-1]:
+            child = dict.get(parent, k) if isinstance(parent, dict) else None
+            if not isinstance(child, dict) or not _state(child):
+                break
+            if id(child) not in copies:
+                child = _copy_node(child, copies)
+                dict.__setitem__(parent, k, child)
+                adopt(parent, child)
+            parent = child
+    return apply_patch(new_root, patch)
+
+
+def _copy_node(node, copies):
+    # 浅复制一个节点：键值共享，子节点改为归属副本
+    other = type(node).__new__(type(node))
+    for name in ('__parent', '__key', '__frozen', '__schema'):
+        if name in node.__dict__:
+            object.__setattr__(other, name, node.__dict__[name])
+    dict.update(other, node)
+    copy_state(node, other)
+    for value in dict.values(other):
+        if _state(value):
+            adopt(other, value)
+    copies.add(id(other))
+    return other
@@ -17,6 +17,9 @@ setup(
     install_requires=['anyconfig'],
     extras_require={
         'aio': ['aiofiles'],
+        'watch': ['inotify_simple'],
+        'stream': ['ijson'],
+        'fast': ['orjson', 'msgpack'],
     },
     license='MIT',
     description='',
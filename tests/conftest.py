@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+import itertools
+import json
+import os
+import time
+
+import pytest
+
+from easy_config_py import parsers
+
+_bumps = itertools.count(1)
+
+
+def write_json(path, data):
+    """写入 JSON 配置文件，并把 mtime 推到未来，保证签名与上一次写入不同"""
+    with open(path, 'w', encoding='utf-8') as file_to_write:
+        json.dump(data, file_to_write)
+    stamp = time.time() + next(_bumps)
+    os.utime(path, (stamp, stamp))
+    return str(path)
+
+
+@pytest.fixture
+def write_config(tmp_path):
+    def write(name, data):
+        return write_json(tmp_path / name, data)
+    return write
+
+
+@pytest.fixture(autouse=True)
+def fast_parsers():
+    """直接解析默认关闭；测试显式开启，json / yaml / toml 不依赖 anyconfig"""
+    parsers.use_fast_path(True)
+    yield
+    parsers.use_fast_path(False)
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from easy_config_py import Dict, EasyConfig
+
+
+def test_getattr_and_setattr_with_special_keys():
+    d = Dict()
+    d.setattr('key-with-dash', 1)
+    d.setattr('nested.sub-key', 2)
+    assert d.getattr('key-with-dash') == 1
+    assert d.getattr('nested.sub-key') == 2
+    assert d.getattr('nested.missing', 'default') == 'default'
+    assert 'missing' not in d.nested
+
+
+def test_setattr_through_non_dict_raises():
+    d = Dict({'a': 1})
+    with pytest.raises(TypeError):
+        d.setattr('a.b', 2)
+
+
+def test_accessor_reads_and_writes():
+    d = Dict({'database': {'host-name': 'localhost'}})
+    host = d.accessor('database.host-name')
+    assert host.get() == 'localhost'
+    assert host() == 'localhost'
+    host.set('127.0.0.1')
+    assert d.database['host-name'] == '127.0.0.1'
+    missing = d.accessor('database.port')
+    assert missing.get(5432) == 5432
+    assert not missing.exists()
+    d.accessor('new.path').set(1)
+    assert d.new.path == 1
+
+
+def test_cached_accessor_invalidated_by_writes_on_path():
+    d = Dict({'database': {'host': 'a'}, 'other': {'x': 1}})
+    host = d.accessor('database.host', cached=True)
+    assert host.get() == 'a'
+    d.other.x = 2
+    assert host._value == 'a'
+    d.database.host = 'b'
+    assert host.get() == 'b'
+    d.database = {'host': 'c'}
+    assert host.get() == 'c'
+    del d['database']
+    assert host.get('gone') == 'gone'
+
+
+def test_config_accessor_survives_reload(tmp_path, write_config):
+    path = write_config('a.json', {'database': {'host': 'a'}})
+    config = EasyConfig(path=str(tmp_path))
+    config.load_file(path)
+    host = config.accessor('database.host', cached=True)
+    assert host.get() == 'a'
+    write_config('a.json', {'database': {'host': 'b'}})
+    config.reload()
+    assert host.get() == 'b'
+    host.set('c')
+    assert config.getattr('database.host') == 'c'
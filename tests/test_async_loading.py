@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import threading
+import time
+
+import pytest
+
+from easy_config_py import EasyConfig, FileCache, FileLoader
+from easy_config_py import file_loader
+
+
+def _slow_parser(calls, release):
+    def parse(path):
+        calls.append(path)
+        release.wait(5)
+        return {'loaded': True}
+    return parse
+
+
+def test_concurrent_loads_parse_once(write_config):
+    path = write_config('a.json', {'a': 1})
+    calls = []
+    release = threading.Event()
+    loader = FileLoader(path, 'a.json', FileCache())
+    parse = _slow_parser(calls, release)
+
+    async def main():
+        tasks = [asyncio.ensure_future(loader.async_get_file(path, parse)) for _ in range(5)]
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(*tasks)
+
+    results = asyncio.run(main())
+    assert results == [{'loaded': True}] * 5
+    assert len(calls) == 1
+    assert not file_loader._inflight
+
+
+def test_path_locks_released_after_loading(write_config):
+    paths = [write_config('f%d.json' % index, {'a': index}) for index in range(20)]
+    calls = []
+    release = threading.Event()
+    loader = FileLoader(paths[0], 'f0.json', FileCache())
+    parse = _slow_parser(calls, release)
+    threads = [threading.Thread(target=loader.get_file, args=(paths[0], parse)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for path in paths[1:]:
+        loader.get_file(path)
+    for _ in range(500):
+        if calls:
+            break
+        time.sleep(0.01)
+    assert list(file_loader._path_locks) == [paths[0]]
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert len(calls) == 1
+    assert not file_loader._path_locks
+
+
+def test_cancelling_leader_does_not_cancel_waiters(write_config):
+    path = write_config('a.json', {'a': 1})
+    calls = []
+    release = threading.Event()
+    loader = FileLoader(path, 'a.json', FileCache())
+    parse = _slow_parser(calls, release)
+
+    async def main():
+        leader = asyncio.ensure_future(loader.async_get_file(path, parse))
+        await asyncio.sleep(0.02)
+        waiter = asyncio.ensure_future(loader.async_get_file(path, parse))
+        await asyncio.sleep(0.02)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await waiter
+
+    assert asyncio.run(main()) == {'loaded': True}
+    assert len(calls) == 1
+    assert not file_loader._inflight
+
+
+def test_errors_reach_every_waiter(write_config):
+    path = write_config('a.json', {'a': 1})
+    loader = FileLoader(path, 'a.json', FileCache())
+
+    def parse(path):
+        raise ValueError('broken')
+
+    async def main():
+        return await asyncio.gather(*[loader.async_get_file(path, parse) for _ in range(3)],
+                                    return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_close_shuts_down_own_executor(write_config):
+    path = write_config('a.json', {'a': 1})
+    with EasyConfig(path=path, max_workers=2, cache=FileCache()) as config:
+        asyncio.run(config.async_load_file(path))
+        executor = config.loader._executor
+        assert executor is not None
+        assert config.data.a == 1
+    assert config.loader._executor is None
+    with pytest.raises(RuntimeError):
+        executor.submit(print)
+
+
+def test_async_load_files_keeps_order(write_config):
+    first = write_config('1.json', {'a': 1, 'b': 1})
+    second = write_config('2.json', {'b': 2})
+    config = EasyConfig(path=first, cache=FileCache())
+    asyncio.run(config.async_load_files([first, second]))
+    assert config.to_dict() == {'a': 1, 'b': 2}
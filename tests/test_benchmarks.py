@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pytest
+
+from benchmarks import bench_dict, bench_serialize, run
+from benchmarks.generators import make_tree
+from benchmarks.harness import format_time, load_baseline, measure, save_baseline
+
+
+def test_generators_are_deterministic():
+    assert make_tree(4, 2, seed=1) == make_tree(4, 2, seed=1)
+    assert make_tree(4, 2, seed=1) != make_tree(4, 2, seed=2)
+    assert len(make_tree(3, 1)) == 3
+
+
+def test_measure_and_format_time():
+    assert measure(lambda: None, repeat=1, min_time=0.001) > 0
+    assert format_time(2.5) == '2.50 s'
+    assert format_time(0.0025) == '2.50 ms'
+    assert format_time(2.5e-6) == '2.50 us'
+    assert format_time(2.5e-9) == '2.5 ns'
+
+
+def test_baseline_round_trip(tmp_path):
+    path = str(tmp_path / 'baseline.json')
+    assert load_baseline(path) == {}
+    save_baseline(path, {'dict: a': 1.0}, {'python': 'x'})
+    assert load_baseline(path) == {'meta': {'python': 'x'}, 'results': {'dict: a': 1.0}}
+
+
+@pytest.mark.parametrize('suite', [bench_dict, bench_serialize])
+def test_suite_cases_run(suite):
+    cases = suite.benchmarks()
+    assert cases and len({name for name, _ in cases}) == len(cases)
+    for name, func in cases:
+        func()
+
+
+def test_run_flags_regressions_and_saves(tmp_path, monkeypatch, capsys):
+    path = str(tmp_path / 'baseline.json')
+    monkeypatch.setattr(run, 'measure', lambda func, repeat: 2.0)
+    name = bench_dict.benchmarks()[0][0]
+    save_baseline(path, {'dict: ' + name: 1.0}, {})
+    assert run.main(['--only', 'dict', '--filter', name, '--baseline', path]) == 1
+    assert 'regression' in capsys.readouterr().out
+    assert run.main(['--only', 'dict', '--filter', name, '--baseline', path, '--save']) == 1
+    with open(path, encoding='utf-8') as file_to_read:
+        assert json.load(file_to_read)['results']['dict: ' + name] == 2.0
+    assert run.main(['--only', 'dict', '--filter', name, '--baseline', path]) == 0
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+import datetime
+import pickle
+
+import pytest
+
+from easy_config_py import Dict, LazyDict
+from easy_config_py import codec
+
+
+@pytest.mark.parametrize('value, raw', [
+    (None, b'\xc0'),
+    (True, b'\xc3'),
+    (False, b'\xc2'),
+    (1, b'\x01'),
+    (-1, b'\xff'),
+    (200, b'\xcc\xc8'),
+    (-200, b'\xd1\xff\x38'),
+    (2 ** 32, b'\xcf\x00\x00\x00\x01\x00\x00\x00\x00'),
+    (1.5, b'\xcb\x3f\xf8\x00\x00\x00\x00\x00\x00'),
+    ('a', b'\xa1a'),
+    ({}, b'\x80'),
+    ([], b'\x90'),
+    (b'\x00', b'\xc4\x01\x00'),
+])
+def test_dumps_matches_msgpack_encoding(value, raw):
+    assert codec.dumps(value) == raw
+    assert codec.loads(raw) == value
+
+
+def test_round_trip_sizes_and_nesting():
+    data = {
+        'short': 'x' * 31, 'str8': 'x' * 200, 'str16': 'x' * 70000,
+        'list': list(range(20)), 'map': {str(i): i for i in range(20)},
+        'ints': [0, 127, 128, 255, 65536, -32, -33, -129, -32769, -2 ** 63, 2 ** 64 - 1],
+        'nested': {'a': [{'b': (1, 2)}]}, 1: 'int key',
+    }
+    loaded = codec.loads(codec.dumps(data))
+    assert loaded['nested'] == {'a': [{'b': [1, 2]}]}
+    del data['nested'], loaded['nested']
+    assert loaded == data
+
+
+def test_non_primitive_values_need_allow_pickle():
+    with pytest.raises(TypeError):
+        codec.dumps({'tags': {'a'}})
+    raw = codec.dumps({'when': datetime.date(2026, 1, 1)}, allow_pickle=True)
+    with pytest.raises(ValueError):
+        codec.loads(raw)
+    assert codec.loads(raw, allow_pickle=True) == {'when': datetime.date(2026, 1, 1)}
+
+
+def test_invalid_data_rejected():
+    with pytest.raises(ValueError):
+        codec.loads(b'\x92\x01')
+    with pytest.raises(ValueError):
+        codec.loads(b'\x01\x02')
+    with pytest.raises(ValueError):
+        codec.loads(b'\xd4\x05\x00')
+
+
+def test_dict_to_bytes_round_trip():
+    d = Dict({'database': {'hosts': ['a', {'name': 'b'}]}})
+    loaded = Dict.from_bytes(d.to_bytes())
+    assert loaded == d
+    assert isinstance(loaded.database, Dict)
+    assert isinstance(loaded.database.hosts[1], Dict)
+    frozen = Dict.from_bytes(d.to_bytes(), frozen=True)
+    with pytest.raises(KeyError):
+        frozen.missing = 1
+    lazy = LazyDict.from_bytes(d.to_bytes())
+    assert isinstance(lazy, LazyDict)
+    assert lazy.database.hosts[1].name == 'b'
+
+
+def test_dict_to_bytes_pickle_opt_in():
+    d = Dict({'when': datetime.date(2026, 1, 1)})
+    with pytest.raises(TypeError):
+        d.to_bytes()
+    raw = d.to_bytes(allow_pickle=True)
+    with pytest.raises(ValueError):
+        Dict.from_bytes(raw)
+    assert Dict.from_bytes(raw, allow_pickle=True).when == datetime.date(2026, 1, 1)
+
+
+def test_dict_pickle_keeps_structure_and_frozen_state():
+    d = Dict({'a': {'b': [1, {'c': 2}]}})
+    d.freeze()
+    loaded = pickle.loads(pickle.dumps(d, pickle.HIGHEST_PROTOCOL))
+    assert loaded == d
+    assert isinstance(loaded.a.b[1], Dict)
+    with pytest.raises(KeyError):
+        loaded.a.missing = 1
+    loaded.unfreeze()
+    loaded.a.b[1].c = 3
+    assert loaded.to_dict() == {'a': {'b': [1, {'c': 3}]}}
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+import asyncio
+
+from easy_config_py import ContentCache, EasyConfig, StatsSink
+
+CONTENT = '{"database": {"host": "a", "port": 1}}'
+
+
+def test_load_parses_once_per_content_and_type():
+    cache = ContentCache()
+    calls = []
+
+    def parse(content, parser_type):
+        calls.append(parser_type)
+        return {'a': 1}
+
+    assert cache.load(CONTENT, 'json', parse) == ({'a': 1}, False)
+    assert cache.load(CONTENT.encode('utf-8'), 'json', parse) == ({'a': 1}, True)
+    assert cache.load(CONTENT, 'yaml', parse) == ({'a': 1}, False)
+    assert calls == ['json', 'yaml']
+    assert cache.key(CONTENT, 'json') != cache.key(CONTENT + ' ', 'json')
+
+
+def test_limits_evict_oldest_entry():
+    cache = ContentCache(max_entries=2, max_bytes=100)
+    for index in range(3):
+        cache.load(str(index), 'json', lambda content, parser_type: {})
+    assert len(cache) == 2
+    assert cache.key('0', 'json') not in cache
+    cache.load('x' * 200, 'json', lambda content, parser_type: {})
+    assert cache.stats()['bytes'] <= 100
+    assert cache.stats()['evictions'] >= 2
+
+
+def test_shared_results_are_not_mutated_by_configs():
+    cache = ContentCache()
+    first = EasyConfig(content_cache=cache)
+    first.load_by_content(CONTENT, 'json')
+    first.data.database.host = 'changed'
+    second = EasyConfig(content_cache=cache)
+    second.load_by_content(CONTENT, 'json')
+    assert second.data.database.host == 'a'
+    assert cache.stats()['hits'] == 1
+
+
+def test_lazy_configs_share_cached_parse():
+    cache = ContentCache()
+    first = EasyConfig(content_cache=cache, lazy=True)
+    first.load_by_content(CONTENT, 'json')
+    first.data.database.port = 2
+    second = EasyConfig(content_cache=cache, lazy=True)
+    second.load_by_content(CONTENT, 'json')
+    assert second.data.database.port == 1
+
+
+def test_stats_and_instrumentation():
+    stats = StatsSink()
+    config = EasyConfig(content_cache=True, instrument=stats)
+    config.load_by_content(CONTENT, 'json')
+    config.load_by_content(CONTENT, 'json')
+    result = config.stats()
+    assert result['content_cache']['hits'] == 1
+    assert result['content_cache']['misses'] == 1
+    assert result['counters']['cache_hit'] == 1
+    assert result['counters']['cache_miss'] == 1
+
+
+def test_async_load_by_content_uses_cache():
+    cache = ContentCache()
+    config = EasyConfig(content_cache=cache)
+    asyncio.run(config.async_load_by_content(CONTENT, 'json'))
+    asyncio.run(config.async_load_by_content(CONTENT, 'json'))
+    assert config.to_dict() == {'database': {'host': 'a', 'port': 1}}
+    assert cache.stats()['hits'] == 1
+    assert len(cache) == 1
+
+
+def test_async_load_by_content_caches_empty_parse_and_instruments():
+    stats = StatsSink()
+    config = EasyConfig(content_cache=True, instrument=stats)
+    for _ in range(2):
+        asyncio.run(config.async_load_by_content('null', 'json'))
+    result = config.stats()
+    assert result['content_cache']['hits'] == 1
+    assert result['operations']['parse']['count'] == 2
+    assert result['counters']['cache_hit'] == 1
+    assert result['counters']['cache_miss'] == 1
+    assert result['counters']['parse.json'] == 2
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+import os
+
+from easy_config_py import DiskCache, EasyConfig, FileCache
+from easy_config_py import parsers
+
+
+def test_load_parses_once_and_hits_afterwards(tmp_path):
+    cache = DiskCache(str(tmp_path / 'cache'))
+    calls = []
+
+    def parse():
+        calls.append(1)
+        return {'a': 1}
+
+    assert cache.load(b'a: 1', 'yaml-test', parse) == {'a': 1}
+    assert cache.load(b'a: 1', 'yaml-test', parse) == {'a': 1}
+    assert len(calls) == 1
+    assert cache.stats() == {'hits': 1, 'misses': 1}
+
+
+def test_key_depends_on_content_and_parser(tmp_path):
+    assert DiskCache.key(b'a', 'json') != DiskCache.key(b'b', 'json')
+    assert DiskCache.key(b'a', 'json') != DiskCache.key(b'a', 'yaml')
+
+
+def test_corrupt_entry_falls_back_to_parsing(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    key = cache.key(b'{}', 'json-test')
+    cache.put(key, {'cached': True})
+    with open(cache.entry_path(key), 'wb') as file_to_write:
+        file_to_write.write(b'not a pickle')
+    assert cache.get(key) == (False, None)
+    assert cache.load(b'{}', 'json-test', lambda: {'parsed': True}) == {'parsed': True}
+
+
+def test_unwritable_directory_still_parses(tmp_path):
+    blocker = tmp_path / 'file'
+    blocker.write_text('x')
+    cache = DiskCache(str(blocker / 'cache'))
+    assert cache.load(b'{}', 'json-test', lambda: {'a': 1}) == {'a': 1}
+    assert cache.put(cache.key(b'{}', 'json-test'), {}) is False
+
+
+def test_default_directory_next_to_config_and_clear(tmp_path):
+    cache = DiskCache()
+    cache.load(b'{}', 'json-test', lambda: {}, str(tmp_path))
+    directory = tmp_path / '.easy_config_cache'
+    assert len(os.listdir(directory)) == 1
+    cache.clear(str(tmp_path))
+    assert os.listdir(directory) == []
+
+
+def test_easy_config_reuses_parse_across_instances(tmp_path, write_config):
+    path = write_config('a.json', {'a': {'b': 1}})
+    first = EasyConfig(path=str(tmp_path), disk_cache=str(tmp_path / 'cache'), cache=FileCache())
+    first.load_file(path)
+    second = EasyConfig(path=str(tmp_path), disk_cache=str(tmp_path / 'cache'), cache=FileCache())
+    second.load_file(path)
+    assert second.to_dict() == {'a': {'b': 1}}
+    assert second.stats()['disk_cache'] == {'hits': 1, 'misses': 0}
+
+
+def test_parser_version_distinguishes_fast_path():
+    assert parsers.parser_version('json') == 'json-direct'
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from easy_config_py import EasyConfig
+from easy_config_py.env import EnvOverlay, coerce
+
+
+def test_coerce_follows_existing_type():
+    assert coerce('yes', True) is True
+    assert coerce('off', True) is False
+    assert coerce('5433', 1) == 5433
+    assert coerce('0.5', 1.0) == 0.5
+    assert coerce('a, b', []) == ['a', 'b']
+    assert coerce('[1, 2]', []) == [1, 2]
+    assert coerce('', []) == []
+    assert coerce('{"a": 1}', {}) == {'a': 1}
+    assert coerce('42', None) == '42'
+    assert coerce('42', 'x') == '42'
+
+
+def test_coerce_errors_name_the_variable():
+    with pytest.raises(ValueError, match="APP__PORT"):
+        coerce('abc', 1, 'APP__PORT')
+    with pytest.raises(ValueError):
+        coerce('maybe', True)
+    with pytest.raises(ValueError):
+        coerce('[1]', {})
+
+
+def test_index_filters_prefix_and_empty_segments():
+    environ = {'APP__DATABASE__HOST': 'db', 'APP____X': '1', 'OTHER__A': '2', 'APP_B': '3'}
+    overlay = EnvOverlay('APP', environ=environ)
+    assert overlay.index == ((('database', 'host'), 'db', 'APP__DATABASE__HOST'),)
+    assert EnvOverlay(environ={'A__B': '1', 'PATH': 'x'}).index == ((('a', 'b'), '1', 'A__B'),)
+    with pytest.raises(ValueError):
+        EnvOverlay('APP', separator='')
+
+
+def test_build_matches_existing_key_case():
+    overlay = EnvOverlay('APP', environ={'APP__DATABASE__MAXCONN': '10', 'APP__NEW__KEY': 'v'})
+    data = {'Database': {'maxConn': 1}}
+    assert overlay.build(data) == {'Database': {'maxConn': 10}, 'new': {'key': 'v'}}
+
+
+def test_refresh_only_on_change():
+    environ = {'APP__A': '1'}
+    overlay = EnvOverlay('APP', environ=environ)
+    assert overlay.refresh() is True
+    assert overlay.refresh() is False
+    environ['APP__A'] = '2'
+    assert overlay.refresh() is True
+
+
+def test_load_env_overrides_and_reloads(tmp_path, write_config):
+    environ = {'APP__DATABASE__PORT': '5433', 'APP__DEBUG': 'true'}
+    config = EasyConfig(path=str(tmp_path))
+    config.load_file(write_config('a.json', {'database': {'host': 'a', 'port': 5432}, 'debug': False}))
+    config.load_env('APP', environ=environ)
+    assert config.to_dict() == {'database': {'host': 'a', 'port': 5433}, 'debug': True}
+    assert config.reload() is False
+    environ['APP__DATABASE__PORT'] = '6000'
+    assert config.reload() is True
+    assert config.data.database.port == 6000
+
+
+def test_bad_value_is_reported_again_after_fix(tmp_path, write_config):
+    environ = {'APP__PORT': 'abc'}
+    config = EasyConfig(path=str(tmp_path))
+    config.load_file(write_config('a.json', {'port': 1}))
+    overlay = EnvOverlay('APP', environ=environ)
+    with pytest.raises(ValueError):
+        overlay.apply(config.data)
+    environ['APP__PORT'] = '2'
+    assert overlay.refresh() is True
+    overlay.apply(config.data)
+    assert config.data.port == 2
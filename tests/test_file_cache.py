@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+import json
+
+from easy_config_py import EasyConfig, FileCache, FileLoader
+from easy_config_py.cache import LRUCache, RAW, file_signature
+from conftest import write_json
+
+
+def _parse(path):
+    with open(path, encoding='utf-8') as file_to_read:
+        return json.load(file_to_read)
+
+
+def test_file_signature(tmp_path):
+    path = write_json(tmp_path / 'a.json', {'a': 1})
+    signature = file_signature(path)
+    assert signature[1] == len('{"a": 1}')
+    assert file_signature(str(tmp_path)) is None
+    assert file_signature(str(tmp_path / 'missing.json')) is None
+
+
+def test_lru_evicts_by_entries_and_bytes():
+    cache = LRUCache(max_entries=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+    assert 'b' not in cache and 'a' in cache and 'c' in cache
+    assert cache.stats()['evictions'] == 1
+    cache = LRUCache(max_entries=None, max_bytes=10)
+    cache.put('a', 1, size=6)
+    cache.put('b', 2, size=6)
+    assert list(cache._entries) == ['b']
+    assert cache.stats()['bytes'] == 6
+
+
+def test_loader_hits_until_file_changes(tmp_path):
+    cache = FileCache()
+    loader = FileLoader(str(tmp_path), 'a.json', cache=cache)
+    path = write_json(tmp_path / 'a.json', {'a': 1})
+    calls = []
+
+    def parse(path):
+        calls.append(path)
+        return _parse(path)
+
+    assert loader.get_file(path, parse) == {'a': 1}
+    assert loader.get_file(path, parse) == {'a': 1}
+    assert len(calls) == 1
+    write_json(path, {'a': 2})
+    assert loader.get_file(path, parse) == {'a': 2}
+    assert len(calls) == 2
+    stats = cache.stats()
+    assert stats['hits'] == 1 and stats['stale'] == 1
+
+
+def test_raw_and_parsed_entries_are_separate(tmp_path):
+    cache = FileCache()
+    loader = FileLoader(str(tmp_path), 'a.json', cache=cache)
+    path = write_json(tmp_path / 'a.json', {'a': 1})
+    assert loader.get_file(path) == b'{"a": 1}'
+    assert loader.get_file(path, _parse) == {'a': 1}
+    assert cache.get(path, RAW) == b'{"a": 1}'
+    assert cache.get(path, _parse) == {'a': 1}
+
+
+def test_missing_file_returns_empty_and_is_not_cached(tmp_path):
+    cache = FileCache()
+    loader = FileLoader(str(tmp_path), 'a.json', cache=cache)
+    assert loader.get_file(str(tmp_path / 'missing.json'), _parse) == {}
+    assert len(cache) == 0
+
+
+def test_invalidate_path_and_all(tmp_path):
+    cache = FileCache()
+    loader = FileLoader(str(tmp_path), 'a.json', cache=cache)
+    first = write_json(tmp_path / 'a.json', {'a': 1})
+    second = write_json(tmp_path / 'b.json', {'b': 1})
+    loader.get_file(first, _parse)
+    loader.get_file(first)
+    loader.get_file(second, _parse)
+    loader.invalidate(str(tmp_path))
+    assert cache.get(first, _parse) is None and cache.get(first, RAW) is None
+    assert cache.get(second, _parse) == {'b': 1}
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_max_bytes_defaults_to_file_size(tmp_path):
+    cache = FileCache(max_entries=None, max_bytes=20)
+    loader = FileLoader(str(tmp_path), 'a.json', cache=cache)
+    first = write_json(tmp_path / 'a.json', {'a': 'x' * 5})
+    second = write_json(tmp_path / 'b.json', {'b': 'y' * 5})
+    loader.get_file(first, _parse)
+    loader.get_file(second, _parse)
+    assert cache.get(first, _parse) is None
+    assert cache.get(second, _parse) == {'b': 'y' * 5}
+
+
+def test_easy_config_uses_given_cache(tmp_path):
+    cache = FileCache(max_entries=8)
+    path = write_json(tmp_path / 'a.json', {'a': 1})
+    config = EasyConfig(path=str(tmp_path), cache=cache)
+    config.load_file(path)
+    config.load_file(path)
+    assert config.to_dict() == {'a': 1}
+    assert cache.stats()['hits'] == 1
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+import functools
+import gc
+import pickle
+import weakref
+
+import pytest
+
+from easy_config_py import Dict, EasyConfig, FrozenConfig
+
+
+def test_frozen_converts_nested_values():
+    frozen = Dict({'db': {'hosts': ['a', {'name': 'b'}], 'tags': {'x'}}}).frozen()
+    assert isinstance(frozen.db, FrozenConfig)
+    assert frozen.db.hosts == ('a', FrozenConfig({'name': 'b'}))
+    assert frozen.db.tags == frozenset({'x'})
+    assert frozen.getattr('db.hosts') == frozen['db']['hosts']
+    assert frozen.getattr('db.missing', 1) == 1
+    assert frozen.to_dict() == {'db': {'hosts': ['a', {'name': 'b'}], 'tags': {'x'}}}
+
+
+def test_frozen_is_read_only():
+    frozen = FrozenConfig({'a': 1})
+    with pytest.raises(TypeError):
+        frozen['a'] = 2
+    with pytest.raises(TypeError):
+        frozen.a = 2
+
+
+def test_equality_and_hash_follow_content():
+    first = FrozenConfig({'a': 1, 'b': [1, 2]})
+    second = FrozenConfig({'b': (1, 2), 'a': 1})
+    assert first == second
+    assert hash(first) == hash(second)
+    assert first.fingerprint == second.fingerprint
+    assert FrozenConfig({'a': 1}) != FrozenConfig({'a': 1.0})
+    assert FrozenConfig({'a': 1}) != FrozenConfig({'a': True})
+    assert first == {'a': 1, 'b': [1, 2]}
+
+
+def test_pickle_round_trip():
+    frozen = FrozenConfig({'a': {'b': [1, 2]}})
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+
+
+def test_config_frozen_reuses_unchanged_sections():
+    config = EasyConfig(data={'database': {'host': 'db'}, 'cache': {'ttl': 1}})
+    database = config.frozen('database')
+    config.setattr('cache.ttl', 2)
+    assert config.frozen('database') is database
+    assert config.frozen('cache.ttl') == 2
+
+
+def test_lru_cache_hits_for_unchanged_section():
+    config = EasyConfig(data={'database': {'host': 'db'}, 'cache': {'ttl': 1}})
+    calls = []
+
+    @functools.lru_cache(maxsize=4)
+    def connect(database):
+        calls.append(database.host)
+        return object()
+
+    engine = connect(config.frozen('database'))
+    config.setattr('cache.ttl', 2)
+    assert connect(config.frozen('database')) is engine
+    config.setattr('database.host', 'other')
+    assert connect(config.frozen('database')) is not engine
+    assert calls == ['db', 'other']
+
+
+def test_mark_dirty_rebuilds_frozen_with_new_fingerprint():
+    config = EasyConfig(data={'database': {'hosts': ['a']}})
+    old = config.frozen('database')
+    fingerprint = old.fingerprint
+    config.data.database.hosts.append('b')
+    config.mark_dirty()
+    new = config.frozen('database')
+    assert new.hosts == ('a', 'b')
+    assert new.fingerprint != fingerprint
+    assert old.fingerprint == fingerprint
+
+
+def test_mark_dirty_rebuilds_frozen_for_lazy_config():
+    config = EasyConfig(data={'database': {'hosts': ['a']}}, lazy=True)
+    config.frozen()
+    dict.__getitem__(config.data, 'database')['hosts'].append('b')
+    config.mark_dirty()
+    assert config.frozen('database.hosts') == ('a', 'b')
+
+
+def test_frozen_does_not_keep_source_alive():
+    data = Dict({'database': {'host': 'db'}})
+    source = weakref.ref(data.database)
+    frozen = data.frozen()
+    del data
+    gc.collect()
+    assert source() is None
+    assert frozen.database.host == 'db'
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import logging
+
+from easy_config_py import CallbackSink, EasyConfig, FileCache, Instrumentation, LoggingSink, StatsSink
+from easy_config_py.instrumentation import Histogram, make_instrumentation
+
+
+def test_make_instrumentation():
+    assert make_instrumentation(None) is None
+    assert make_instrumentation(False) is None
+    assert isinstance(make_instrumentation(True).stats_sink, StatsSink)
+    instrument = Instrumentation()
+    assert make_instrumentation(instrument) is instrument
+    events = []
+    make_instrumentation(events.append).emit('parse', 0.5, path='a')
+    assert events == [{'op': 'parse', 'seconds': 0.5, 'path': 'a'}]
+
+
+def test_histogram_buckets():
+    histogram = Histogram()
+    for seconds in (0.000001, 0.000003, 0.002):
+        histogram.add(seconds)
+    snapshot = histogram.snapshot()
+    assert snapshot['count'] == 3
+    assert snapshot['min'] == 0.000001 and snapshot['max'] == 0.002
+    assert sum(snapshot['buckets_us'].values()) == 3
+
+
+def test_stats_sink_counts_bytes_cache_and_format():
+    stats = StatsSink()
+    stats({'op': 'stat', 'seconds': 0.1, 'cache': 'hit'})
+    stats({'op': 'parse', 'seconds': 0.2, 'bytes': 10, 'format': 'json'})
+    stats({'op': 'parse', 'seconds': 0.4, 'bytes': 5, 'format': 'json'})
+    snapshot = stats.snapshot()
+    assert snapshot['operations']['parse']['count'] == 2
+    assert snapshot['operations']['parse']['bytes'] == 15
+    assert snapshot['counters'] == {'cache_hit': 1, 'parse.json': 2}
+    stats.reset()
+    assert stats.snapshot() == {'operations': {}, 'counters': {}}
+
+
+def test_logging_sink(caplog):
+    sink = LoggingSink(level=logging.INFO)
+    with caplog.at_level(logging.INFO, logger='easy_config_py'):
+        sink({'op': 'read', 'seconds': 0.001, 'path': 'a.json'})
+    assert 'read 1.000ms path=a.json' in caplog.text
+
+
+def test_config_records_load_operations(tmp_path, write_config):
+    path = write_config('a.json', {'a': 1})
+    events = []
+    config = EasyConfig(path=str(tmp_path), cache=FileCache(),
+                        instrument=Instrumentation(StatsSink(), CallbackSink(events.append)))
+    config.load_file(path)
+    config.load_file(path)
+    stats = config.stats()
+    assert {'stat', 'parse', 'merge'} <= set(stats['operations'])
+    assert stats['operations']['parse']['count'] == 1
+    assert stats['counters']['cache_miss'] == 1
+    assert stats['counters']['cache_hit'] == 1
+    assert stats['counters']['parse.json'] == 1
+    assert all(event['seconds'] >= 0 for event in events)
+
+
+def test_disabled_by_default(tmp_path, write_config):
+    config = EasyConfig(path=str(tmp_path))
+    config.load_file(write_config('a.json', {'a': 1}))
+    assert config.instrument is None
+    assert 'operations' not in config.stats()
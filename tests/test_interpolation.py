@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+import threading
+
+import pytest
+
+from easy_config_py import Dict
+from easy_config_py.interpolation import Interpolator, parse
+
+
+def test_resolve_references_and_defaults():
+    d = Dict({'database': {'host': 'db', 'port': 5432},
+              'url': 'postgres://${database.host}:${database.port}/${name:-app}'})
+    assert d.resolve('url') == 'postgres://db:5432/app'
+
+
+def test_single_reference_keeps_type():
+    d = Dict({'port': 5432, 'alias': '${port}'})
+    assert d.resolve('alias') == 5432
+
+
+def test_write_invalidates_dependents_only():
+    d = Dict({'host': 'db', 'url': 'x://${host}', 'other': '${name:-n}'})
+    assert d.resolve('url') == 'x://db'
+    assert d.resolve('other') == 'n'
+    d.host = 'db2'
+    assert d.resolve('url') == 'x://db2'
+    assert d.interpolator.dependents('host') == {('url',)}
+
+
+def test_environment_lookup():
+    d = Dict({'home': '${env:HOME_DIR}', 'user': '${USER_NAME}'})
+    interpolator = Interpolator(d, environ={'HOME_DIR': '/home/a', 'USER_NAME': 'a'})
+    assert interpolator.get('home') == '/home/a'
+    assert interpolator.get('user') == 'a'
+
+
+def test_missing_reference_raises():
+    d = Dict({'url': '${nowhere}'})
+    with pytest.raises(KeyError):
+        Interpolator(d, environ={}).get('url')
+
+
+def test_cycle_detected():
+    d = Dict({'a': '${b}', 'b': '${a}'})
+    with pytest.raises(ValueError, match='cycle'):
+        d.resolve('a')
+
+
+def test_escaped_literal():
+    assert parse('cost: $${price}') == ('cost: ${', 'price}')
+    assert parse('plain') is None
+
+
+def test_resolve_all():
+    d = Dict({'a': 'x', 'nested': {'b': '${a}-y'}})
+    assert d.interpolator.resolve_all() == {'a': 'x', 'nested': {'b': 'x-y'}}
+
+
+def test_concurrent_resolution_reports_no_false_cycles():
+    size = 200
+    data = {'k0': 'base'}
+    for index in range(1, size):
+        data['k{}'.format(index)] = '${{k{}}}+'.format(index - 1)
+    errors = []
+    barrier = threading.Barrier(8)
+
+    def worker():
+        barrier.wait()
+        for _ in range(20):
+            d = Dict(data)
+            try:
+                for index in range(size - 1, 0, -7):
+                    d.resolve('k{}'.format(index))
+            except Exception as exc:  # pragma: no cover - 失败时记录
+                errors.append(exc)
+
+    shared = Dict(data)
+
+    def shared_worker():
+        barrier.wait()
+        try:
+            for index in range(size - 1, 0, -1):
+                shared.interpolator.invalidate()
+                shared.resolve('k{}'.format(index))
+        except Exception as exc:  # pragma: no cover
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    threads += [threading.Thread(target=shared_worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert shared.resolve('k3') == 'base+++'
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from easy_config_py import LayeredConfig, LayeredView
+
+
+def _memo_size(node):
+    return 1 + sum(_memo_size(child) for child in node[2].values())
+
+
+@pytest.fixture
+def config():
+    return LayeredConfig([
+        ('base', {'database': {'host': 'localhost', 'port': 5432}, 'debug': False}),
+        ('prod', {'database': {'host': 'db.prod'}, 'debug': True}),
+    ])
+
+
+def test_top_layer_wins(config):
+    assert config.database.host == 'db.prod'
+    assert config.database.port == 5432
+    assert config.which('database.host') == 'prod'
+    assert config.which('database.port') == 'base'
+
+
+def test_nested_dicts_are_views(config):
+    assert isinstance(config.database, LayeredView)
+    assert list(config.database) == ['host', 'port']
+    assert config.to_dict() == {'database': {'host': 'db.prod', 'port': 5432}, 'debug': True}
+
+
+def test_add_and_remove_layer_invalidate(config):
+    assert config.getattr('database.host') == 'db.prod'
+    config.add_layer('runtime', {'database': {'host': '10.0.0.1'}})
+    assert config.getattr('database.host') == '10.0.0.1'
+    config.remove_layer('runtime')
+    assert config.getattr('database.host') == 'db.prod'
+    assert config.layers == ['base', 'prod']
+
+
+def test_scalar_blocks_lower_layers(config):
+    config.add_layer('flat', {'database': 'sqlite://'})
+    assert config.database == 'sqlite://'
+    assert config.getattr('database.host') is None
+
+
+def test_replacing_layer_keeps_position(config):
+    config.add_layer('base', {'database': {'port': 1}})
+    assert config.layers == ['base', 'prod']
+    assert config.database.port == 1
+
+
+def test_missing_reads_do_not_grow_memo(config):
+    config.getattr('database.host')
+    size = _memo_size(config._memo)
+    for index in range(1000):
+        assert config.getattr('missing{}.deeper'.format(index), 'x') == 'x'
+        assert list(LayeredView(config, ('missing{}'.format(index),))) == []
+    assert _memo_size(config._memo) == size
+
+
+def test_missing_path_cached_after_layer_adds_it(config):
+    assert config.getattr('cache.ttl') is None
+    config.add_layer('cache', {'cache': {'ttl': 30}})
+    assert config.getattr('cache.ttl') == 30
+
+
+def test_layers_are_read_only(config):
+    assert config.database.host == 'db.prod'
+    layer = config.layer('prod')
+    with pytest.raises(TypeError):
+        layer.database['host'] = 'changed'
+    with pytest.raises(TypeError):
+        layer['debug'] = False
+    assert config.database.host == 'db.prod'
+    assert config.debug is True
+
+
+def test_layer_is_copied_from_input():
+    data = {'servers': ['a'], 'database': {'host': 'a'}}
+    config = LayeredConfig([('base', data)])
+    data['database']['host'] = 'b'
+    data['servers'].append('b')
+    assert config.database.host == 'a'
+    assert config.servers == ('a',)
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+import copy
+
+import pytest
+
+from easy_config_py import Dict, EasyConfig, LazyDict, tracking
+
+
+def test_nested_dicts_wrapped_on_first_access():
+    d = LazyDict({'database': {'host': 'localhost', 'options': {'ssl': True}}})
+    raw = dict.__getitem__(d, 'database')
+    assert type(raw) is dict
+    database = d.database
+    assert isinstance(database, LazyDict)
+    assert d.database is database
+    assert type(dict.__getitem__(database, 'options')) is dict
+    assert database.options.ssl is True
+
+
+def test_dicts_inside_lists_are_lazy_too():
+    d = LazyDict({'servers': [{'name': 'a'}, ['x', {'name': 'b'}]]})
+    servers = d.servers
+    assert isinstance(servers[0], LazyDict)
+    assert isinstance(servers[1][1], LazyDict)
+    assert servers[1][1].name == 'b'
+
+
+def test_behaves_like_dict():
+    data = {'a': {'b': [1, {'c': 2}]}, 'd': 3}
+    lazy = LazyDict(copy.deepcopy(data))
+    eager = Dict(copy.deepcopy(data))
+    assert lazy == eager
+    assert lazy.to_dict() == data
+    assert dict(lazy.items())['a'] == eager.a
+    assert all(isinstance(value, LazyDict) for value in lazy.values() if isinstance(value, dict))
+    assert lazy.get('missing') is None
+    assert isinstance(lazy.pop('a'), LazyDict)
+
+
+def test_freeze_applies_to_later_wrapped_children():
+    d = LazyDict({'a': {'b': 1}})
+    d.freeze()
+    with pytest.raises(KeyError):
+        d.a.c = 2
+
+
+def test_wrapping_is_not_a_change():
+    d = LazyDict({'a': {'b': 1}})
+    version = tracking.current_version()
+    d.a
+    assert d.changes_since(version) == []
+    d.a.b = 2
+    assert d.changes_since(version) == [tracking.Change('set', ('a', 'b'), 2)]
+
+
+def test_lazy_config_merges_and_reads(tmp_path, write_config):
+    config = EasyConfig(path=str(tmp_path), lazy=True)
+    config.load_file(write_config('a.json', {'db': {'host': 'a', 'port': 1}}))
+    config.load_file(write_config('b.json', {'db': {'port': 2}}))
+    assert isinstance(config.data, LazyDict)
+    assert config.data.db.to_dict() == {'host': 'a', 'port': 2}
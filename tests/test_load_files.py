@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import os
+
+from easy_config_py import EasyConfig, FileCache, FileLoader
+
+
+def _conf_d(tmp_path, write_config):
+    conf_d = tmp_path / 'conf.d'
+    conf_d.mkdir()
+    write_config('conf.d/20-b.json', {'order': ['b'], 'b': 1})
+    write_config('conf.d/10-a.json', {'order': ['a'], 'a': 1})
+    (conf_d / 'notes.txt').write_text('ignored')
+    return str(conf_d)
+
+
+def test_expand_paths_orders_directories_and_globs(tmp_path, write_config):
+    conf_d = _conf_d(tmp_path, write_config)
+    base = write_config('base.json', {})
+    paths = FileLoader.expand_paths([base, conf_d, str(tmp_path / 'conf.d' / '*.json'), base])
+    assert [os.path.basename(path) for path in paths] == ['base.json', '10-a.json', '20-b.json']
+
+
+def test_load_files_merges_in_deterministic_order(tmp_path, write_config):
+    conf_d = _conf_d(tmp_path, write_config)
+    base = write_config('base.json', {'order': ['base'], 'base': 1})
+    config = EasyConfig(path=str(tmp_path), cache=FileCache())
+    paths = config.load_files([base, conf_d], max_workers=4)
+    assert [os.path.basename(path) for path in paths] == ['base.json', '10-a.json', '20-b.json']
+    assert config.to_dict() == {'order': ['b'], 'base': 1, 'a': 1, 'b': 1}
+    assert config.loaded_files == paths
+
+
+def test_load_files_with_processes(tmp_path, write_config):
+    conf_d = _conf_d(tmp_path, write_config)
+    cache = FileCache()
+    config = EasyConfig(path=str(tmp_path), cache=cache)
+    config.load_files(conf_d, max_workers=2, use_processes=True)
+    assert config.to_dict() == {'order': ['b'], 'a': 1, 'b': 1}
+    # 子进程的解析结果写入了父进程的缓存
+    again = EasyConfig(path=str(tmp_path), cache=cache)
+    again.load_files(conf_d, use_processes=True)
+    assert cache.stats()['hits'] == 2
+
+
+def test_load_files_reloads_changed_fragment(tmp_path, write_config):
+    conf_d = _conf_d(tmp_path, write_config)
+    config = EasyConfig(path=str(tmp_path), cache=FileCache())
+    config.load_files(conf_d)
+    write_config('conf.d/10-a.json', {'order': ['a'], 'a': 2})
+    assert config.reload() is True
+    assert config.data.a == 2
+    assert config.data.order == ['b']
+
+
+def test_load_files_with_processes_records_stats_in_parent(tmp_path, write_config):
+    conf_d = _conf_d(tmp_path, write_config)
+    cache_dir = str(tmp_path / 'cache')
+    config = EasyConfig(path=str(tmp_path), cache=FileCache(), instrument=True, disk_cache=cache_dir)
+    config.load_files(conf_d, max_workers=2, use_processes=True)
+    assert config.to_dict() == {'order': ['b'], 'a': 1, 'b': 1}
+    stats = config.stats()
+    assert stats['disk_cache'] == {'hits': 0, 'misses': 2}
+    assert stats['operations']['parse']['count'] == 2
+    assert stats['operations']['read']['count'] == 2
+    # 磁盘缓存由父进程写入，新的配置对象直接命中
+    again = EasyConfig(path=str(tmp_path), cache=FileCache(), disk_cache=cache_dir)
+    again.load_files(conf_d, use_processes=True)
+    assert again.stats()['disk_cache'] == {'hits': 2, 'misses': 0}
+    assert again.to_dict() == config.to_dict()
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import itertools
+import json
+import os
+import time
+
+import pytest
+
+from easy_config_py import Dict, EasyConfig, MergeStrategies, merge
+
+_bumps = itertools.count(1)
+
+
+def test_default_merge_is_deep_for_dicts_and_replaces_lists():
+    data = Dict({'db': {'host': 'a', 'port': 1}, 'servers': ['x']})
+    merge.merge_many(data, [{'db': {'port': 2}, 'servers': ['y']}])
+    assert data.to_dict() == {'db': {'host': 'a', 'port': 2}, 'servers': ['y']}
+
+
+def test_merge_many_matches_sequential_updates():
+    layers = [{'a': {'b': 1, 'c': [1]}}, {'a': {'c': [2], 'd': {'e': 1}}}, {'a': {'d': {'f': 2}}, 'g': 3}]
+    merged = Dict()
+    merge.merge_many(merged, layers)
+    sequential = Dict()
+    for layer in layers:
+        sequential.update(layer)
+    assert merged.to_dict() == sequential.to_dict()
+
+
+def test_per_path_strategies():
+    strategies = MergeStrategies({
+        'servers': merge.by_key('name'),
+        'plugins': merge.APPEND,
+        'logging': merge.REPLACE,
+        'regions.*.hosts': merge.APPEND,
+    })
+    data = Dict({'servers': [{'name': 'a', 'port': 1}], 'plugins': ['p1'],
+                 'logging': {'level': 'info', 'file': 'x'}, 'regions': {'eu': {'hosts': ['h1']}}})
+    merge.merge_many(data, [{
+        'servers': [{'name': 'a', 'port': 2}, {'name': 'b', 'port': 3}],
+        'plugins': ['p2'],
+        'logging': {'level': 'debug'},
+        'regions': {'eu': {'hosts': ['h2']}},
+    }], strategies)
+    assert data.to_dict() == {
+        'servers': [{'name': 'a', 'port': 2}, {'name': 'b', 'port': 3}],
+        'plugins': ['p1', 'p2'],
+        'logging': {'level': 'debug'},
+        'regions': {'eu': {'hosts': ['h1', 'h2']}},
+    }
+
+
+def test_delete_markers():
+    data = Dict({'debug': True, 'db': {'host': 'a'}})
+    merge.merge_many(data, [{'debug': merge.DELETE}])
+    assert 'debug' not in data
+    merge.merge_many(data, [{'db': {'host': '~delete'}}], MergeStrategies(delete_marker='~delete'))
+    assert data.to_dict() == {'db': {}}
+
+
+def test_unknown_strategy_rejected():
+    with pytest.raises(ValueError):
+        MergeStrategies({'a': 'sideways'})
+
+
+def test_config_strategies_apply_to_files(tmp_path, write_config):
+    config = EasyConfig(path=str(tmp_path), merge_strategies={'plugins': merge.APPEND})
+    config.load_file(write_config('a.json', {'plugins': ['a']}))
+    config.load_file(write_config('b.json', {'plugins': ['b']}))
+    assert config.data.plugins == ['a', 'b']
+
+
+def _write_lines(path, documents):
+    """写入 JSON Lines 文件，并把 mtime 推到未来，保证签名与上一次写入不同"""
+    with open(path, 'w', encoding='utf-8') as file_to_write:
+        for document in documents:
+            file_to_write.write(json.dumps(document) + '\n')
+    stamp = time.time() + next(_bumps)
+    os.utime(path, (stamp, stamp))
+    return str(path)
+
+
+def test_iter_load_without_strategy_only_yields(tmp_path):
+    path = _write_lines(tmp_path / 'a.jsonl', [{'a': 1}, {'b': 2}])
+    config = EasyConfig(path=str(tmp_path))
+    assert [document.to_dict() for document in config.iter_load(path)] == [{'a': 1}, {'b': 2}]
+    assert config.to_dict() == {}
+    assert config.loaded_files == []
+
+
+def test_iter_load_strategy_true_uses_config_strategies(tmp_path):
+    path = _write_lines(tmp_path / 'a.jsonl', [{'plugins': ['a']}, {'plugins': ['b']}])
+    config = EasyConfig(path=str(tmp_path), merge_strategies={'plugins': merge.APPEND})
+    for _ in config.iter_load(path, strategy=True):
+        pass
+    assert config.data.plugins == ['a', 'b']
+    assert config.loaded_files == [path]
+
+
+def test_iter_load_strategy_mapping_applies_to_file_and_reload(tmp_path):
+    path = tmp_path / 'a.jsonl'
+    _write_lines(path, [{'plugins': ['a']}, {'plugins': ['b']}])
+    config = EasyConfig(path=str(tmp_path))
+    for _ in config.iter_load(str(path), strategy={'plugins': merge.APPEND}):
+        pass
+    assert config.data.plugins == ['a', 'b']
+    _write_lines(path, [{'plugins': ['a']}, {'plugins': ['c']}])
+    assert config.reload() is True
+    assert config.data.plugins == ['a', 'c']
+
+
+def test_iter_load_non_dict_document_cannot_merge(tmp_path):
+    path = _write_lines(tmp_path / 'a.jsonl', [1])
+    config = EasyConfig(path=str(tmp_path))
+    assert list(config.iter_load(path)) == [1]
+    with pytest.raises(TypeError):
+        list(config.iter_load(path, strategy=True))
+
+
+def test_async_iter_load_strategy(tmp_path):
+    path = _write_lines(tmp_path / 'a.jsonl', [{'a': {'b': 1}}, {'a': {'c': 2}}])
+    config = EasyConfig(path=str(tmp_path))
+
+    async def consume():
+        return [document async for document in config.async_iter_load(path, strategy=True)]
+
+    documents = asyncio.run(consume())
+    assert len(documents) == 2
+    assert config.to_dict() == {'a': {'b': 1, 'c': 2}}
+    config.close()
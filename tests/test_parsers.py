@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+import datetime
+import os
+import subprocess
+import sys
+
+import pytest
+
+import easy_config_py
+from easy_config_py import parsers
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run(code, **env):
+    base = {key: value for key, value in os.environ.items() if key != 'EASY_CONFIG_FAST_PARSERS'}
+    env = dict(base, PYTHONPATH=ROOT, **env)
+    return subprocess.run([sys.executable, '-c', code], env=env, check=True,
+                          stdout=subprocess.PIPE, universal_newlines=True).stdout.strip()
+
+
+def test_import_defers_heavy_and_optional_modules():
+    from benchmarks.bench_import import check_deferred
+    assert check_deferred() == []
+    loaded = _run('import sys, easy_config_py\n'
+                  'print(",".join(m for m in ("easy_config_py.shared", "easy_config_py.layered",'
+                  ' "easy_config_py.disk_cache", "mmap") if m in sys.modules))')
+    assert loaded == ''
+
+
+def test_lazy_names_resolve_on_first_access():
+    from easy_config_py.layered import LayeredConfig
+    assert easy_config_py.LayeredConfig is LayeredConfig
+    assert 'SharedSnapshot' in dir(easy_config_py)
+    with pytest.raises(AttributeError):
+        easy_config_py.NoSuchName
+
+
+def test_fast_path_parses_common_formats():
+    assert parsers.load_content('{"b": 1, "a": [1.5, null]}', 'json') == {'b': 1, 'a': [1.5, None]}
+    assert list(parsers.load_content('{"b": 1, "a": 2}', 'json')) == ['b', 'a']
+    pytest.importorskip('yaml')
+    assert parsers.load_content('a:\n  b: 1\n', 'yaml') == {'a': {'b': 1}}
+    assert parsers.load_content('', 'yaml') == {}
+    result = parsers.load_content('[a]\nwhen = 2026-01-02\n', 'toml')
+    assert result == {'a': {'when': datetime.date(2026, 1, 2)}}
+
+
+def test_fast_path_load_file_decodes_utf8(tmp_path):
+    path = tmp_path / 'config.json'
+    path.write_bytes('{"name": "配置"}'.encode('utf-8'))
+    assert parsers.load_file(str(path)) == {'name': '配置'}
+
+
+def test_check_type_normalizes_without_anyconfig():
+    assert parsers.check_type('YML') == 'yaml'
+    assert parsers.check_type('json') == 'json'
+    assert parsers.parser_type('/a/b.yml') == 'yaml'
+
+
+def test_use_fast_path_false_routes_to_anyconfig(monkeypatch):
+    calls = []
+
+    class FakeAnyconfig(object):
+        @staticmethod
+        def loads(content, ac_parser=None, **options):
+            calls.append(ac_parser)
+            return {'via': 'anyconfig'}
+
+    monkeypatch.setattr(parsers, '_anyconfig', FakeAnyconfig)
+    parsers.use_fast_path(False)
+    assert parsers.fast_loader('json') is None
+    assert parsers.load_content('{}', 'json') == {'via': 'anyconfig'}
+    assert parsers.parser_version('json') != 'json-direct'
+    assert calls == ['json']
+    parsers.use_fast_path(True)
+    assert parsers.parser_version('json') == 'json-direct'
+
+
+def test_fast_path_is_opt_in():
+    code = 'from easy_config_py import parsers\nprint(parsers.fast_loader("json") is None)'
+    assert _run(code) == 'True'
+    assert _run(code, EASY_CONFIG_FAST_PARSERS='0') == 'True'
+    assert _run(code, EASY_CONFIG_FAST_PARSERS='1') == 'False'
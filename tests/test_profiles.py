@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from easy_config_py import Dict, EasyConfig
+from easy_config_py.frozen import FrozenConfig
+from easy_config_py.profiles import Profiles
+
+DATA = {
+    'default': {'database': {'host': 'localhost', 'port': 5432}, 'debug': False},
+    'dev': {'debug': True},
+    'prod': {'database': {'host': 'prod-db'}},
+    'regions': {'eu': {'database': {'host': 'eu-db'}}},
+}
+
+
+def _config(tmp_path, write_config, **kwargs):
+    config = EasyConfig(path=str(tmp_path))
+    config.load_file(write_config('app.json', DATA))
+    config.set_profiles({'dev': ['dev'], 'prod': ['prod'], 'prod-eu': ['prod', 'regions.eu']}, **kwargs)
+    return config
+
+
+def test_sections_put_base_first():
+    profiles = Profiles({'a': ['default', 'a'], 'b': 'b'}, base='default')
+    assert profiles.sections('a') == ('default', 'a')
+    assert profiles.sections('b') == ('default', 'b')
+    assert Profiles(['x'], base=None).sections('x') == ('x',)
+    with pytest.raises(KeyError, match='Unknown profile'):
+        profiles.sections('c')
+
+
+def test_profile_views(tmp_path, write_config):
+    config = _config(tmp_path, write_config, active='prod-eu')
+    view = config.profile()
+    assert isinstance(view, FrozenConfig)
+    assert view.database.host == 'eu-db'
+    assert view.database.port == 5432
+    assert config.profile('dev').to_dict() == {'database': {'host': 'localhost', 'port': 5432}, 'debug': True}
+    assert 'prod' in config.data
+    assert config.profiles == ['dev', 'prod', 'prod-eu']
+
+
+def test_views_cached_until_their_sections_change(tmp_path, write_config):
+    config = _config(tmp_path, write_config)
+    prod = config.profile('prod')
+    dev = config.profile('dev')
+    assert config.profile('prod') is prod
+    config.data.prod.database.host = 'new-db'
+    assert config.profile('prod').database.host == 'new-db'
+    assert config.profile('dev') is dev
+    config.data.default.debug = True
+    assert config.profile('dev') is not dev
+    stats = config.stats()['profiles']
+    assert stats['hits'] == 2 and stats['builds'] == 4
+
+
+def test_views_follow_reload(tmp_path, write_config):
+    config = _config(tmp_path, write_config)
+    assert config.profile('prod').database.host == 'prod-db'
+    write_config('app.json', dict(DATA, prod={'database': {'host': 'reloaded'}}))
+    assert config.reload() is True
+    assert config.profile('prod').database.host == 'reloaded'
+
+
+def test_missing_section_is_skipped(tmp_path, write_config):
+    config = _config(tmp_path, write_config)
+    config.set_profiles(['staging'])
+    assert config.profile('staging').to_dict() == DATA['default']
+
+
+def test_active_profile_errors():
+    config = EasyConfig()
+    with pytest.raises(ValueError, match='set_profiles'):
+        config.profile('dev')
+    config.update(Dict(DATA))
+    config.set_profiles(['dev', 'prod'])
+    with pytest.raises(ValueError, match='use_profile'):
+        config.profile()
+    with pytest.raises(KeyError):
+        config.use_profile('qa')
+    config.use_profile('dev')
+    assert config.active_profile == 'dev'
+    assert config.profile().debug is True
+    config.set_profiles(['prod'])
+    assert config.active_profile is None
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from easy_config_py import Dict, EasyConfig, Query
+from easy_config_py.query import compile_query, select_many
+
+
+def _data():
+    return Dict({
+        'database': {'host': 'localhost', 'port': 5432},
+        'services': [
+            {'name': 'api', 'port': 8000, 'enabled': True, 'meta': {'name': 'api'}},
+            {'name': 'worker', 'port': 7000, 'enabled': False},
+            {'name': 'web', 'port': 8080, 'enabled': True},
+        ],
+        'key.with.dots': 1,
+    })
+
+
+@pytest.mark.parametrize('selector, expected', [
+    ('database.host', ['localhost']),
+    ('services.0.name', ['api']),
+    ('services[-1].name', ['web']),
+    ('services[1:].name', ['worker', 'web']),
+    ('services[::2].name', ['api', 'web']),
+    ('services.*.port', [8000, 7000, 8080]),
+    ('services[*].port', [8000, 7000, 8080]),
+    ('services[?enabled].name', ['api', 'web']),
+    ('services[?port >= 8000].name', ['api', 'web']),
+    ('services[?name != "api"].port', [7000, 8080]),
+    ('services[?meta.name == "api"].port', [8000]),
+    ('**.port', [5432, 8000, 7000, 8080]),
+    ('["key.with.dots"]', [1]),
+    ('services[5].name', []),
+    ('database.missing', []),
+])
+def test_select(selector, expected):
+    assert list(_data().select(selector)) == expected
+
+
+def test_paths_and_first():
+    query = Query('services[?enabled].port')
+    assert list(query.iter_paths(_data())) == [(('services', 0, 'port'), 8000), (('services', 2, 'port'), 8080)]
+    assert query.first(_data()) == 8000
+    assert Query('nothing').first(_data(), 'default') == 'default'
+    assert repr(query) == "Query('services[?enabled].port')"
+
+
+def test_reading_does_not_create_nodes():
+    d = _data()
+    assert d.select_first('a.b.c') is None
+    assert 'a' not in d
+
+
+def test_select_many_matches_individual_queries():
+    selectors = ['services.*.port', 'services.*.name', 'database.host', '**.name']
+    result = select_many(_data(), selectors)
+    assert result == {selector: list(_data().select(selector)) for selector in selectors}
+
+
+def test_compile_query_is_cached():
+    assert compile_query('a.b') is compile_query('a.b')
+    query = Query('a')
+    assert compile_query(query) is query
+
+
+@pytest.mark.parametrize('selector', ['a[', 'a]', 'a[?]', 'a[x]', 'a[0]b'])
+def test_invalid_selectors(selector):
+    with pytest.raises(ValueError):
+        Query(selector)
+
+
+def test_config_select_methods(tmp_path, write_config):
+    config = EasyConfig(path=str(tmp_path))
+    config.load_file(write_config('a.json', _data().to_dict()))
+    assert list(config.select('services[?enabled].name')) == ['api', 'web']
+    assert config.select_first('database.port') == 5432
+    assert config.select_many(['database.host'])['database.host'] == ['localhost']
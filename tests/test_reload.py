@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+import time
+
+from easy_config_py import EasyConfig, tracking
+
+
+def _load(tmp_path, *paths):
+    config = EasyConfig(path=str(tmp_path))
+    for path in paths:
+        config.load_file(path)
+    return config
+
+
+def test_reload_unchanged_returns_false(tmp_path, write_config):
+    config = _load(tmp_path, write_config('a.json', {'a': 1}))
+    assert config.reload() is False
+
+
+def test_reload_picks_up_changed_file(tmp_path, write_config):
+    base = write_config('base.json', {'db': {'host': 'x', 'port': 1}})
+    override = write_config('override.json', {'db': {'port': 2}})
+    config = _load(tmp_path, base, override)
+    write_config('override.json', {'db': {'port': 3}})
+    assert config.reload() is True
+    assert config.to_dict() == {'db': {'host': 'x', 'port': 3}}
+
+
+def test_reload_only_remerges_changed_keys(tmp_path, write_config):
+    big = {str(i): {'v': i} for i in range(100)}
+    base = write_config('base.json', {'big': big, 'db': {'port': 1}})
+    override = write_config('override.json', {'db': {'port': 2}})
+    config = _load(tmp_path, base, override)
+    node = config.data.big
+    write_config('override.json', {'db': {'port': 3}})
+    config.reload()
+    # 未涉及的子树与旧配置共享
+    assert config.data.big is node
+    assert config.data.db.port == 3
+
+
+def test_reload_replays_other_sources_in_order(tmp_path, write_config):
+    path = write_config('a.json', {'db': {'host': 'x', 'port': 1}, 'extra': 1})
+    config = _load(tmp_path, path)
+    config.setattr('db.user', 'u')
+    config.update({'extra': 5})
+    write_config('a.json', {'db': {'host': 'y', 'port': 1}, 'extra': 2})
+    config.reload()
+    assert config.to_dict() == {'db': {'host': 'y', 'port': 1, 'user': 'u'}, 'extra': 5}
+
+
+def test_reload_removes_keys_dropped_from_file(tmp_path, write_config):
+    path = write_config('a.json', {'a': 1, 'plugins': ['x']})
+    config = _load(tmp_path, path)
+    write_config('a.json', {'a': 1})
+    config.reload()
+    assert 'plugins' not in config.data
+
+
+def test_changes_since_after_reload_only_reports_real_changes(tmp_path, write_config):
+    path = write_config('a.json', {'db': {'host': 'x', 'port': 1}, 'other': {'k': 1}})
+    config = _load(tmp_path, path)
+    version = tracking.current_version()
+    write_config('a.json', {'db': {'host': 'x', 'port': 2}, 'other': {'k': 1}})
+    config.reload()
+    assert config.changes_since(version) == [tracking.Change('set', ('db', 'port'), 2)]
+
+
+def test_writes_after_reload_propagate_to_new_root(tmp_path, write_config):
+    path = write_config('a.json', {'a': {'b': 1}, 'c': {'d': 1}})
+    config = _load(tmp_path, path)
+    write_config('a.json', {'a': {'b': 2}, 'c': {'d': 1}})
+    config.reload()
+    version = tracking.current_version()
+    config.data.c.d = 5
+    assert config.changes_since(version) == [tracking.Change('set', ('c', 'd'), 5)]
+
+
+def test_watch_polling_reloads(tmp_path, write_config):
+    path = write_config('a.json', {'a': 1})
+    config = _load(tmp_path, path)
+    reloaded = []
+    config.watch(interval=0.02, callback=lambda cfg, changed: reloaded.append(changed), use_inotify=False)
+    try:
+        write_config('a.json', {'a': 2})
+        deadline = time.time() + 5
+        while not reloaded and time.time() < deadline:
+            time.sleep(0.02)
+    finally:
+        config.stop_watch()
+    assert reloaded
+    assert config.data.a == 2
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+import os
+
+from easy_config_py import EasyConfig, FileCache
+
+
+def _read(path):
+    with open(path, encoding='utf-8') as file_to_read:
+        return json.load(file_to_read)
+
+
+def test_save_skips_unchanged_loaded_file(write_config):
+    path = write_config('a.json', {'a': 1})
+    config = EasyConfig(path=path, cache=FileCache())
+    config.load_file(path)
+    assert not config.dirty
+    assert config.save(path) is False
+
+
+def test_save_writes_after_change(write_config):
+    path = write_config('a.json', {'a': 1})
+    config = EasyConfig(path=path, cache=FileCache())
+    config.load_file(path)
+    config.setattr('b.c', 2)
+    assert config.dirty
+    assert config.save(path) is True
+    assert _read(path) == {'a': 1, 'b': {'c': 2}}
+    assert config.save(path) is False
+    # 保存的内容被当作该文件的来源，reload 不会认为文件被外部修改
+    assert config.reload() is False
+
+
+def test_save_writes_when_loaded_file_was_missing(tmp_path):
+    path = str(tmp_path / 'missing.json')
+    config = EasyConfig(path=str(tmp_path), cache=FileCache())
+    config.load_file(path)
+    assert config.dirty
+    assert config.save(path) is True
+    assert os.path.exists(path)
+    assert _read(path) == {}
+
+
+def test_save_detects_external_modification(write_config):
+    path = write_config('a.json', {'a': 1})
+    config = EasyConfig(path=path, cache=FileCache())
+    config.load_file(path)
+    write_config('a.json', {'a': 'external'})
+    assert config.save(path) is True
+    assert _read(path) == {'a': 1}
+
+
+def test_mark_dirty_after_in_place_change(write_config):
+    path = write_config('a.json', {'items': [1]})
+    config = EasyConfig(path=path, cache=FileCache())
+    config.load_file(path)
+    config.data['items'].append(2)
+    assert config.save(path) is False
+    config.mark_dirty()
+    assert config.save(path) is True
+    assert _read(path) == {'items': [1, 2]}
+
+
+def test_force_and_other_path(tmp_path, write_config):
+    path = write_config('a.json', {'a': 1})
+    config = EasyConfig(path=path, cache=FileCache())
+    config.load_file(path)
+    assert config.save(path, force=True) is True
+    other = str(tmp_path / 'copy.json')
+    assert config.save(other) is True
+    assert _read(other) == {'a': 1}
+    assert not [name for name in os.listdir(str(tmp_path)) if name.endswith('.tmp')]
+
+
+def test_async_save(tmp_path):
+    path = str(tmp_path / 'out.json')
+    config = EasyConfig({'a': 1}, path=str(tmp_path), cache=FileCache())
+    assert asyncio.run(config.async_save(path)) is True
+    assert _read(path) == {'a': 1}
+
+
+def test_save_json_with_non_str_keys_and_big_ints(tmp_path):
+    path = str(tmp_path / 'x.json')
+    config = EasyConfig(path=str(tmp_path))
+    config.update({'ports': {80: 'http'}, 'big': 2 ** 70})
+    config.save(path)
+    with open(path, encoding='utf-8') as file_to_read:
+        assert json.load(file_to_read) == {'ports': {'80': 'http'}, 'big': 2 ** 70}
+    config.update({'big': 1})
+    config.save(path)
+    with open(path, encoding='utf-8') as file_to_read:
+        assert json.load(file_to_read) == {'ports': {'80': 'http'}, 'big': 1}
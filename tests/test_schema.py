@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from easy_config_py import EasyConfig, Dict
+from easy_config_py.schema import Schema, Field, ValidationError
+
+SPEC = {
+    'database': {'host': str, 'port': Field(int, default=5432)},
+    'debug': Field(bool, default=False),
+}
+
+
+def test_validate_coerces_and_fills_defaults():
+    schema = Schema(SPEC)
+    assert schema.validate({'database': {'host': 'db', 'port': '5433'}}) == {
+        'database': {'host': 'db', 'port': 5433}, 'debug': False}
+
+
+def test_validate_collects_all_errors_with_paths():
+    schema = Schema(SPEC)
+    with pytest.raises(ValidationError) as info:
+        schema.validate({'database': {'port': 'x'}, 'debug': 'maybe'})
+    paths = sorted(path for path, _ in info.value.errors)
+    assert paths == ['database.host', 'database.port', 'debug']
+
+
+def test_defaults_applied_on_first_load(tmp_path, write_config):
+    config = EasyConfig(path=str(tmp_path), schema=SPEC)
+    # 还没有加载任何来源时就已经填入默认值
+    assert config.to_dict() == {'debug': False}
+    config.load_file(write_config('a.json', {'database': {'host': 'db', 'port': '6543'}}))
+    assert config.to_dict() == {'database': {'host': 'db', 'port': 6543}, 'debug': False}
+    assert config.validate() == config.to_dict()
+
+
+def test_update_fills_defaults_absent_from_current_and_incoming():
+    config = EasyConfig(data={'other': 1})
+    config.set_schema({'section': {'a': Field(int, default=1), 'b': int}})
+    config.update({'section': {'b': '2'}})
+    assert config.to_dict() == {'other': 1, 'section': {'a': 1, 'b': 2}}
+
+
+def test_update_keeps_existing_values_over_defaults():
+    data = Dict()
+    data.set_schema(Schema(SPEC))
+    data.update({'database': {'host': 'db', 'port': 1}})
+    data.update({'database': {'host': 'other'}})
+    assert data.to_dict()['database'] == {'host': 'other', 'port': 1}
+
+
+def test_missing_required_key_reported_by_validate_only(tmp_path, write_config):
+    config = EasyConfig(path=str(tmp_path), schema=SPEC)
+    config.load_file(write_config('a.json', {'debug': 'yes'}))
+    assert config.data.debug is True
+    with pytest.raises(ValidationError) as info:
+        config.validate()
+    assert [path for path, _ in info.value.errors] == ['database']
+
+
+def test_invalid_update_raises_and_leaves_config_unchanged():
+    config = EasyConfig(data={'database': {'host': 'db'}}, schema=SPEC)
+    before = config.to_dict()
+    with pytest.raises(ValidationError):
+        config.update({'database': {'port': 'not a number'}})
+    assert config.to_dict() == before
+
+
+def test_setattr_checks_only_written_path():
+    config = EasyConfig(data={'database': {'host': 'db'}}, schema=SPEC)
+    config.setattr('database.port', '7000')
+    assert config.data.database.port == 7000
+    with pytest.raises(ValidationError):
+        config.setattr('debug', 'maybe')
+
+
+def test_reload_restores_default_for_removed_key(tmp_path, write_config):
+    path = write_config('a.json', {'database': {'host': 'db', 'port': 1}})
+    config = EasyConfig(path=str(tmp_path), schema=SPEC)
+    config.load_file(path)
+    write_config('a.json', {'database': {'host': 'db'}})
+    assert config.reload() is True
+    assert config.data.database.port == 5432
+
+
+def test_extra_keys_rejected_when_disallowed():
+    with pytest.raises(ValidationError):
+        Schema({'a': int}, extra=False).validate({'a': 1, 'b': 2})
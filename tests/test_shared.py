@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+import datetime
+import os
+import stat
+
+import pytest
+
+from easy_config_py import EasyConfig
+from easy_config_py import shared
+
+
+def test_share_round_trip_and_refresh():
+    config = EasyConfig(data={'database': {'host': 'db', 'port': 5432}, 'servers': ['a', 'b'],
+                              'ratio': 0.5, 'debug': False, 'empty': None, 1: 'one'})
+    with config:
+        snapshot = EasyConfig.attach_shared(config.share())
+        root = snapshot.view()
+        assert root.database.host == 'db'
+        assert root['database']['port'] == 5432
+        assert root.servers == ['a', 'b']
+        assert root.getattr('database.timeout', 30) == 30
+        assert root[1] == 'one'
+        assert root.to_dict() == config.to_dict()
+        config.setattr('database.port', 5433)
+        assert snapshot.view(refresh=True).database.port == 5433
+        assert snapshot.generation == 2
+        # 旧视图仍然可以读取旧的一代
+        assert root.database.port == 5432
+
+
+def test_share_creates_private_unpredictable_file():
+    config = EasyConfig(data={'a': 1})
+    path = config.share()
+    directory = os.path.dirname(path)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert stat.S_IMODE(os.stat(directory).st_mode) == 0o700
+    assert str(os.getpid()) not in os.path.basename(path)
+    assert EasyConfig(data={'a': 1}).share() != path
+    config.setattr('a', 2)
+    # 重新发布后权限不变
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    config.close()
+    assert not os.path.exists(path)
+    assert not os.path.exists(directory)
+    assert config.shared_path is None
+
+
+def test_share_explicit_path_is_kept_on_close(tmp_path):
+    path = str(tmp_path / 'config.ecsm')
+    config = EasyConfig(data={'a': 1})
+    assert config.share(path) == path
+    config.close()
+    assert os.path.exists(path)
+
+
+def test_non_primitive_values_rejected_by_default():
+    config = EasyConfig(data={'when': datetime.date(2026, 1, 1)})
+    with pytest.raises(TypeError):
+        config.share()
+    assert config.shared_path is None
+    with pytest.raises(TypeError):
+        shared.encode({(1, 2): 'tuple key'})
+
+
+def test_pickle_requires_opt_in_on_both_sides():
+    config = EasyConfig(data={'when': datetime.date(2026, 1, 1)})
+    with config:
+        path = config.share(allow_pickle=True)
+        root = EasyConfig.attach_shared(path).view()
+        with pytest.raises(ValueError):
+            root.when
+        trusted = EasyConfig.attach_shared(path, allow_pickle=True).view()
+        assert trusted.when == datetime.date(2026, 1, 1)
+
+
+def test_read_header_rejects_invalid_content():
+    with pytest.raises(ValueError):
+        shared.read_header(b'not a snapshot')
+    content = shared.encode({'a': 1})
+    assert shared.read_header(content)[1] == 1
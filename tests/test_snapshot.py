@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+import copy
+import pickle
+
+import pytest
+
+from easy_config_py import EasyConfig
+from easy_config_py.snapshot import Snapshot
+
+
+def test_snapshot_reads_without_creating_nodes():
+    config = EasyConfig(data={'database': {'host': 'db'}, 'servers': ['a']})
+    snap = config.snapshot()
+    assert snap.database.host == 'db'
+    assert snap.servers == ('a',)
+    assert snap.getattr('database.timeout', 30) == 30
+    assert snap.get('missing') is None
+    with pytest.raises(KeyError):
+        snap['missing']
+    with pytest.raises(AttributeError):
+        snap.missing
+    assert 'missing' not in config.data
+
+
+def test_snapshot_is_read_only():
+    snap = EasyConfig(data={'a': {'b': 1}}).snapshot()
+    with pytest.raises(TypeError):
+        snap['a'] = 2
+    with pytest.raises(TypeError):
+        snap.a.b = 2
+    with pytest.raises(TypeError):
+        snap.update({})
+
+
+def test_writes_publish_new_snapshot_sharing_unchanged_subtrees():
+    config = EasyConfig(data={'database': {'host': 'db'}, 'cache': {'ttl': 1}})
+    old = config.snapshot()
+    config.setattr('database.host', 'other')
+    new = config.snapshot()
+    assert new is not old
+    assert old.database.host == 'db'
+    assert new.database.host == 'other'
+    assert new.cache is old.cache
+
+
+def test_mark_dirty_rebuilds_nested_subtrees():
+    config = EasyConfig(data={'database': {'hosts': ['a']}})
+    old = config.snapshot()
+    config.data.database.hosts.append('b')
+    config.mark_dirty()
+    assert config.snapshot().database.hosts == ('a', 'b')
+    assert old.database.hosts == ('a',)
+
+
+def test_mark_dirty_rebuilds_untracked_lazy_subtrees():
+    config = EasyConfig(data={'database': {'hosts': ['a']}}, lazy=True)
+    config.snapshot()
+    dict.__getitem__(config.data, 'database')['hosts'].append('b')
+    config.mark_dirty()
+    assert config.snapshot().database.hosts == ('a', 'b')
+
+
+def test_mark_dirty_invalidates_frozen_and_profiles():
+    config = EasyConfig(data={'default': {'hosts': ['a']}, 'prod': {'debug': False}})
+    config.set_profiles(['prod'], active='prod')
+    frozen = config.frozen('default')
+    assert config.profile().hosts == ('a',)
+    config.data.default.hosts.append('b')
+    config.mark_dirty()
+    assert config.frozen('default').hosts == ('a', 'b')
+    assert config.frozen('default') != frozen
+    assert config.profile().hosts == ('a', 'b')
+
+
+def test_snapshot_copy_and_pickle():
+    snap = EasyConfig(data={'a': {'b': [1, {'c': 2}]}}).snapshot()
+    assert copy.copy(snap) is snap
+    assert copy.deepcopy(snap) is snap
+    loaded = pickle.loads(pickle.dumps(snap))
+    assert isinstance(loaded, Snapshot)
+    assert loaded.to_dict() == {'a': {'b': [1, {'c': 2}]}}
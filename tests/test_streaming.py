@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+
+import pytest
+
+from easy_config_py import EasyConfig
+from easy_config_py import parsers, streaming
+from easy_config_py.streaming import iter_documents
+
+
+def test_yaml_documents(tmp_path):
+    pytest.importorskip('yaml')
+    path = tmp_path / 'a.yaml'
+    path.write_text('a: 1\n---\n---\nb: 2\n', encoding='utf-8')
+    assert list(iter_documents(str(path))) == [{'a': 1}, {'b': 2}]
+
+
+def test_json_lines_skip_blank_lines(tmp_path):
+    path = tmp_path / 'flags.jsonl'
+    path.write_text('{"name": "a"}\n\n{"name": "b"}\n', encoding='utf-8')
+    assert [document['name'] for document in iter_documents(str(path))] == ['a', 'b']
+
+
+def test_json_array_and_sections(tmp_path):
+    array = tmp_path / 'a.json'
+    array.write_text(json.dumps([{'a': 1}, {'b': 2}]), encoding='utf-8')
+    assert list(iter_documents(str(array))) == [{'a': 1}, {'b': 2}]
+    obj = tmp_path / 'b.json'
+    obj.write_text(json.dumps({'a': 1, 'b': {'c': 2}}), encoding='utf-8')
+    assert list(iter_documents(str(obj))) == [{'a': 1, 'b': {'c': 2}}]
+    assert list(iter_documents(str(obj), sections=True)) == [{'a': 1}, {'b': {'c': 2}}]
+
+
+def test_json_without_ijson(tmp_path, monkeypatch):
+    monkeypatch.setattr(streaming, '_ijson', False)
+    path = tmp_path / 'a.json'
+    path.write_text(json.dumps({'a': 1, 'b': 2}), encoding='utf-8')
+    assert list(iter_documents(str(path), sections=True)) == [{'a': 1}, {'b': 2}]
+
+
+def test_file_object_requires_parser_type():
+    with pytest.raises(ValueError):
+        list(iter_documents(io.StringIO('{}')))
+    stream = io.StringIO('{"a": 1}\n{"b": 2}\n')
+    assert list(iter_documents(stream, 'ndjson')) == [{'a': 1}, {'b': 2}]
+
+
+def test_unsupported_format(tmp_path):
+    pytest.importorskip('anyconfig')
+    path = tmp_path / 'a.unknown'
+    path.write_text('x', encoding='utf-8')
+    with pytest.raises(ValueError, match='Unsupported file format'):
+        list(iter_documents(str(path)))
+
+
+def test_iter_load_sections_merge(tmp_path):
+    path = tmp_path / 'a.json'
+    path.write_text(json.dumps({'a': 1, 'b': {'c': 2}}), encoding='utf-8')
+    config = EasyConfig(path=str(tmp_path))
+    assert list(config.iter_load(str(path), sections=True, strategy=True)) == [{'a': 1}, {'b': {'c': 2}}]
+    assert config.to_dict() == {'a': 1, 'b': {'c': 2}}
+
+
+def test_fast_path_formats_do_not_need_anyconfig(tmp_path, monkeypatch):
+    def missing():
+        raise ModuleNotFoundError("No module named 'anyconfig'")
+
+    monkeypatch.setattr(parsers, 'get_anyconfig', missing)
+    path = tmp_path / 'a.toml'
+    path.write_text('[a]\nb = 1\n', encoding='utf-8')
+    assert list(iter_documents(str(path))) == [{'a': {'b': 1}}]
+
+
+def test_iter_load_publishes_once_per_stream(tmp_path, monkeypatch):
+    path = tmp_path / 'flags.jsonl'
+    path.write_text(''.join('{"f%d": %d}\n' % (index, index) for index in range(5)), encoding='utf-8')
+    config = EasyConfig(path=str(tmp_path))
+    config.snapshot()
+    publishes = []
+    publish = config._publish
+    monkeypatch.setattr(config, '_publish', lambda rebuild=False: (publishes.append(1), publish(rebuild)))
+    for _ in config.iter_load(str(path), strategy=True):
+        assert config.snapshot().to_dict() == {}
+    assert len(publishes) == 1
+    assert config.snapshot().to_dict() == {'f%d' % index: index for index in range(5)}
+
+
+def test_closing_stream_early_publishes_merged_documents(tmp_path):
+    path = tmp_path / 'flags.jsonl'
+    path.write_text('{"a": 1}\n{"b": 2}\n', encoding='utf-8')
+    config = EasyConfig(path=str(tmp_path))
+    config.snapshot()
+    documents = config.iter_load(str(path), strategy=True)
+    next(documents)
+    documents.close()
+    assert config.snapshot().to_dict() == {'a': 1}
+    assert config.loaded_files == []
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+import copy
+import pickle
+
+from easy_config_py import Dict, EasyConfig, LazyDict, tracking
+from easy_config_py.tracking import Change
+
+
+def _tree():
+    return Dict({'database': {'host': 'db', 'port': 5432}, 'cache': {'ttl': 30}, 'debug': False})
+
+
+def test_changes_since_reports_sets_and_removals():
+    d = _tree()
+    version = tracking.current_version()
+    d.database.port = 5433
+    del d.cache['ttl']
+    d.new = 1
+    assert sorted(d.changes_since(version)) == sorted([
+        Change('set', ('database', 'port'), 5433),
+        Change('removed', ('cache', 'ttl'), None),
+        Change('set', ('new',), 1),
+    ])
+    assert d.changes_since(tracking.current_version()) == []
+
+
+def test_changes_since_replays_onto_other_tree():
+    d = _tree()
+    other = _tree()
+    version = tracking.current_version()
+    d.setattr('database.user', 'admin')
+    d.pop('debug')
+    other.apply_patch(d.changes_since(version))
+    assert other.to_dict() == d.to_dict()
+
+
+def test_diff_and_apply_patch():
+    old = _tree()
+    new = old.deepcopy()
+    new.database.host = 'db2'
+    del new['debug']
+    patch = old.diff(new)
+    assert sorted(patch) == sorted([
+        Change('modified', ('database', 'host'), 'db2'),
+        Change('removed', ('debug',), None),
+    ])
+    assert old.apply_patch(patch).to_dict() == new.to_dict()
+
+
+def test_diff_skips_unchanged_copied_subtrees():
+    old = _tree()
+    new = copy.deepcopy(old)
+    assert old.diff(new) == []
+    assert tracking.version_of(new.cache) == tracking.version_of(old.cache)
+
+
+def test_diff_compares_unrelated_subtrees_with_equal_stamps(tmp_path, write_config):
+    d = Dict({'a': {'x': 1}, 'b': {'x': 2}})
+    d.a.x = 5
+    assert sorted(d.diff(d.a)) == sorted([
+        Change('removed', ('a',), None),
+        Change('removed', ('b',), None),
+        Change('added', ('x',), 5),
+    ])
+    assert d.a.diff(d.b) == [Change('modified', ('x',), 2)]
+    lazy = LazyDict({'a': {'x': 1}, 'b': {'x': 2}})
+    assert lazy.a.diff(lazy.b) == [Change('modified', ('x',), 2)]
+    config = EasyConfig(path=str(tmp_path))
+    config.load_file(write_config('a.json', {'a': {'x': 1}, 'b': {'x': 2}}))
+    config.mark_dirty()
+    assert config.data.a.diff(config.data.b) == [Change('modified', ('x',), 2)]
+    assert config.data.diff(config.data.deepcopy()) == []
+
+
+def test_shallow_copy_keeps_tracking_on_original():
+    d = _tree()
+    shallow = d.copy()
+    version = tracking.current_version()
+    d.database.port = 1
+    # 共享的子节点的修改在原字典和副本上都能看到
+    assert d.changes_since(version) == [Change('set', ('database', 'port'), 1)]
+    assert shallow.changes_since(version) == [Change('set', ('database', 'port'), 1)]
+    deep = d.deepcopy()
+    version = tracking.current_version()
+    d.cache.ttl = 1
+    assert d.changes_since(version) == [Change('set', ('cache', 'ttl'), 1)]
+    assert deep.changes_since(version) == []
+    assert d.diff(deep) == [Change('modified', ('cache', 'ttl'), 30)]
+
+
+def test_unpickled_tree_is_tracked():
+    d = pickle.loads(pickle.dumps(_tree()))
+    version = tracking.current_version()
+    d.database.port = 1
+    assert d.changes_since(version) == [Change('set', ('database', 'port'), 1)]
+
+
+def test_patched_copies_only_modified_paths():
+    d = _tree()
+    new = tracking.patched(d, [Change('modified', ('database', 'port'), 1)])
+    assert new.database.port == 1 and d.database.port == 5432
+    assert new.cache is d.cache
+    version = tracking.current_version()
+    new.cache.ttl = 5
+    assert new.changes_since(version) == [Change('set', ('cache', 'ttl'), 5)]
+
+
+def test_construction_is_not_recorded_as_changes():
+    version = tracking.current_version()
+    d = Dict({'a': {'b': 1}})
+    keys = d.__dict__.get('__keys')
+    assert not keys
+    assert d.changes_since(version) == [Change('set', ('a',), {'b': 1})]